@@ -6,8 +6,12 @@ editor_path = current_working_dir + "\\" + "src"
 
 sys.path.append(editor_path)
 
-from editor.app import MyApp
 
-app = MyApp()
-app.init()
-app.show_base.run()
+# asset baker's worker processes re-import this module on platforms that spawn processes,
+# so editor must only be started when run as main script
+if __name__ == "__main__":
+    from editor.app import MyApp
+
+    app = MyApp()
+    app.init()
+    app.show_base.run()
@@ -0,0 +1,69 @@
+"""model conversion run in asset baker's worker processes, worker processes import this module on their own,
+so it must only depend on the standard library and panda3d.core, importing editor.utils here would load
+the whole editor (wx, watchdog etc.) into every worker"""
+
+import os
+import time
+import threading
+from panda3d.core import Loader, LoaderOptions, Filename, NodePath, BamFile, BamEnums
+
+
+def write_bam(model, bam):
+    """writes model to os specific path bam, returns True on success"""
+    # write to a temporary file first, so that a partially written bam is never loaded
+    tmp = "{0}.{1}.{2}.tmp".format(bam, os.getpid(), threading.get_ident())
+    bam_file = BamFile()
+    if not bam_file.openWrite(Filename.fromOsSpecific(tmp)):
+        return False
+
+    # textures are referenced by full path, since cached bam does not live next to its source
+    bam_file.getWriter().setFileTextureMode(BamEnums.BTM_fullpath)
+    success = bam_file.writeObject(model.node())
+    bam_file.close()
+
+    if not success:
+        os.remove(tmp)
+        return False
+
+    os.replace(tmp, bam)
+    return True
+
+
+def bake_asset(source, bam, baked, flatten):
+    """converts model at os specific path source to bam, this is run in a worker process,
+    bam = entry of editor's bam cache, written unchanged and skipped if None,
+    baked = entry of baked cache, written flattened if flatten is True,
+    returns (error message or None, {step: time in seconds})"""
+    timings = {}
+
+    start = time.perf_counter()
+    options = LoaderOptions(LoaderOptions.LF_no_cache | LoaderOptions.LF_report_errors)
+    node = Loader.getGlobalPtr().loadSync(Filename.fromOsSpecific(source), options)
+    timings["load"] = time.perf_counter() - start
+    if node is None:
+        return "unable to load model", timings
+
+    np = NodePath(node)
+
+    # editor's cache keeps hierarchy as it is in source, so that loaded models can still be edited
+    if bam is not None:
+        start = time.perf_counter()
+        success = write_bam(np, bam)
+        timings["write_cache"] = time.perf_counter() - start
+        if not success:
+            return "unable to write bam", timings
+
+    # only static hierarchies are flattened, animated models rely on their joint hierarchy
+    if flatten and np.find("**/+Character").is_empty() and np.find("**/+AnimBundleNode").is_empty():
+        start = time.perf_counter()
+        np.clearModelNodes()
+        np.flattenStrong()
+        timings["flatten"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    success = write_bam(np, baked)
+    timings["write"] = time.perf_counter() - start
+    if not success:
+        return "unable to write bam", timings
+
+    return None, timings
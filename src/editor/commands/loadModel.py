@@ -3,16 +3,25 @@ from editor.globals import editor
 
 
 class LoadModel(Command):
-    def __init__(self, path, *args, **kwargs):
+    def __init__(self, path, asynchronous=False, is_actor=False, *args, **kwargs):
+        """loads a 3d model from path, if asynchronous is True a placeholder is added to scene immediately and
+        model is loaded in background, if is_actor is True model is loaded as an actor, actors are always
+        loaded synchronously"""
         self.path = path[len(editor.level_editor.project.project_path) + 1:]
+        self.asynchronous = asynchronous
+        self.is_actor = is_actor
         self.model = None
 
     def do(self, *args, **kwargs):
-        self.model = editor.level_editor.load_model(self.path)
+        if self.is_actor:
+            self.model = editor.level_editor.add_actor(self.path)
+        else:
+            self.model = editor.level_editor.load_model(self.path, asynchronous=self.asynchronous)
         # editor.observer.trigger("OnAddNPs", [self.model])
 
     def undo(self):
-        editor.level_editor.remove_nps([self.model])
+        if self.model:
+            editor.level_editor.remove_nps([self.model])
         # editor.observer.trigger("OnRemoveNPs", [self.model])
 
     def clean(self, **kwargs):
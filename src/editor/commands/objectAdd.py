@@ -3,14 +3,15 @@ from editor.globals import editor
 
 
 class ObjectAdd(Command):
-    def __init__(self, obj_path, *args, **kwargs):
+    def __init__(self, obj_path, asynchronous=False, *args, **kwargs):
         """Adds any of the default editor prototype objects, Menubar > Object > GameObject > (Any)"""
 
         self.path = obj_path
+        self.asynchronous = asynchronous
         self.object = None
 
     def do(self, *args, **kwargs):
-        self.object = editor.level_editor.add_object(self.path)
+        self.object = editor.level_editor.add_object(self.path, asynchronous=self.asynchronous)
         # editor.observer.trigger("OnAddNPs", [self.object])
 
     def undo(self):
@@ -11,10 +11,12 @@ class RenameNPs(Command):
 
     def do(self, *args, **kwargs):
         self.np.set_name(self.new_name)
+        editor.level_editor.nodes.rename(self.np)
         editor.inspector.set_object(self.np, self.np.get_name(), self.np.get_properties())
 
     def undo(self):
         self.np.set_name(self.old_name)
+        editor.level_editor.nodes.rename(self.np)
         editor.scene_graph.rename_item(self.np, self.np.get_name())
         editor.inspector.layout_object_properties(self.np, self.np.get_name(), self.np.get_properties())
 
@@ -18,6 +18,7 @@ class TransformNPs(Command):
             nps.append(np)
             np.set_transform(self.old_nps_data[np])
 
+        editor.level_editor.selection.on_nps_transformed(nps)
         editor.level_editor.set_selected(nps)
         editor.scene_graph.select(nps)
         editor.inspector.set_object(nps[0], nps[0].get_name(), nps[0].get_properties())
@@ -12,8 +12,12 @@ EditorPlugin = "__EditorPlugin__"
 RuntimeModule = "__RuntimeModule__"
 Component = "__Component__"
 TAG_GAME_OBJECT = "__TAG_GAME_OBJECT__"
+TAG_MODEL_CHILD = "__TAG_MODEL_CHILD__"  # "i/j/..." child indices of a model's sub node below model root
 
 MAX_COMMANDS_COUNT = 20  # maximum number of undo redo commands
+MODEL_CACHE_SIZE = 512 * 1024 * 1024  # maximum size in bytes of loaded models kept in editor model cache
+DIR_EVENT_QUIET_PERIOD = 0.5  # seconds without new directory events before changes are reported to editor
+EDITOR_CACHE_DIR = "__editorcache__"  # directory inside a project for data generated by editor, e.g. converted models
 
 ED_GEO_MASK = p3d_core.BitMask32.bit(0)
 GAME_GEO_MASK = p3d_core.BitMask32.bit(1)
@@ -51,6 +55,7 @@ DIRECTIONAL_LIGHT = "__DirectionalLight__"
 SPOT_LIGHT = "__SpotLight__"
 AMBIENT_LIGHT = "__AmbientLight__"
 CAMERA_NODEPATH = "__CameraNodePath__"
+MODEL_CHILD = "__ModelChild__"  # saved scene record of a model's sub node, resolved under a copy of the model
 # **********************************************************************************************
 
 
@@ -1,7 +1,8 @@
 import webbrowser
 import wx
 from editor.globals import editor
-from editor.constants import GAME_STATE, TAG_GAME_OBJECT
+from editor.constants import GAME_STATE
+from editor.utils import SceneFile, ChangeSet
 
 
 obs = editor.observer
@@ -23,6 +24,11 @@ def build_project(*args):
     print("build project")
 
 
+@obs.on("BakeAssets")
+def bake_assets(*args):
+    editor.level_editor.bake_assets()
+
+
 @obs.on("CreateNewSession")
 def create_new_session(*args):
     le = editor.level_editor
@@ -42,17 +48,52 @@ def create_new_session(*args):
 
 @obs.on("OpenSession")
 def open_session(*args):
-    print("open session")
+    le = editor.level_editor
+
+    if le.ed_state is GAME_STATE:
+        print("Exit game mode to open a scene..!")
+        return
+
+    wild_card = "Scene files (*.{0})|*.{0}".format(SceneFile.EXTENSION)
+    with wx.FileDialog(None, "Open Scene", defaultDir=le.project.project_path, wildcard=wild_card,
+                       style=wx.FD_OPEN | wx.FD_FILE_MUST_EXIST) as file_dialog:
+        if file_dialog.ShowModal() == wx.ID_CANCEL:
+            return
+        path = file_dialog.GetPath()
+
+    le.open_scene(path)
 
 
 @obs.on("SaveSession")
 def save_session(*args):
-    print("save session")
+    le = editor.level_editor
+
+    if le.scene_path is None:
+        obs.trigger("SaveSessionAs")
+        return
+
+    le.save_scene(le.scene_path)
 
 
 @obs.on("SaveSessionAs")
 def save_session_as(*args):
-    print("save session as")
+    le = editor.level_editor
+
+    if le.ed_state is GAME_STATE:
+        print("Exit game mode to save scene..!")
+        return
+
+    wild_card = "Scene files (*.{0})|*.{0}".format(SceneFile.EXTENSION)
+    with wx.FileDialog(None, "Save Scene As", defaultDir=le.project.project_path, wildcard=wild_card,
+                       style=wx.FD_SAVE | wx.FD_OVERWRITE_PROMPT) as file_dialog:
+        if file_dialog.ShowModal() == wx.ID_CANCEL:
+            return
+        path = file_dialog.GetPath()
+
+    if not path.endswith("." + SceneFile.EXTENSION):
+        path += "." + SceneFile.EXTENSION
+
+    le.save_scene(path)
 
 
 @obs.on("AppendLibrary")
@@ -173,7 +214,6 @@ def create_asset(asset_type, path):
 def on_scene_start():
     """should be called after a new scene is created"""
     wx_main = editor.wx_main
-    level_editor = editor.level_editor
     inspector = editor.inspector
     scene_graph = editor.scene_graph
     # resource_tree = editor.resource_browser
@@ -182,15 +222,26 @@ def on_scene_start():
 
     # set a default active object for inspector
     inspector.inspector_type_btns.select_button(0)
-    cube = level_editor.active_scene.render.find("**/cube.fbx")
-    cube = cube.getPythonTag(TAG_GAME_OBJECT)
-    # inspector.set_object(cube, cube.get_name(), cube.get_properties())
 
     scene_graph.ExpandAll()  # expand scene graph
     # resource_tree.schedule_dir_watcher()  # start the project directory watcher
     wx_main.thaw()
 
 
+@obs.on("SceneLoadProgress")
+def on_scene_load_progress(num_loaded, total, new_nps):
+    """called every frame while a scene is being loaded"""
+    if len(new_nps) > 0:
+        editor.scene_graph.add_many(new_nps)
+        editor.level_editor.nodes.add(new_nps)
+        editor.level_editor.selection.on_scene_changed()
+
+    if num_loaded < total:
+        editor.wx_main.set_status_bar_text("Loading scene... {0}/{1}".format(num_loaded, total))
+    else:
+        editor.wx_main.set_status_bar_text("Scene loaded, {0} objects".format(total))
+
+
 @obs.on("OnSceneClean")
 def on_scene_clean(scene):
     """is called just before the scene is about to be cleaned"""
@@ -219,6 +270,8 @@ def on_add_nps(nps):
     app.level_editor.deselect_all()
     resource_tree.deselect_all_files()
 
+    app.level_editor.nodes.add(nps)
+    app.level_editor.selection.on_nps_added(nps)
     app.level_editor.set_selected(nps)
 
     for np in nps:
@@ -230,6 +283,26 @@ def on_add_nps(nps):
     wx_main.thaw()
 
 
+@obs.on("OnModelLoaded")
+def on_model_loaded(np):
+    """called when an asynchronously loaded model is attached to its placeholder nodepath"""
+    scene_graph = editor.scene_graph
+    le = editor.level_editor
+
+    # children and bounds of placeholder changed
+    if np.uid in le.nodes:
+        le.nodes.add([np])
+    le.selection.on_nps_added([np])
+
+    # placeholder may have been removed from scene (e.g. by undo) while model was loading,
+    # in that case its children are added to scene graph when it is restored
+    if np in scene_graph.np_id_to_tree_item_map:
+        scene_graph.add(np, parent_item=scene_graph.np_id_to_tree_item_map[np], only_children=True)
+
+    if np in le.selection.selected_nps:
+        le.update_gizmo()
+
+
 @obs.on("OnRemoveNPs")
 def on_remove_nps(nps):
     app = editor.p3d_app
@@ -237,6 +310,8 @@ def on_remove_nps(nps):
     inspector = editor.inspector
 
     app.level_editor.deselect_all()
+    app.level_editor.nodes.remove(nps)
+    app.level_editor.selection.on_nps_removed(nps)
     scene_graph.on_remove(nps)
     inspector.layout_auto()
 
@@ -318,8 +393,15 @@ def print_task_mgr(*args):
     print(editor.p3d_app.show_base.taskMgr)
 
 
+@obs.on("OnFilesChanged")
+def on_files_changed(change_set):
+    """called by directory watcher with a ChangeSet of all added, modified, moved or deleted files"""
+    # make sure models are loaded again from changed source files
+    editor.level_editor.model_cache.invalidate(change_set.all_paths())
+
+
 @obs.on("EditorReload")
-def reload_editor(*args):
+def reload_editor(change_set=None):
     le = editor.level_editor
     wx_main = editor.wx_main
     inspector = editor.inspector
@@ -335,11 +417,16 @@ def reload_editor(*args):
 
     wx_main.freeze()
 
-    # rebuild resources tree and reload all resources
-    resource_tree.create_or_rebuild_tree(le.project.project_path, rebuild_event=True)
-    le.register_user_modules(resource_tree.resources["py"])
-    le.reload_components(resource_tree.resources["py"])
-    le.register_text_files(resource_tree.resources["txt"])
+    # update resources tree from directory watcher's change set, or rebuild it if there is none
+    if isinstance(change_set, ChangeSet):
+        resource_tree.apply_change_set(change_set)
+    else:
+        resource_tree.create_or_rebuild_tree(le.project.project_path, rebuild_event=True)
+    # only changed modules and modules depending on them are reloaded
+    changed = le.find_changed_modules(editor.resources.get_paths("py"))
+    le.register_user_modules(editor.resources.get_paths("py"), changed)
+    le.reload_components(editor.resources.get_paths("py"), changed)
+    le.register_text_files(editor.resources.get_paths("txt"))
     # ---------------------------------------------------
 
     scene_graph.rebuild()  # rebuild the scene graph
@@ -428,6 +515,7 @@ def property_modified(property_):
     """is called after a wx-property is modified from inspector,
     call any post property modify event here"""
     le = editor.level_editor
+    le.selection.on_nps_transformed(le.selection.selected_nps)
     le.update_gizmo()
 
     # TODO this should be replaced by some kind of property flag
@@ -474,6 +562,10 @@ def open_social_media_link(link: str):
 
 @obs.on("CloseApp")
 def exit_app(close_wx=True):
+    # incremental resource updates are saved with a delay, save them before exiting
+    if editor.resource_browser is not None:
+        editor.resource_browser.save_index()
+
     if close_wx:
         editor.wx_main.Close()
     editor.p3d_app.quit()
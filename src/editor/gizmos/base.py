@@ -17,6 +17,8 @@ class Base(NodePath, SingleTask):
         self.size = 1
 
         self.axes = []
+        self.picker = None  # set by the gizmo manager
+
 
         # Set this node up to be drawn over everything else
         self.setBin('fixed', 40)
@@ -30,10 +32,19 @@ class Base(NodePath, SingleTask):
         """
         if self.dragging:
             self.Transform()
+            self.MarkPickerDirty()
 
         scale = (self.getPos() - self.camera.getPos()).length() / 6
         self.setScale(scale)
 
+    def MarkPickerDirty(self):
+        """
+        Make the manager's picker test the gizmo again, call this whenever the
+        gizmo is moved, shown, hidden or resized.
+        """
+        if self.picker is not None:
+            self.picker.MarkDirty()
+
     def on_start(self):
         """
         Starts the gizmo adding the task to the task manager, refreshing it
@@ -58,6 +69,7 @@ class Base(NodePath, SingleTask):
         # Hide the gizmo and ignore all events
         self.detachNode()
         self.ignoreAll()
+        self.MarkPickerDirty()
 
     def AcceptEvents(self):
         """Bind all events for the gizmo."""
@@ -89,6 +101,7 @@ class Base(NodePath, SingleTask):
         on all axes.
         """
         self.size *= factor
+        self.MarkPickerDirty()
 
         # Each axis may have different rules on how to appear when scaled, so
         # call set size on each of them
@@ -145,6 +158,8 @@ class Base(NodePath, SingleTask):
             # Hide the gizmo
             self.detachNode()
 
+        self.MarkPickerDirty()
+
     def OnMouseUp(self):
         """
         Set the dragging flag to false and reset the size of the gizmo on the
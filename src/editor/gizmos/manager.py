@@ -1,4 +1,4 @@
-from pandac.PandaModules import DirectionalLight
+from pandac.PandaModules import DirectionalLight, CollisionNode
 from editor.utils import Object
 from editor.selection.mousePicker import MousePicker
 
@@ -10,8 +10,11 @@ class Manager(Object):
         self._gizmos = {}
         self._activeGizmo = None
 
-        # Create gizmo manager mouse picker
-        self.picker = MousePicker('GizmoMgrMousePicker', *args, **kwargs)
+        # Create gizmo manager mouse picker, it only tests collision solids of
+        # the gizmos under the gizmo root and only when the mouse, camera or
+        # gizmos moved
+        self.picker = MousePicker('GizmoMgrMousePicker', *args,
+                                  fromCollideMask=CollisionNode.getDefaultCollideMask(), **kwargs)
         self.picker.Start()
 
         # Create a directional light and attach it to the camera so the gizmos
@@ -22,6 +25,7 @@ class Manager(Object):
     def AddGizmo(self, gizmo):
         """Add a gizmo to be managed by the gizmo manager."""
         gizmo.rootNp = self.rootNp
+        gizmo.picker = self.picker
         self._gizmos[gizmo.getName()] = gizmo
 
         for axis in gizmo.axes:
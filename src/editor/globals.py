@@ -1,5 +1,6 @@
 from thirdparty.event.observable import Observable
 from editor.utils import ObjectRepository
+from editor.utils.resourceRegistry import ResourceRegistry
 from editor.constants import TAG_GAME_OBJECT
 
 
@@ -14,6 +15,7 @@ class Editor:
 
     __observer = Observable()
     __repository = ObjectRepository()
+    __resources = ResourceRegistry()
 
     __p3d_app = None
     __game = None
@@ -46,6 +48,10 @@ class Editor:
     def observer(self):
         return self.__observer
 
+    @property
+    def resources(self):
+        return self.__resources
+
     @property
     def repository(self):
         return self.repository
@@ -1,3 +1,4 @@
+import os
 import traceback
 import panda3d.core as p3d_core
 import editor.core as ed_core
@@ -13,6 +14,8 @@ from direct.showbase.DirectObject import DirectObject
 from direct.showbase.Loader import Loader
 from direct.showbase.ShowBase import taskMgr
 from editor.project import Project
+from editor.sceneManager import SceneManager
+from editor.sceneSnapshot import SceneSnapshot
 from editor.globals import editor
 from editor.selection import Selection
 from editor.pluginManager import PluginsManager
@@ -31,7 +34,7 @@ NODE_TYPE_MAP = {constants.DIRECTIONAL_LIGHT: ed_nodepaths.EdDirectionalLight,
                  constants.AMBIENT_LIGHT: ed_nodepaths.EdAmbientLight,
                  constants.CAMERA_NODEPATH: ed_nodepaths.CameraNodePath,
                  constants.NODEPATH: ed_nodepaths.ModelNodePath,
-                 constants.ACTOR_NODEPATH: None}
+                 constants.ACTOR_NODEPATH: ed_nodepaths.ActorNodePath}
 
 
 class LevelEditor(DirectObject):
@@ -47,8 +50,11 @@ class LevelEditor(DirectObject):
         self.project = Project(panda_app)
         self.editor_settings = EditorSettings(self)
         self.plugins_manager = PluginsManager()
+        self.scene_manager = SceneManager(self)
 
         self.active_scene = None
+        self.scene_path = None  # path of file active scene was last saved to or opened from
+        self.nodes = ed_utils.NodeRegistry()  # all editor nodepaths of active scene by uid and name
 
         # gizmos, grid, selection
         self.grid_np = None
@@ -104,6 +110,10 @@ class LevelEditor(DirectObject):
         # available loaded resources
         # TODO replace this with ResourceHandler
         self.__loader = Loader(self.app.show_base)
+        self.__model_cache = ed_utils.ModelCache(self.__loader, constants.MODEL_CACHE_SIZE)
+        self.__asset_baker = None
+        self.__preview_renderer = None  # created on first request for a model preview
+        self.__scene_snapshot = None  # state of active scene recorded when game state is enabled
         self.__user_modules = {}
         self.__ed_plugins = {}
         self.__text_files = {}
@@ -138,18 +148,73 @@ class LevelEditor(DirectObject):
             print("[Editor] Cannot create new project in game mode")
             return
 
+        if self.__asset_baker and self.__asset_baker.is_running:
+            taskMgr.remove("BakeAssetsTask")
+            self.__asset_baker.cancel()
+
         self.project.set_project(name, path)
+        self.__model_cache.bam_cache = ed_utils.BamCache(os.path.join(path, constants.EDITOR_CACHE_DIR, "bam"))
+        ed_utils.Importer.registry.cache_dir = os.path.join(path, constants.EDITOR_CACHE_DIR, "bytecode")
         self.create_new_scene(initial=True)
 
+    def bake_assets(self):
+        """converts all models in project to optimized bam files in background processes, and writes a manifest
+        with per asset timings once finished, flattened models are kept apart from model cache's bam cache"""
+        if self.__asset_baker and self.__asset_baker.is_running:
+            print("[Editor] Assets are already being baked")
+            return
+
+        sources = []
+        for ext in ed_utils.assetBaker.BAKE_EXTENSIONS:
+            sources.extend(editor.resources.get_paths(ext))
+
+        baked_cache = ed_utils.BamCache(os.path.join(self.project.project_path, constants.EDITOR_CACHE_DIR,
+                                                     ed_utils.assetBaker.BAKED_CACHE_DIR))
+        self.__asset_baker = ed_utils.AssetBaker(self.__model_cache.bam_cache, baked_cache)
+        self.__asset_baker.start(sources)
+        taskMgr.add(self.__bake_assets_task, "BakeAssetsTask", sort=1)
+
+    def __bake_assets_task(self, task):
+        baker = self.__asset_baker
+        if not baker.poll():
+            editor.wx_main.set_status_bar_text("Baking assets {0}/{1}".format(baker.num_done, baker.num_total))
+            return task.cont
+
+        manifest = baker.write_manifest()
+        failed = len([result for result in baker.results.values() if result["status"] == "failed"])
+        editor.wx_main.set_status_bar_text("Baked {0} assets, {1} failed".format(baker.num_total, failed))
+        print("[Editor] Baked {0} assets, {1} failed, manifest written to {2}".format(baker.num_total, failed, manifest))
+        return task.done
+
     def create_new_scene(self, initial: bool = False):
         """creates and set up a default scene
         initial: Is this the first default scene when a project is created ?"""
 
+        self.create_empty_scene("default")
+        self.scene_path = None
+
+        # finally, set up the default scene
+        self.setup_default_scene()
+
+        # ------------------------------------------------------------------------------------
+        # TODO replace this with a general call to reload resources
+        if initial:
+            editor.resource_browser.remove_all_libs()
+            editor.resource_browser.create_or_rebuild_tree(self.project.project_path, rebuild_event=False)
+            self.register_user_modules(editor.resources.get_paths("py"))
+            self.register_text_files(editor.resources.get_paths("txt"))
+            editor.resource_browser.schedule_dir_watcher()
+
+    def create_empty_scene(self, name):
+        """cleans the current active scene and replaces it with a new empty scene"""
+        self.scene_manager.stop_loading()
+
         if self.active_scene:
             self.clean_active_scene()
 
         # create a new scene
-        self.active_scene = self.project.game.create_new_scene("default")
+        self.active_scene = self.project.game.create_new_scene(name)
+        self.scene_manager.active_scene = self.active_scene
 
         # get the wx-scene graph panel and set it up
         editor.scene_graph.init(self.active_scene.render)
@@ -157,37 +222,73 @@ class LevelEditor(DirectObject):
         #
         self.selection.active_scene = self.active_scene
 
-        # finally, set up the default scene
-        self.setup_default_scene()
+    def save_scene(self, path):
+        """saves active scene to a scene file at path"""
+        if self.ed_state == constants.GAME_STATE:
+            print("[Editor] Cannot save scene in game mode")
+            return False
 
-        # ------------------------------------------------------------------------------------
-        # TODO replace this with a general call to reload resources
-        if initial:
-            editor.resource_browser.remove_all_libs()
-            editor.resource_browser.create_or_rebuild_tree(self.project.project_path, rebuild_event=False)
-            self.register_user_modules(editor.resource_browser.resources["py"])
-            self.register_text_files(editor.resource_browser.resources["txt"])
-            editor.resource_browser.schedule_dir_watcher()
+        if self.scene_manager.is_loading:
+            print("[Editor] Cannot save scene while it is being loaded")
+            return False
+
+        if not ed_utils.try_execute(self.scene_manager.save_scene, path):
+            print("[Editor] Unable to save scene {0}".format(path))
+            return False
+
+        self.scene_path = path
+        print("[{0}] Saved scene {1}.".format(self.today, path))
+        return True
+
+    def open_scene(self, path):
+        """replaces active scene with the scene saved in scene file at path, the scene is
+        loaded incrementally over multiple frames, see SceneManager.load_scene"""
+        if self.ed_state == constants.GAME_STATE:
+            print("[Editor] Cannot open scene in game mode")
+            return False
+
+        self.create_empty_scene(os.path.basename(path).split(".")[0])
+        self.app.command_manager.clear()
+
+        self.scene_manager.load_scene(path, on_finished=lambda nps: self.on_scene_loaded(path, nps))
+        return True
+
+    def on_scene_loaded(self, path, nps):
+        """called by scene manager after a scene file has been completely loaded into active scene"""
+        if nps is None:
+            print("[Editor] Unable to open scene {0}".format(path))
+            return
+
+        def set_main_camera(cam):
+            if not self.active_scene.main_camera:
+                self.set_main_camera(cam)
+
+        self.traverse_scene_graph(self.active_scene.render, cam_func=set_main_camera)
+        self.scene_path = path
+
+        editor.observer.trigger("OnSceneStart")
+        editor.observer.trigger("ToggleSceneLights")
+
+        print("[{0}] Opened scene {1}.".format(self.today, path))
 
     def setup_default_scene(self):
         # add a default sunlight
         self.app.command_manager.do(commands.AddLight("__DirectionalLight__"), select=False)
-        light_np = self.active_scene.render.find("**/DirectionalLight")
-        light_np = light_np.getPythonTag(constants.TAG_GAME_OBJECT)
+        light_np = self.nodes.find("DirectionalLight")
         light_np.setPos(400, 200, 350)
         light_np.setHpr(p3d_core.Vec3(115, -25, 0))
         light_np.set_color(p3d_core.Vec4(1, 0.95, 0.5, 255))
 
         # add a default player camera
         self.app.command_manager.do(commands.AddCamera())
-        cam = self.active_scene.render.find("**/Camera").getNetPythonTag(constants.TAG_GAME_OBJECT)
+        cam = self.nodes.find("Camera")
         cam.setPos(-239.722, 336.966, 216.269)
         cam.setHpr(p3d_core.Vec3(-145.0, -20, 0))
         self.set_main_camera(cam)
 
         # add a default cube
         self.app.command_manager.do(commands.ObjectAdd(constants.CUBE_PATH))
-        obj = self.active_scene.render.find("**/cube.fbx")
+        obj = self.nodes.find("cube.fbx")
         obj.setScale(0.5)
 
         self.set_active_gizmo("pos")
@@ -200,15 +301,40 @@ class LevelEditor(DirectObject):
 
         self.scene_lights_on = False
         self.selection.deselect_all()
+        self.nodes.clear()
         self.active_scene.render.remove_node()
 
     # -------------------------------Resources section-----------------------------#
     # load and register resources
     # TODO replace this with ResourceHandler
 
-    def register_user_modules(self, modules_paths):
+    def find_changed_modules(self, modules_paths):
+        """returns paths of user modules that have to be reloaded, i.e. new, changed or removed modules
+        and all modules that import any of them, modules_paths = all python modules in project"""
+        registry = ed_utils.Importer.registry
+        paths = set(modules_paths)
+
+        changed = {path for path in paths if registry.is_stale(path)}
+        changed |= {path for path in registry if path not in paths}  # removed modules
+        changed |= {path for path in self.__user_modules.keys() if path not in paths}
+
+        # dependents are looked up before and after updating dependency graph,
+        # to include importers of removed modules as well as modules that just started importing a changed one
+        dependents = registry.get_dependents(changed)
+        registry.graph.update(modules_paths)
+        changed |= dependents | registry.get_dependents(changed | dependents)
+
+        # make sure dependents are executed again as well, even though their files did not change
+        for path in changed:
+            registry.invalidate(path)
+
+        return changed
+
+    def register_user_modules(self, modules_paths, changed=None):
         """Imports, instantiates, reload and registers RuntimeModules and EditorPlugins
-        modules_paths = all python modules in project"""
+        modules_paths = all python modules in project
+        changed = paths of modules to reload (see find_changed_modules), all other already registered
+        modules keep running, if None all modules are reloaded"""
         def init_runtime_module(name, runtime_module, path_):
             instance = runtime_module(
                 name=name,
@@ -242,16 +368,26 @@ class LevelEditor(DirectObject):
             )
             return instance
 
-        if len(modules_paths) == 0:
-            return True
+        if changed is None:
+            # full reload (e.g. on project open), dependency graph has not been built yet
+            ed_utils.Importer.registry.graph.update(modules_paths)
+            changed = set(modules_paths) | set(self.__user_modules.keys())
 
-        imported_modules = ed_utils.try_execute_1(ed_utils.Importer.import_modules, modules_paths)
+        # resources of unchanged modules may have been recreated by resource browser, link them again
+        for path, module in self.__user_modules.items():
+            editor.resources.set_module(path, module)
+
+        # only changed modules and modules not registered yet (e.g. components) are imported,
+        # unchanged modules are not executed again by importer
+        to_load = [path for path in modules_paths if path in changed or path not in self.__user_modules]
+        imported_modules = ed_utils.try_execute_1(ed_utils.Importer.import_modules, to_load)
         if imported_modules is None:
             return
 
         saved_data = {}  # cls_name: user_mod.saved_data
-        for key in self.__user_modules.keys():
-            user_mod = self.__user_modules[key]
+        for key in [key for key in self.__user_modules.keys() if key in changed]:
+            user_mod = self.__user_modules.pop(key)
+            editor.resources.set_module(key, None)
 
             cls_instance = user_mod.class_instance
             cls_instance.ignore_all()
@@ -259,13 +395,20 @@ class LevelEditor(DirectObject):
             user_mod.save_data()
             saved_data[key] = user_mod.saved_data
 
-        self.app.show_base.clear_ed_aspect_2d()
-        self.__user_modules.clear()
-        self.unregister_editor_plugins()
+            if self.__ed_plugins.get(cls_instance.name, None) is cls_instance:
+                cls_instance.stop()
+                del self.__ed_plugins[cls_instance.name]
+
+        if len(self.__user_modules) == 0:
+            self.app.show_base.clear_ed_aspect_2d()
+
+        # menu entries of plugins and user commands are rebuilt for plugins that are still running
+        self.app.wx_main.menu_bar.clear_ed_plugin_menus()
+        for name in self.__ed_plugins.keys():
+            self.app.wx_main.menu_bar.add_ed_plugin_menu(name)
         self.unregister_user_commands()
 
-        game_modules = {}  # save runtime modules here
-        ed_plugins = []  # save editor plugins here
+        ed_plugins = []  # save newly loaded editor plugins here
 
         for path, mod, cls_name in imported_modules:
             if hasattr(mod, cls_name):
@@ -308,6 +451,7 @@ class LevelEditor(DirectObject):
                 # create a new user module
                 module = ed_core.UserModule(path, cls_instance, cls_instance.sort)
                 self.__user_modules[path] = module
+                editor.resources.set_module(path, module)
 
                 # try restore data
                 if saved_data.__contains__(path):
@@ -316,7 +460,6 @@ class LevelEditor(DirectObject):
                     self.__user_modules[path].reload_data()
 
                 if module_type == constants.RuntimeModule:
-                    game_modules[path] = self.__user_modules[path]
                     print("[{0}] Loaded RuntimeUserModule {1}.".format(self.today, cls_name))
 
                 elif module_type == constants.EditorPlugin:
@@ -327,9 +470,12 @@ class LevelEditor(DirectObject):
 
         # finally, register editor tools
         self.register_editor_plugins(ed_plugins)
-        self.register_user_commands(ed_plugins)
+        self.register_user_commands(self.__ed_plugins.values())
         #
-        # self.project.game.runtime_modules = game_modules
+        game_modules = {}  # all runtime modules, reloaded or not
+        for path, module in self.__user_modules.items():
+            if module.class_instance.type == constants.RuntimeModule:
+                game_modules[path] = module
         self.register_runtime_modules(game_modules)
         #
         return True
@@ -403,6 +549,7 @@ class LevelEditor(DirectObject):
             self.unregister_user_commands()
             del self.__ed_plugins[plugin.name]
             del self.__user_modules[plugin.path]
+            editor.resources.set_module(plugin.path, None)
             print("Unloading editor plugin: {0}".format(plugin.name))
 
         editor.wx_main.menu_bar.clear_ed_plugin_menus()  # clear all plugin menu bar entries
@@ -442,35 +589,30 @@ class LevelEditor(DirectObject):
         )
         return instance
 
-    def reload_components(self, paths: list):
-        nps = []
+    def reload_components(self, paths: list, changed=None):
+        """reloads components whose modules changed (see find_changed_modules), and detaches components whose
+        modules were removed, if changed is None all components are reloaded"""
         existing_components = self.project.game.components
-        saved = {}
 
         for np in existing_components.keys():
-            components = existing_components[np]
-            for comp in components:
-                cls_instance = comp.class_instance
-                cls_instance.ignore_all()
-                # saved user module data for copying data after reloading
-                saved[cls_instance.path] = comp
-
-            np.clear_components()
-            nps.append(np)
+            for comp in existing_components[np]:
+                if changed is not None and comp.path not in changed:
+                    continue
 
-        self.register_component(paths, nps=nps)
+                comp.class_instance.ignore_all()
+                np.detach_component(comp.path)
 
-        new_components = self.project.game.components
-        for np in new_components.keys():
-            components = new_components[np]
-            for comp in components:
-                if comp.path in saved:
-                    comp.copy_data(saved[comp.path])
+                if comp.path in paths:
+                    registered = self.register_component([comp.path], [np])
+                    # copy data from old component
+                    if registered:
+                        registered[0].copy_data(comp)
 
     def get_module(self, file_path):
         """returns a user module by path"""
-        if file_path in self.__user_modules.keys():
-            return self.__user_modules[file_path].class_instance
+        module = editor.resources.get_module(file_path)
+        if module is not None:
+            return module.class_instance
         return None
 
     def get_text_file(self, file_name):
@@ -479,10 +621,8 @@ class LevelEditor(DirectObject):
         return None
 
     def is_module(self, file_path):
-        """returns a user module by path"""
-        if file_path in self.__user_modules.keys():
-            return True
-        return False
+        """returns True if a user module is loaded from file at path"""
+        return editor.resources.get_module(file_path) is not None
 
     def is_text_file(self, name):
         if self.__text_files.__contains__(name):
@@ -553,6 +693,7 @@ class LevelEditor(DirectObject):
         if len(self.selection.previous_matrices) > 0:
             cmd = commands.TransformNPs(self.selection.previous_matrices)
             self.app.command_manager.do(cmd)
+            self.selection.on_nps_transformed(list(self.selection.previous_matrices.keys()))
 
     def set_active_gizmo(self, gizmo):
         self.active_gizmo = gizmo
@@ -659,23 +800,19 @@ class LevelEditor(DirectObject):
             self.project.game.display_region_2d.set_dimensions((0, 0.4, 0, 0.4))
 
         # -----------------------------------------------
-        # clear the runtime scene graph
-        for np in self.active_scene.render.get_children():
-            self.traverse_scene_graph(np,
-                                      light_func=self.active_scene.render.clear_light if self.scene_lights_on else None)
-            np.remove_node()
+        # restore scene graph to its state before game state was enabled,
+        # anything created at runtime is removed
+        self.__scene_snapshot.restore(
+            on_remove=lambda np: self.traverse_scene_graph(
+                np, light_func=self.active_scene.render.clear_light if self.scene_lights_on else None))
+        self.__scene_snapshot = None
+        self.selection.on_scene_changed()
+        self.nodes.rebuild(self.active_scene.render)
 
         self.active_scene.main_camera = None
-
-        # restore original saved scene graph
-        for np in self.hidden_np.getChildren():
-            np.reparent_to(self.active_scene.render)
-            self.traverse_scene_graph(np,
-                                      cam_func=self.set_main_camera,
-                                      light_func=self.active_scene.render.set_light if self.scene_lights_on else None)
-
-        self.hidden_np.remove_node()
-        self.hidden_np = None
+        self.traverse_scene_graph(self.active_scene.render,
+                                  cam_func=self.set_main_camera,
+                                  light_func=self.active_scene.render.set_light if self.scene_lights_on else None)
 
         self.bind_key_events()
         editor.observer.trigger("OnEnableEditorState")  # for any cleanup operations
@@ -689,11 +826,8 @@ class LevelEditor(DirectObject):
         # UI updates (inspector, scene graph etc.)
         self.app.command_manager.clear()
 
-        # saves current active scene into a hidden np
-        # duplicate current active scene node-path
-        self.hidden_np = p3d_core.NodePath("Hidden")
-        self.hidden_np = self.active_scene.render.copy_to(self.hidden_np)
-        self.traverse_scene_graph(self.hidden_np, recreate=True)
+        # record state of active scene, so it can be restored once game state is disabled
+        self.__scene_snapshot = SceneSnapshot(self.active_scene.render)
 
         # toggle on maximized game display region
         if self.__game_viewport_maximized:
@@ -705,32 +839,38 @@ class LevelEditor(DirectObject):
         editor.observer.trigger("ResizeEvent")
         self.project.game.start()
 
-    def load_model(self, path):
-        """loads a 3d model from "path" """
-
-        def add_children(_np):
-            if len(_np.getChildren()) > 0:
-                for child in _np.getChildren():
-                    if not type(child) == p3d_core.NodePath:
-                        continue
-                    # print("child: {0} type: {1}".format(child, type(child)))
-                    child = ed_nodepaths.BaseNodePath(child)
-                    child.setColor(p3d_core.LColor(1, 1, 1, 1))
-                    child.setPythonTag(constants.TAG_GAME_OBJECT, child)
-                    if child.get_name() == "":
-                        child.set_name("NoName")
-                    add_children(child)
-
-        np = ed_utils.try_execute_1(self.__loader.loadModel, path)
-        if not np:
-            return
-        np = self.__loader.loadModel(path)
-        np = ed_nodepaths.ModelNodePath(np, path=path)
+    def load_model(self, path, asynchronous=False):
+        """loads a 3d model from "path",
+        if asynchronous is True, an empty placeholder is returned immediately and model is attached to it
+        once it finishes loading in background"""
+
+        def add_children(_np, chain=""):
+            # chain of child indices below model root is kept in a node tag, so that a saved scene can
+            # find sub node again in a new copy of the model, see SceneManager.create_model_child
+            for i, child in enumerate(_np.getChildren()):
+                if not type(child) == p3d_core.NodePath:
+                    continue
+                child_chain = chain + "/" + str(i) if chain else str(i)
+                child = ed_nodepaths.ModelNodePath(child, path=path)
+                child.setTag(constants.TAG_MODEL_CHILD, child_chain)
+                child.setColor(p3d_core.LColor(1, 1, 1, 1))
+                child.setPythonTag(constants.TAG_GAME_OBJECT, child)
+                if child.get_name() == "":
+                    child.set_name("NoName")
+                add_children(child, child_chain)
+
+        if asynchronous:
+            np = self.load_model_async(path, on_loaded=add_children)
+        else:
+            np = ed_utils.try_execute_1(self.__model_cache.load, path)
+            if not np:
+                return
+            np = ed_nodepaths.ModelNodePath(np, path=path)
+            add_children(np)
+
         np.setColor(p3d_core.LColor(1, 1, 1, 1))
         np.setPythonTag(constants.TAG_GAME_OBJECT, np)
 
-        add_children(np)
-
         if self.ed_state is constants.EDITOR_STATE:
             np.reparent_to(self.active_scene.render)
 
@@ -741,45 +881,85 @@ class LevelEditor(DirectObject):
         self.set_selected([np])
         return np
 
+    def load_model_async(self, path, on_loaded=None):
+        """returns an empty ModelNodePath placeholder for model at "path", the model is loaded on a background
+        thread and its children are moved under placeholder once it is loaded, followed by on_loaded(placeholder),
+        placeholder can be edited, removed or restored like any other nodepath while model is still loading"""
+        np = ed_nodepaths.ModelNodePath(p3d_core.NodePath(p3d_core.ModelRoot(os.path.basename(path))), path=path)
+
+        def on_model_loaded(model):
+            # placeholder was permanently removed before model finished loading
+            if np.is_empty() or model is None:
+                return
+
+            model.get_children().reparent_to(np)
+            if on_loaded:
+                on_loaded(np)
+            editor.observer.trigger("OnModelLoaded", np)
+
+        self.__model_cache.load_async(path, on_model_loaded)
+        return np
+
     def add_actor(self, path):
+        """loads an animated model from "path" as an actor, actors are always loaded synchronously"""
+        parent = self.active_scene.render if self.ed_state is constants.EDITOR_STATE else None
+        actor = self.create_actor_np(path, parent)
+        if actor is None:
+            return None
+
+        editor.observer.trigger("OnAddNPs", [actor])
+        self.set_selected([actor])
+        return actor
+
+    def create_actor_np(self, path, parent=None, uid=None):
+        """loads actor from "path" under parent, does not trigger any editor events, returns None on failure"""
         try:
-            actor = ed_nodepaths.ActorNodePath(path, uid="ActorNodePath")
+            actor = ed_nodepaths.ActorNodePath(path, uid=uid)
         except Exception as e:
-            print(e)
-            return
+            print("[LevelEditor] Unable to load actor {0}: {1}".format(path, e))
+            return None
 
         actor.setPythonTag(constants.TAG_GAME_OBJECT, actor)
-        actor.reparentTo(self.active_scene.render)
-
+        if parent is not None:
+            actor.reparent_to(parent)
         return actor
 
     def add_camera(self):
+        cam_np = self.create_camera_np(self.active_scene.render)
+
+        if not self.active_scene.main_camera:
+            self.active_scene.set_active_camera(cam_np)
+
+        editor.observer.trigger("OnAddNPs", [cam_np])
+        return cam_np
+
+    def create_camera_np(self, parent, uid=None):
+        """creates a new editor camera under parent, does not trigger any editor events"""
         # create a panda3d camera
         np = p3d_core.NodePath(p3d_core.Camera("CameraNodePath"))
 
         # and wrap it into editor camera
-        cam_np = ed_nodepaths.CameraNodePath(np=np, path="")
+        cam_np = ed_nodepaths.CameraNodePath(np=np, path="", uid=uid)
         cam_np.set_name("Camera")
         cam_np.node().setCameraMask(constants.GAME_GEO_MASK)
         cam_np.setPythonTag(constants.TAG_GAME_OBJECT, cam_np)
-        cam_np.reparent_to(self.active_scene.render)
+        cam_np.reparent_to(parent)
         cam_np.setLightOff()
 
         # create a handle for visual representation in editor mode
-        cam_handle = self.__loader.loadModel(constants.CAMERA_MODEL)
+        cam_handle = self.__model_cache.load(constants.CAMERA_MODEL, instance=True)
         cam_handle.show(constants.ED_GEO_MASK)
         cam_handle.hide(constants.GAME_GEO_MASK)
         cam_handle.reparent_to(cam_np)
         cam_handle.setScale(12)
 
-        if not self.active_scene.main_camera:
-            self.active_scene.set_active_camera(cam_np)
-
-        editor.observer.trigger("OnAddNPs", [cam_np])
         return cam_np
 
-    def add_object(self, path):
-        np = self.__loader.loadModel(path, noCache=True)
+    def add_object(self, path, asynchronous=False):
+        if asynchronous:
+            np = self.load_model_async(path)
+        else:
+            np = self.__model_cache.load(path)
         np.set_scale(0.5)
 
         # fix this name otherwise folder name also gets included
@@ -788,7 +968,8 @@ class LevelEditor(DirectObject):
         np.set_name(name)
         # ------------------------------------------------------
 
-        np = ed_nodepaths.ModelNodePath(np=np, path=path)
+        if not asynchronous:
+            np = ed_nodepaths.ModelNodePath(np=np, path=path)
         np.reparent_to(self.active_scene.render)
         np.setPythonTag(constants.TAG_GAME_OBJECT, np)
         np.setHpr(p3d_core.Vec3(0, 90, 0))
@@ -801,6 +982,16 @@ class LevelEditor(DirectObject):
         return np
 
     def add_light(self, light: str):
+        np = self.create_light_np(light, self.active_scene.render)
+        if np:
+            if self.scene_lights_on:
+                self.active_scene.render.setLight(np)
+
+            editor.observer.trigger("OnAddNPs", [np])
+            return np
+
+    def create_light_np(self, light: str, parent, uid=None):
+        """creates a new editor light under parent, does not trigger any editor events"""
         if LIGHT_MAP.__contains__(light):
             x = LIGHT_MAP[light]
 
@@ -812,10 +1003,10 @@ class LevelEditor(DirectObject):
             # create the panda3d light object
             np = p3d_core.NodePath(name)
             np = np.attachNewNode(light_node)
-            np.reparent_to(self.active_scene.render)
+            np.reparent_to(parent)
 
             # wrap it into an editor nodepath
-            np = ed_handle(np=np, path="")
+            np = ed_handle(np=np, path="", uid=uid)
             np.setPythonTag(constants.TAG_GAME_OBJECT, np)
 
             # defaults for light object
@@ -824,15 +1015,24 @@ class LevelEditor(DirectObject):
             np.hide(constants.GAME_GEO_MASK)
 
             # re-parent nodepath to a model for visual representation in editor mode
-            model = self.__loader.loadModel(model, noCache=True)
+            model = self.__model_cache.load(model, instance=True)
             model.reparentTo(np)
 
-            if self.scene_lights_on:
-                self.active_scene.render.setLight(np)
-
-            editor.observer.trigger("OnAddNPs", [np])
             return np
 
+    def create_model_np(self, np, path, uid=None):
+        """wraps an already loaded model into an editor nodepath, does not trigger any editor events"""
+        np = ed_nodepaths.ModelNodePath(np=np, path=path, uid=uid)
+        np.setPythonTag(constants.TAG_GAME_OBJECT, np)
+        return np
+
+    def load_models_async(self, paths, on_loaded):
+        """loads all models in paths on a background thread, on_loaded(path, model) is called on main thread
+        for each of them once it is loaded, model is None if loading failed, cached models are returned
+        immediately"""
+        for path in paths:
+            self.__model_cache.load_async(path, lambda model, path_=path: on_loaded(path_, model))
+
     def on_duplicate_nps(self):
         if len(self.selection.selected_nps) > 0:
             (self.app.command_manager.do(commands.DuplicateNPs(self.app)))
@@ -858,6 +1058,8 @@ class LevelEditor(DirectObject):
         return new_selections
 
     def reparent_np(self, src_nps, target_np):
+        self.selection.on_nps_removed(src_nps)
+
         for i in range(len(src_nps)):
             src_np = src_nps[i]
 
@@ -868,6 +1070,7 @@ class LevelEditor(DirectObject):
 
             src_np.wrtReparentTo(target_np_)
 
+        self.selection.on_nps_added(src_nps)
         return True
 
     def remove_nps(self, nps: list = None, permanent=False):
@@ -916,6 +1119,20 @@ class LevelEditor(DirectObject):
     def set_main_camera(self, cam):
         self.active_scene.set_active_camera(cam)
 
+    @property
+    def model_cache(self):
+        return self.__model_cache
+
+    @property
+    def preview_renderer(self):
+        if self.__preview_renderer is None:
+            self.__preview_renderer = ed_utils.ModelPreviewRenderer(self.app.show_base.main_win, self.__model_cache)
+        return self.__preview_renderer
+
+    @property
+    def has_preview_renderer(self):
+        return self.__preview_renderer is not None
+
     @property
     def game_viewport_maximized(self):
         return self.__game_viewport_maximized
@@ -960,4 +1177,9 @@ class LevelEditor(DirectObject):
         traverse(np)
 
     def get_np_by_uid(self, uid):
-        pass
+        """returns editor nodepath with uid in active scene or None"""
+        return self.nodes.get(uid)
+
+    def get_nps_by_name(self, name):
+        """returns a list of all editor nodepaths named name in active scene"""
+        return self.nodes.get_by_name(name)
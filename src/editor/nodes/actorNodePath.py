@@ -1,8 +1,11 @@
+from panda3d.core import NodePath
 from direct.actor.Actor import Actor
 from editor.nodes.baseNodePath import BaseNodePath
 
 
 class ActorNodePath(BaseNodePath, Actor):
-    def __init__(self, np, uid=None, *args, **kwargs):
-        BaseNodePath.__init__(self, np, uid, *args, **kwargs)
-        Actor.__init__(self, np, *args, **kwargs)
+    def __init__(self, path, uid=None, *args, **kwargs):
+        # actor loads model at path and becomes its root, editor nodepath wraps that same root
+        Actor.__init__(self, path, *args, **kwargs)
+        BaseNodePath.__init__(self, NodePath(self), path, id_="__ActorNodePath__", uid=uid)
+        self.create_properties()
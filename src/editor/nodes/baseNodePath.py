@@ -83,6 +83,11 @@ class BaseNodePath(NodePath):
         if self.__components.__contains__(path):
             del self.__components[path]
 
+    def rebind(self, np):
+        """wraps node of np again, after this nodepath was emptied, e.g. by remove_node"""
+        self.assign(np)
+        self.__np = np
+
     def clear_components(self):
         print("Cleared all Components on {0}".format(self.name))
         self.__components.clear()
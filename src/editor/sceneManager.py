@@ -1,5 +1,18 @@
+import time
+import traceback
+import editor.constants as constants
+from direct.showbase.ShowBase import taskMgr
+from editor.globals import editor
+from editor.nodes.baseNodePath import BaseNodePath
+from editor.utils import EdProperty, ObjectData, SceneFile
 from game.scene import Scene
 
+LIGHT_IDS = [constants.POINT_LIGHT, constants.SPOT_LIGHT, constants.DIRECTIONAL_LIGHT, constants.AMBIENT_LIGHT]
+SAVED_IDS = LIGHT_IDS + [constants.NODEPATH, constants.ACTOR_NODEPATH, constants.CAMERA_NODEPATH]
+
+RECORDS_PER_CHUNK = 32  # number of records materialized between two frame budget checks
+FRAME_BUDGET = 1 / 60  # max time in seconds a scene load is allowed to take per frame
+
 
 class SceneManager:
     def __init__(self, le, *args, **kwargs):
@@ -7,8 +20,259 @@ class SceneManager:
         self.scenes = []  # list of the scenes in this project
         self.active_scene = None
 
+        self.__load_gen = None  # generator for the scene currently being loaded
+        self.__on_load_finished = None
+        self.__num_records = 0
+
     def parse_active_scene(self):
-        pass
+        """returns active scene as a list of SceneFile.NodeRecord, the scene graph is parsed in a single
+        depth first pass, so a parent is always recorded before its children"""
+        records = []
+
+        def traverse(np, parent_index):
+            for child in np.getChildren():
+                index = parent_index
+                obj = child.getPythonTag(constants.TAG_GAME_OBJECT)
+                if isinstance(obj, BaseNodePath) and obj.id in SAVED_IDS:
+                    index = len(records)
+                    records.append(self.create_record(obj, parent_index))
+                traverse(child, index)
+
+        traverse(self.level_ed.active_scene.render, -1)
+        return records
+
+    @staticmethod
+    def create_record(np, parent_index):
+        id_, path = np.id, np.path or ""
+
+        # sub nodes of a model are part of model's file, they are saved as references into model
+        # i.e. "model path|child indices", instead of as models of their own
+        if id_ == constants.NODEPATH and np.hasTag(constants.TAG_MODEL_CHILD):
+            id_, path = constants.MODEL_CHILD, path + "|" + np.getTag(constants.TAG_MODEL_CHILD)
+
+        record = SceneFile.NodeRecord(parent_index, np.uid, id_, path, np.get_name())
+
+        record.properties.extend(EdProperty.Utils.get_property_values(np))
+
+        for path, component in np.components.items():
+            component.save_data()
+            record.components.append((path, component.saved_data.properties))
+
+        return record
+
+    def save_scene(self, path):
+        records = self.parse_active_scene()
+        with open(path, "wb") as file:
+            SceneFile.write_records(file, records)
+
+    def load_scene(self, path, on_finished=None):
+        """starts loading scene file at path into active scene, the scene is loaded incrementally by a task
+        which materializes records in chunks until FRAME_BUDGET is used up and then yields back to taskMgr,
+        "SceneLoadProgress" event is triggered after every frame with number of loaded and total records and
+        newly created nodepaths, finally on_finished(nps) is called with all loaded nodepaths or None on failure"""
+        self.stop_loading()
+        self.__load_gen = self.__load(path)
+        self.__on_load_finished = on_finished
+        taskMgr.add(self.__load_task, "SceneLoadTask", sort=1)
+
+    def stop_loading(self):
+        if self.__load_gen is not None:
+            taskMgr.remove("SceneLoadTask")
+            self.__load_gen.close()
+            self.__load_gen = None
+            self.__on_load_finished = None
+
+    def __load_task(self, task):
+        start = time.perf_counter()
+        new_nps = []
+        try:
+            while time.perf_counter() - start < FRAME_BUDGET:
+                num_loaded, total, nps = next(self.__load_gen)
+                if nps is None:
+                    # waiting for models loaded in background
+                    break
+                new_nps.extend(nps)
+        except StopIteration as e:
+            editor.observer.trigger("SceneLoadProgress", self.__num_records, self.__num_records, new_nps)
+            self.__finish_loading(e.value)
+            return task.done
+        except Exception as e:
+            tb_str = traceback.format_exception(type(e), e, e.__traceback__)
+            for x in tb_str:
+                print(x)
+            self.__finish_loading(None)
+            return task.done
+
+        editor.observer.trigger("SceneLoadProgress", num_loaded, total, new_nps)
+        return task.cont
+
+    def __finish_loading(self, nps):
+        on_finished = self.__on_load_finished
+        self.__load_gen = None
+        self.__on_load_finished = None
+        if on_finished:
+            on_finished(nps)
+
+    def __load(self, path):
+        """generator that loads scene file at path one chunk of records at a time,
+        yields (num_loaded_records, total_records, nodepaths created in this chunk), models are loaded on a
+        background thread, while they are loading nodepaths are None, actors are loaded synchronously and
+        each one is yielded on its own, so that frame budget is checked after every actor"""
+        le = self.level_ed
+        render = self.active_scene.render
+
+        nps = []
+        models = {}  # models[path] = loaded model or None if loading failed
+        components = {}  # components[component_path] = [(np, saved attributes), ...]
+
+        with open(path, "rb") as file:
+            reader = SceneFile.SceneReader(file)
+            self.__num_records = reader.num_records
+            yield 0, reader.num_records, []
+
+            while reader.num_read < reader.num_records:
+                count = min(RECORDS_PER_CHUNK, reader.num_records - reader.num_read)
+                chunk = [reader.read_record() for _ in range(count)]
+
+                # each unique model path is loaded only once and every nodepath referencing it gets a copy,
+                # models of a chunk are loaded in background and chunk waits until all of them are loaded
+                paths = {self.get_model_path(rec) for rec in chunk
+                         if rec.id in (constants.NODEPATH, constants.MODEL_CHILD)}
+                pending = {path for path in paths if path not in models}
+
+                def on_loaded(path_, model):
+                    models[path_] = model
+                    pending.discard(path_)
+
+                le.load_models_async(list(pending), on_loaded)
+                while len(pending) > 0:
+                    yield reader.num_read - count, reader.num_records, None
+
+                created = []
+                for rec in chunk:
+                    # records whose parent failed to load are added to scene render
+                    parent = nps[rec.parent] if rec.parent >= 0 else None
+                    np = self.create_np(rec, parent if parent is not None else render, models)
+                    nps.append(np)
+
+                    if np is None:
+                        continue
+
+                    created.append(np)
+                    for comp_path, attrs in rec.components:
+                        if comp_path not in components:
+                            components[comp_path] = []
+                        components[comp_path].append((np, attrs))
+
+                    if rec.id == constants.ACTOR_NODEPATH:
+                        yield reader.num_read - count, reader.num_records, created
+                        created = []
+
+                yield reader.num_read, reader.num_records, created
+
+        # components are also registered in batches, one import per component type
+        for comp_path, items in components.items():
+            registered = le.register_component([comp_path], [np for np, attrs in items])
+            if registered:
+                for module, (np, attrs) in zip(registered, items):
+                    module.saved_data = ObjectData(module.class_instance.name)
+                    module.saved_data.properties = attrs
+                    module.reload_data()
+
+            yield self.__num_records, self.__num_records, []
+
+        return [np for np in nps if np is not None]
+
+    @staticmethod
+    def get_model_path(rec):
+        """returns path of model a NODEPATH or MODEL_CHILD record refers to"""
+        return rec.path.rpartition("|")[0] if rec.id == constants.MODEL_CHILD else rec.path
+
+    def create_model_child(self, rec, parent, models):
+        """returns editor nodepath for a MODEL_CHILD record, sub node is looked up in model copy it is
+        still part of, if it was moved out of its model a copy of it is taken from model instead"""
+        model_path, _, chain = rec.path.rpartition("|")
+
+        node = self.find_model_child(parent, model_path, chain)
+        if node is None:
+            node = models.get(model_path, None)
+            for i in chain.split("/") if node is not None else []:
+                if int(i) >= node.getNumChildren():
+                    node = None
+                    break
+                node = node.getChild(int(i))
+
+            if node is None:
+                print("[SceneManager] Unable to find {0} in model {1}".format(rec.name, model_path))
+                return None
+            node = node.copyTo(parent)
+
+        np = self.level_ed.create_model_np(node, model_path, uid=rec.uid)
+        np.setTag(constants.TAG_MODEL_CHILD, chain)
+        return np
+
+    @staticmethod
+    def find_model_child(parent, model_path, chain):
+        """returns sub node at chain of child indices below root of model at model_path, if parent is
+        that model's root or one of its sub nodes above chain, otherwise None"""
+        obj = parent.getPythonTag(constants.TAG_GAME_OBJECT)
+        if not isinstance(obj, BaseNodePath) or obj.id != constants.NODEPATH or obj.path != model_path:
+            return None
+
+        parent_chain = obj.getTag(constants.TAG_MODEL_CHILD)
+        if parent_chain:
+            if not chain.startswith(parent_chain + "/"):
+                return None
+            chain = chain[len(parent_chain) + 1:]
+
+        node = parent
+        for i in chain.split("/"):
+            if int(i) >= node.getNumChildren():
+                return None
+            node = node.getChild(int(i))
+
+        # already claimed by another record
+        return None if node.hasPythonTag(constants.TAG_GAME_OBJECT) else node
+
+    @property
+    def is_loading(self):
+        return self.__load_gen is not None
+
+    def create_np(self, rec, parent, models):
+        le = self.level_ed
+
+        if rec.id == constants.NODEPATH:
+            if models.get(rec.path, None) is None:
+                print("[SceneManager] Unable to load model {0}".format(rec.path))
+                return None
+            np = le.create_model_np(models[rec.path].copyTo(parent), rec.path, uid=rec.uid)
+
+        elif rec.id == constants.MODEL_CHILD:
+            np = self.create_model_child(rec, parent, models)
+            if np is None:
+                return None
+
+        elif rec.id == constants.ACTOR_NODEPATH:
+            np = le.create_actor_np(rec.path, parent, uid=rec.uid)
+            if np is None:
+                return None
+
+        elif rec.id in LIGHT_IDS:
+            np = le.create_light_np(rec.id, parent, uid=rec.uid)
+
+        elif rec.id == constants.CAMERA_NODEPATH:
+            np = le.create_camera_np(parent, uid=rec.uid)
+
+        else:
+            print("[SceneManager] Unknown NodePath type {0}".format(rec.id))
+            return None
+
+        np.set_name(rec.name)
+        EdProperty.Utils.set_property_values(np, rec.properties)
+
+        # changing lens type recreates lens properties, so set them again
+        if rec.id == constants.CAMERA_NODEPATH:
+            np.create_properties()
+            EdProperty.Utils.set_property_values(np, rec.properties)
 
-    def load_scene(self, scene):
-        pass
+        return np
@@ -0,0 +1,90 @@
+import panda3d.core as p3d_core
+import editor.constants as constants
+from editor.nodes.baseNodePath import BaseNodePath
+from editor.utils import EdProperty
+
+
+class SceneSnapshot:
+    def __init__(self, render):
+        """records state of scene graph under render that game state is allowed to change, i.e. hierarchy,
+        transforms, render states, names, editor properties and component data, no nodes are copied and no
+        modules are re-imported, since panda3d transform and render states are immutable, recording them is
+        only a reference copy"""
+        self.render = render
+
+        self.nodes = []  # [(node, parent node, sort, transform, render state, name, (control mask, show mask)), ...]
+        self.objects = []  # [(editor nodepath, node, [(property name, value), ...], [(component, saved data), ...]), ...]
+        self.recorded = set()  # all recorded nodes
+
+        self.take()
+
+    def take(self):
+        self.nodes.clear()
+        self.objects.clear()
+        self.recorded.clear()
+
+        def traverse(np):
+            for child in np.getChildren():
+                node = child.node()
+                self.nodes.append((node, np.node(), child.getSort(), node.getTransform(), node.getState(),
+                                   node.getName(), (node.getDrawControlMask(), node.getDrawShowMask())))
+                self.recorded.add(node)
+
+                obj = child.getPythonTag(constants.TAG_GAME_OBJECT)
+                if isinstance(obj, BaseNodePath):
+                    self.objects.append((obj, node, self.record_properties(obj), self.record_components(obj)))
+
+                traverse(child)
+
+        traverse(self.render)
+
+    @staticmethod
+    def record_properties(obj):
+        return EdProperty.Utils.get_property_values(obj)
+
+    @staticmethod
+    def record_components(obj):
+        components = []
+        for component in obj.components.values():
+            component.save_data()
+            components.append((component, component.saved_data))
+        return components
+
+    def restore(self, on_remove=None):
+        """restores recorded state, nodes created after snapshot was taken are removed,
+        on_remove(np) is called for each of them before removing it"""
+
+        # remove everything that did not exist when snapshot was taken
+        def remove_new(np):
+            for child in np.getChildren():
+                if child.node() in self.recorded:
+                    remove_new(child)
+                else:
+                    if on_remove:
+                        on_remove(child)
+                    child.remove_node()
+
+        remove_new(self.render)
+
+        # restore hierarchy, nodes are recorded depth first so parents are always restored before children
+        for node, parent, sort, transform, state, name, (control_mask, show_mask) in self.nodes:
+            np = p3d_core.NodePath.anyPath(node)
+            if np.getParent().isEmpty() or np.getParent().node() != parent or np.getSort() != sort:
+                np.reparentTo(p3d_core.NodePath.anyPath(parent), sort)
+
+            node.setTransform(transform)
+            node.setState(state)
+            node.setName(name)
+            node.adjustDrawMask(control_mask & show_mask, control_mask & ~show_mask, ~control_mask)
+
+        for obj, node, properties, components in self.objects:
+            # editor nodepath itself was removed with remove_node, wrap its node again,
+            # same object is kept so that state that is not a property (e.g. actor parts, camera lens) survives
+            if obj.is_empty():
+                obj.rebind(p3d_core.NodePath.anyPath(node))
+
+            EdProperty.Utils.set_property_values(obj, properties)
+
+            for component, saved_data in components:
+                component.saved_data = saved_data
+                component.reload_data()
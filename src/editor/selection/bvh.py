@@ -0,0 +1,371 @@
+from editor.constants import TAG_GAME_OBJECT
+
+LEAF_SIZE = 4  # max objects in a leaf node
+
+
+class BVHNode:
+    __slots__ = ("lo", "hi", "left", "right", "items", "parent")
+
+    def __init__(self, lo, hi, parent=None):
+        self.lo = lo  # (x, y, z) min corner of axis aligned box
+        self.hi = hi  # (x, y, z) max corner of axis aligned box
+        self.left = None
+        self.right = None
+        self.items = None  # [(np, lo, hi), ...] for leaf nodes, None for inner nodes
+        self.parent = parent
+
+
+def get_union(los, his):
+    """returns (lo, hi) box enclosing boxes with min corners los and max corners his"""
+    return tuple(map(min, zip(*los))), tuple(map(max, zip(*his)))
+
+
+def get_growth(lo, hi, box):
+    """returns increase in half surface area of box (lo, hi) if it is grown to enclose box"""
+    dx, dy, dz = hi[0] - lo[0], hi[1] - lo[1], hi[2] - lo[2]
+    nx = max(hi[0], box[1][0]) - min(lo[0], box[0][0])
+    ny = max(hi[1], box[1][1]) - min(lo[1], box[0][1])
+    nz = max(hi[2], box[1][2]) - min(lo[2], box[0][2])
+    return (nx * ny + ny * nz + nz * nx) - (dx * dy + dy * dz + dz * dx)
+
+
+def get_inverse(direction):
+    return [1 / direction[i] if direction[i] != 0 else float("inf") for i in range(3)]
+
+
+def get_ray_hit(origin, direction, lo, hi, inv=None):
+    """returns ray parameter t at which ray origin + t * direction enters box (lo, hi), 0 if origin is inside
+    box or None if ray misses box, inv is get_inverse(direction) and is computed if not given"""
+    if inv is None:
+        inv = get_inverse(direction)
+
+    t_min, t_max = 0, float("inf")
+    for i in range(3):
+        if direction[i] == 0:
+            if origin[i] < lo[i] or origin[i] > hi[i]:
+                return None
+            continue
+        t1 = (lo[i] - origin[i]) * inv[i]
+        t2 = (hi[i] - origin[i]) * inv[i]
+        if t1 > t2:
+            t1, t2 = t2, t1
+        t_min = max(t_min, t1)
+        t_max = min(t_max, t2)
+        if t_min > t_max:
+            return None
+    return t_min
+
+
+class BVH:
+    def __init__(self, root=None):
+        """bounding volume hierarchy of axis aligned world space boxes of selectable top level objects
+        i.e. tagged children of root, tree is built lazily on first query after mark_dirty, after that added and
+        removed objects are inserted and removed incrementally and boxes of transformed objects are refitted"""
+        self.root = root  # render of active scene, boxes are in its coordinate space
+
+        self.__tree = None
+        self.__leaf_of = {}  # leaf_of[np] = leaf node containing np
+        self.__unbounded = []  # objects with infinite bounds, always returned as candidates
+        self.__dirty = True
+
+    def set_root(self, root):
+        self.root = root
+        self.clear()
+
+    def clear(self):
+        self.__tree = None
+        self.__leaf_of.clear()
+        self.__unbounded.clear()
+        self.__dirty = True
+
+    def mark_dirty(self):
+        """tree is rebuilt on next query, call when many objects are added at once, e.g. while loading a scene"""
+        self.__dirty = True
+
+    def get_box(self, np):
+        """returns (lo, hi) box of np and its children in root's space or None if bounds are infinite,
+        box encloses geometry as well as origins of np and its children, since marquee selects by origin"""
+        bounds = np.getBounds()
+        if bounds.isInfinite():
+            return None
+
+        points = [np.getPos(self.root)]
+        points.extend(child.getPos(self.root) for child in np.findAllMatches("**"))
+
+        if not bounds.isEmpty():
+            # bounds are in np's own space
+            bounds.xform(np.getMat(self.root))
+            points.append(bounds.getMin())
+            points.append(bounds.getMax())
+
+        points = [(p[0], p[1], p[2]) for p in points]
+        return get_union(points, points)
+
+    def get_top_np(self, np):
+        """returns top level object np belongs to or None if np is not under root"""
+        while np.get_parent() != self.root:
+            np = np.get_parent()
+            if np.is_empty():
+                return None
+        return np.getPythonTag(TAG_GAME_OBJECT) if np.hasPythonTag(TAG_GAME_OBJECT) else None
+
+    def add(self, nps):
+        """inserts newly added nps into tree, nps already in tree and top level objects of nps that are not
+        top level objects themselves are refitted instead"""
+        if self.__dirty:
+            return
+
+        if len(nps) > LEAF_SIZE and len(nps) * 8 > len(self.__leaf_of):
+            # rebuilding is cheaper than inserting one by one
+            self.__dirty = True
+            return
+
+        for np in nps:
+            if np.get_parent() != self.root:
+                top_np = self.get_top_np(np)
+                if top_np is not None:
+                    self.update([top_np])
+                continue
+
+            if np in self.__leaf_of or np in self.__unbounded:
+                self.update([np])
+                continue
+
+            box = self.get_box(np)
+            if box is None:
+                self.__unbounded.append(np)
+                continue
+
+            item = (np, box[0], box[1])
+            if self.__tree is None:
+                self.__tree = self.__build_node([item], None)
+                continue
+
+            # descend into child whose box grows least
+            node = self.__tree
+            while node.items is None:
+                node = min((node.left, node.right), key=lambda child: get_growth(child.lo, child.hi, box))
+
+            node.items.append(item)
+            self.__leaf_of[np] = node
+
+            if len(node.items) > LEAF_SIZE:
+                parent = node.parent
+                new_node = self.__build_node(node.items, parent)
+                self.__replace(node, new_node)
+                self.__refit(parent)
+            else:
+                self.__refit(node)
+
+    def remove(self, nps):
+        """removes top level nps from tree, boxes of top level objects of other nps are left as they are
+        since they can only shrink"""
+        if self.__dirty:
+            return
+
+        for np in nps:
+            if np in self.__unbounded:
+                self.__unbounded.remove(np)
+                continue
+
+            leaf = self.__leaf_of.pop(np, None)
+            if leaf is None:
+                continue
+
+            leaf.items = [item for item in leaf.items if item[0] != np]
+            if len(leaf.items) > 0:
+                self.__refit(leaf)
+                continue
+
+            # replace parent of empty leaf with leaf's sibling
+            parent = leaf.parent
+            if parent is None:
+                self.__tree = None
+                continue
+
+            sibling = parent.right if parent.left is leaf else parent.left
+            grand_parent = parent.parent
+            sibling.parent = grand_parent
+            self.__replace(parent, sibling)
+            self.__refit(grand_parent)
+
+    def update(self, nps):
+        """refits boxes of transformed top level nps"""
+        if self.__dirty:
+            return
+
+        for np in nps:
+            leaf = self.__leaf_of.get(np, None)
+            box = self.get_box(np) if leaf is not None else None
+
+            if box is None:
+                # not indexed yet or bounds became infinite
+                self.remove([np])
+                self.add([np])
+                continue
+
+            for i in range(len(leaf.items)):
+                if leaf.items[i][0] == np:
+                    leaf.items[i] = (np, box[0], box[1])
+                    break
+
+            self.__refit(leaf)
+
+    def __replace(self, node, new_node):
+        parent = new_node.parent
+        if parent is None:
+            self.__tree = new_node
+        elif parent.left is node:
+            parent.left = new_node
+        else:
+            parent.right = new_node
+
+    @staticmethod
+    def __refit(node):
+        """recomputes boxes from node up to root of tree"""
+        while node is not None:
+            if node.items is not None:
+                node.lo, node.hi = get_union([item[1] for item in node.items], [item[2] for item in node.items])
+            else:
+                node.lo, node.hi = get_union((node.left.lo, node.right.lo), (node.left.hi, node.right.hi))
+            node = node.parent
+
+    def __build(self):
+        self.__tree = None
+        self.__leaf_of.clear()
+        self.__unbounded.clear()
+        self.__dirty = False
+
+        if self.root is None or self.root.is_empty():
+            return
+
+        items = []
+        for child in self.root.getChildren():
+            if not child.hasPythonTag(TAG_GAME_OBJECT):
+                continue
+            np = child.getPythonTag(TAG_GAME_OBJECT)
+            box = self.get_box(np)
+            if box is None:
+                self.__unbounded.append(np)
+            else:
+                items.append((np, box[0], box[1]))
+
+        if len(items) > 0:
+            self.__tree = self.__build_node(items, None)
+
+    def __build_node(self, items, parent):
+        if len(items) <= LEAF_SIZE:
+            lo, hi = get_union([item[1] for item in items], [item[2] for item in items])
+            node = BVHNode(lo, hi, parent)
+            node.items = items
+            for item in items:
+                self.__leaf_of[item[0]] = node
+            return node
+
+        # split at median of box centers along axis with largest spread of centers, spread is
+        # estimated from a sample of boxes, bounds of inner nodes are computed from their children
+        sample = items[::max(len(items) // 32, 1)]
+        spreads = [max(item[1][i] + item[2][i] for item in sample) - min(item[1][i] + item[2][i] for item in sample)
+                   for i in range(3)]
+        axis = spreads.index(max(spreads))
+        items.sort(key=lambda item: item[1][axis] + item[2][axis])
+        mid = len(items) // 2
+
+        node = BVHNode(None, None, parent)
+        node.left = self.__build_node(items[:mid], node)
+        node.right = self.__build_node(items[mid:], node)
+        node.lo, node.hi = get_union((node.left.lo, node.right.lo), (node.left.hi, node.right.hi))
+        return node
+
+    def query_planes(self, planes):
+        """returns objects whose boxes are not completely outside any of planes, planes are (a, b, c, d)
+        tuples, inside of a plane is a * x + b * y + c * z + d >= 0"""
+        if self.__dirty:
+            self.__build()
+
+        results = list(self.__unbounded)
+        if self.__tree is None:
+            return results
+
+        stack = [self.__tree]
+        while stack:
+            node = stack.pop()
+            lo, hi = node.lo, node.hi
+
+            inside = True
+            outside = False
+            for a, b, c, d in planes:
+                # farthest and nearest corners of box along plane normal
+                far = d + a * (hi[0] if a > 0 else lo[0]) + b * (hi[1] if b > 0 else lo[1]) + \
+                    c * (hi[2] if c > 0 else lo[2])
+                if far < 0:
+                    outside = True
+                    break
+                near = d + a * (lo[0] if a > 0 else hi[0]) + b * (lo[1] if b > 0 else hi[1]) + \
+                    c * (lo[2] if c > 0 else hi[2])
+                if near < 0:
+                    inside = False
+
+            if outside:
+                continue
+
+            if inside:
+                self.__collect(node, results)
+            elif node.items is not None:
+                results.extend(item[0] for item in node.items)
+            else:
+                stack.append(node.left)
+                stack.append(node.right)
+
+        return results
+
+    def __collect(self, node, results):
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.items is not None:
+                results.extend(item[0] for item in node.items)
+            else:
+                stack.append(node.left)
+                stack.append(node.right)
+
+    def query_ray(self, origin, direction):
+        """returns [(distance, np), ...] for objects whose boxes are hit by ray, sorted by distance along ray
+        at which it enters their boxes, direction should be normalized"""
+        if self.__dirty:
+            self.__build()
+
+        results = [(0, np) for np in self.__unbounded]
+        if self.__tree is None:
+            return results
+
+        inv = get_inverse(direction)
+
+        def hit(lo, hi):
+            return get_ray_hit(origin, direction, lo, hi, inv)
+
+        stack = [self.__tree]
+        while stack:
+            node = stack.pop()
+            if hit(node.lo, node.hi) is None:
+                continue
+
+            if node.items is not None:
+                for np, lo, hi in node.items:
+                    t = hit(lo, hi)
+                    if t is not None:
+                        results.append((t, np))
+            else:
+                stack.append(node.left)
+                stack.append(node.right)
+
+        results.sort(key=lambda result: result[0])
+        return results
+
+    def __contains__(self, np):
+        return np in self.__leaf_of
+
+    def __len__(self):
+        if self.__dirty:
+            self.__build()
+        return len(self.__leaf_of) + len(self.__unbounded)
@@ -1,4 +1,6 @@
-from panda3d.core import NodePath, CardMaker, LineSegs, Point2
+import itertools
+import numpy
+from panda3d.core import NodePath, CardMaker, LineSegs, Point2, Point3
 from editor.utils import SingleTask
 
 TOLERANCE = 1e-3
@@ -56,8 +58,77 @@ class Marquee(NodePath, SingleTask):
         # Hide the marquee
         self.hide()
     
-    def IsNodePathInside(self, np):
-        """Test if the specified node path lies within the marquee area."""
+    def GetRect(self):
+        """Return (min x, max x, min y, max y) of the marquee in render2d coordinates."""
+        _min, _max = self.getTightBounds()
+        return _min.getX(), _max.getX(), _min.getZ(), _max.getZ()
+
+    def GetFrustumPlanes(self, other):
+        """
+        Return the side planes of the volume seen through the marquee as (a, b, c, d)
+        tuples in the coordinate space of other, points inside the volume are on the
+        positive side of all planes.
+        """
+        lens = self.camera.node().getLens()
+        x0, x1, y0, y1 = self.GetRect()
+
+        def extrude(x, y):
+            near, far = Point3(), Point3()
+            lens.extrude(Point2(x, y), near, far)
+            return other.getRelativePoint(self.camera, near), other.getRelativePoint(self.camera, far)
+
+        corners = [extrude(x0, y0), extrude(x1, y0), extrude(x1, y1), extrude(x0, y1)]
+        center = extrude((x0 + x1) / 2, (y0 + y1) / 2)
+        center = (center[0] + center[1]) / 2
+
+        planes = []
+        for i in range(4):
+            near_a, far_a = corners[i]
+            near_b = corners[(i + 1) % 4][0]
+            normal = (far_a - near_a).cross(near_b - near_a)
+            if normal.length() == 0:
+                # degenerate marquee
+                continue
+            normal.normalize()
+            if normal.dot(center - near_a) < 0:
+                normal = -normal
+            planes.append((normal[0], normal[1], normal[2], -normal.dot(near_a)))
+
+        return planes
+
+    def GetIndicesInside(self, nps, rect=None):
+        """
+        Return indices of node paths in nps that lie within the marquee area, all
+        positions are projected through the camera's view-projection matrix in a
+        single batch, rect is computed if not given.
+        """
+        if len(nps) == 0:
+            return []
+
+        x0, x1, y0, y1 = self.GetRect() if rect is None else rect
+
+        # rows of points are transformed as row vectors, same as panda's matrices
+        mat = self.rootNp.getMat(self.camera) * self.camera.node().getLens().getProjectionMat()
+        mat = numpy.array([tuple(mat.getRow(i)) for i in range(4)])
+
+        pos = numpy.fromiter(itertools.chain.from_iterable(np.getPos(self.rootNp) for np in nps),
+                             dtype=numpy.float64, count=len(nps) * 3).reshape(-1, 3)
+        full = pos @ mat[:3] + mat[3]
+
+        # same as lens.project, point must be in front of camera and between near and far planes
+        w = full[:, 3]
+        valid = w > 0
+        w = numpy.where(valid, w, 1)
+        x, y, z = full[:, 0] / w, full[:, 1] / w, full[:, 2] / w
+
+        inside = valid & (z >= -1) & (z <= 1) & (x0 < x) & (x < x1) & (y0 < y) & (y < y1)
+        return numpy.flatnonzero(inside).tolist()
+
+    def IsNodePathInside(self, np, rect=None):
+        """
+        Test if the specified node path lies within the marquee area, rect is the
+        marquee's rectangle as returned by GetRect, it is computed if not given.
+        """
 
         np_world_pos = np.getPos(self.rootNp)
         p3 = self.camera.getRelativePoint(self.rootNp, np_world_pos)
@@ -69,10 +140,9 @@ class Marquee(NodePath, SingleTask):
             return False
 
         # Test point is within bounds of the marquee
-        _min, _max = self.getTightBounds()
+        x0, x1, y0, y1 = self.GetRect() if rect is None else rect
 
-        if (_min.getX() < p2.getX() < _max.getX() and
-                _min.getZ() < p2.getY() < _max.getZ()):
+        if x0 < p2.getX() < x1 and y0 < p2.getY() < y1:
             return True
 
         return False
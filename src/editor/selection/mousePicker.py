@@ -16,6 +16,12 @@ class MousePicker(SingleTask):
         self.node = None
         self.collEntry = None
 
+        # The hierarchy is only traversed again when the mouse or camera moved, or
+        # MarkDirty was called, otherwise the last hit is kept
+        self._lastMousePos = None
+        self._lastCamMat = None
+        self._dirty = True
+
         # Create collision nodes
         self.collTrav = CollisionTraverser()
         # self.collTrav.showCollisions( render )
@@ -48,6 +54,14 @@ class MousePicker(SingleTask):
         if x is None or y is None:
             return
 
+        camMat = self.camera.getMat(self.rootNp)
+        if not self._dirty and (x, y) == self._lastMousePos and camMat == self._lastCamMat:
+            return
+
+        self._dirty = False
+        self._lastMousePos = (x, y)
+        self._lastCamMat = camMat
+
         self.pickerRay.setFromLens(self.camera.node(), x, y)
 
         # Traverse the hierarchy and find collisions
@@ -80,6 +94,13 @@ class MousePicker(SingleTask):
             messenger.send('%s-mouse-leave' % self.node.getName(), [self.collEntry])
             self.node = None
 
+    def MarkDirty(self):
+        """
+        Traverse the hierarchy again on the next update, call this when nodes
+        under the root node are added, removed or moved.
+        """
+        self._dirty = True
+
     def FireEvent(self, event):
         """
         Send a message containing the node name and the event name, including
@@ -88,6 +109,46 @@ class MousePicker(SingleTask):
         if self.node is not None:
             messenger.send('%s-%s' % (self.node.getName(), event), [self.collEntry])
 
+    def GetRay(self, other, x=None, y=None):
+        """
+        Return (origin, normalized direction) of the ray through the mouse or x, y
+        in the coordinate space of other.
+        """
+        if x is None or y is None:
+            mp = self.mouseWatcherNode.getMouse()
+            x, y = mp.getX(), mp.getY()
+
+        self.pickerRay.setFromLens(self.camera.node(), x, y)
+        origin = other.getRelativePoint(self.camera, self.pickerRay.getOrigin())
+        direction = other.getRelativeVector(self.camera, self.pickerRay.getDirection())
+        direction.normalize()
+        return origin, direction
+
+    def GetClosestNodePath(self, candidates, origin, other):
+        """
+        Traverse candidates, a list of (distance, node path) sorted by distance at
+        which the ray enters their bounds, and return the closest hit node path or
+        None, traversal stops once a hit is closer than the next candidate's bounds.
+        The ray must already be set with GetRay.
+        """
+        closest = None
+        closest_dist = None
+
+        for dist, np in candidates:
+            if closest is not None and dist > closest_dist:
+                break
+
+            self.collTrav.traverse(np)
+            if self.collHandler.getNumEntries():
+                self.collHandler.sortEntries()
+                collEntry = self.collHandler.getEntry(0)
+                hit_dist = (collEntry.getSurfacePoint(other) - origin).length()
+                if closest is None or hit_dist < closest_dist:
+                    closest = collEntry.getIntoNodePath()
+                    closest_dist = hit_dist
+
+        return closest
+
     def GetFirstNodePath(self):
         """
         Return the first node in the collision queue if there is one, None
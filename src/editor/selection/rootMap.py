@@ -0,0 +1,57 @@
+from editor.constants import TAG_GAME_OBJECT
+
+
+class RootMap:
+    def __init__(self, root=None):
+        """maps nodes of a scene to selectable top level objects i.e. tagged children of root they belong to,
+        nodes of added objects are mapped eagerly with add, any other node is mapped on first lookup"""
+        self.root = root
+        self.__roots = {}  # roots[node path] = top level object
+
+    def set_root(self, root):
+        self.root = root
+        self.clear()
+
+    def clear(self):
+        self.__roots.clear()
+
+    def get_root(self, np):
+        """returns top level object np belongs to or None if np is not under root"""
+        walked = []
+        top_np = None
+
+        while not np.is_empty():
+            if np in self.__roots:
+                top_np = self.__roots[np]
+                break
+
+            walked.append(np)
+            parent = np.get_parent()
+            if parent == self.root:
+                top_np = np.getPythonTag(TAG_GAME_OBJECT) if np.hasPythonTag(TAG_GAME_OBJECT) else None
+                break
+            np = parent
+
+        if top_np is not None:
+            for np in walked:
+                self.__roots[np] = top_np
+        return top_np
+
+    def add(self, nps):
+        """maps nps and all of their children, call after nps are added to or reparented under root"""
+        for np in nps:
+            top_np = self.get_root(np)
+            if top_np is None:
+                continue
+            for child in np.findAllMatches("**"):
+                self.__roots[child] = top_np
+
+    def remove(self, nps):
+        """unmaps nps and all of their children, call before nps are removed or reparented"""
+        for np in nps:
+            self.__roots.pop(np, None)
+            for child in np.findAllMatches("**"):
+                self.__roots.pop(child, None)
+
+    def __len__(self):
+        return len(self.__roots)
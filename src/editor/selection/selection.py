@@ -1,13 +1,19 @@
 import panda3d.core as pm
 from editor.selection.marquee import Marquee
 from editor.selection.mousePicker import MousePicker
+from editor.selection.bvh import BVH, get_ray_hit
+from editor.selection.rootMap import RootMap
 from editor.globals import editor
-from editor.constants import TAG_GAME_OBJECT
+from editor.constants import NODEPATH
 
 
 class Selection:
     def __init__(self, active_scene, *args, **kwargs):
 
+        self.bvh = BVH()  # spatial index of top level objects of active scene
+        self.roots = RootMap()  # top level objects of nodes of active scene
+        self.__edited = set()  # top level objects whose children were edited, their picking proxies are stale
+        self.__active_scene = None
         self.active_scene = active_scene
         self.append = False
         self.__selected_nps = []
@@ -56,55 +62,134 @@ class Selection:
         """
 
         self.marquee.Stop()
+
+        # top level objects of all nodes found, in order they are found
         new_selections = []
+        found = set()
+
+        def add(np_):
+            top_np = self.roots.get_root(np_)
+            if top_np is not None and top_np not in found:
+                found.add(top_np)
+                new_selections.append(top_np)
 
         if self.append:
             for np in self.__selected_nps:
-                new_selections.append(np)
+                add(np)
         else:
             self.deselect_all()
 
-        for pick_np in self.active_scene.render.findAllMatches('**'):
-            if pick_np is not None:
-                if self.marquee.IsNodePathInside(pick_np) and pick_np.hasNetPythonTag(TAG_GAME_OBJECT):
-                    np = pick_np.getNetPythonTag(TAG_GAME_OBJECT)
-                    if np not in new_selections:
-                        new_selections.append(np)
+        # only objects whose bounds intersect volume seen through marquee are tested, an object is
+        # selected if it or any of its children lies within marquee, all of them are tested in one batch
+        candidates = self.bvh.query_planes(self.marquee.GetFrustumPlanes(self.active_scene.render))
+        pick_nps = []
+        owners = []
+        for i, top_np in enumerate(candidates):
+            pick_nps.append(top_np)
+            owners.append(i)
+            for child in top_np.findAllMatches('**'):
+                pick_nps.append(child)
+                owners.append(i)
+
+        inside = {owners[i] for i in self.marquee.GetIndicesInside(pick_nps)}
+        for i in sorted(inside):
+            add(candidates[i])
 
         # Add any node path which was under the mouse to the selection.
         np = self.get_np_under_mouse()
-        if np is not None and np.hasNetPythonTag(TAG_GAME_OBJECT):
-            np = np.getNetPythonTag(TAG_GAME_OBJECT)
-            if np not in new_selections:
-                new_selections.append(np)
-
-        final = []
-        for np in new_selections:
-            self.top_np = None
-            self.get_top_np(np)
-            if self.top_np not in final:
-                final.append(self.top_np)
+        if np is not None:
+            add(np)
 
-        return final
+        return new_selections
 
     def get_np_under_mouse(self):
         """
-        Returns the closest node under the mouse, or None if there isn't one.
+        Returns the closest node under the mouse, or None if there isn't one, only
+        objects whose bounds are hit by the mouse ray are tested, closest first.
         """
-        self.picker.on_update(None)
-        picked_np = self.picker.GetFirstNodePath()
-        return picked_np
-
-    top_np = None
-    def get_top_np(self, np):
-        top_np = np.get_parent()
-        if top_np == self.active_scene.render:
-            self.top_np = np.getPythonTag(TAG_GAME_OBJECT)
-            return
+        if not self.picker.mouseWatcherNode.hasMouse():
+            return None
+
+        render = self.active_scene.render
+        origin, direction = self.picker.GetRay(render)
+
+        # objects whose bounds are hit are tested against picking proxies of their models first, only
+        # objects whose proxies are hit are tested against their triangles
+        candidates = []
+        for dist, np in self.bvh.query_ray(origin, direction):
+            proxy = self.get_picking_proxy(np)
+            if proxy is not None:
+                dist = self.hit_proxy(np, proxy, origin, direction)
+                if dist is None:
+                    continue
+            candidates.append((dist, np))
+
+        candidates.sort(key=lambda candidate: candidate[0])
+        return self.picker.GetClosestNodePath(candidates, origin, render)
+
+    def get_picking_proxy(self, np):
+        """returns picking proxy boxes of np's model or None if np is not a model, its model is not loaded or
+        np no longer has its model's hierarchy i.e. its children were edited, added or removed"""
+        if np.id != NODEPATH or not np.path or np in self.__edited:
+            return None
+
+        proxy = editor.level_editor.model_cache.get_picking_proxy(np.path)
+        if proxy is None or np.countNumDescendants() != proxy[0]:
+            return None
+        return proxy[1]
+
+    def __mark_edited(self, nps):
+        """marks top level objects of nps that are not top level objects themselves as edited"""
+        for np in nps:
+            top_np = self.roots.get_root(np)
+            if top_np is not None and top_np != np:
+                self.__edited.add(top_np)
+
+    def hit_proxy(self, np, proxy, origin, direction):
+        """returns distance along ray at which it enters closest box of proxy or None if it misses all of them,
+        ray is transformed into np's space, so boxes are oriented with np"""
+        mat = pm.Mat4(np.getMat(self.active_scene.render))
+        if not mat.invertInPlace():
+            return None
+
+        origin = mat.xformPoint(origin)
+        direction = mat.xformVec(direction)
+
+        hits = [get_ray_hit(origin, direction, lo, hi) for lo, hi in proxy]
+        hits = [t for t in hits if t is not None]
+        return min(hits) if len(hits) > 0 else None
+
+    def on_nps_added(self, nps):
+        """call after nps are added to active scene or reparented"""
+        self.roots.add(nps)
+        self.bvh.add(nps)
+        self.__mark_edited(nps)
+
+    def on_nps_removed(self, nps):
+        """call before nps are removed from active scene or reparented"""
+        self.__mark_edited(nps)
+        self.roots.remove(nps)
+        self.bvh.remove(nps)
+
+    def on_nps_transformed(self, nps):
+        self.bvh.update(nps)
+        self.__mark_edited(nps)
+
+    def on_scene_changed(self):
+        """call after many objects of active scene are added, removed or changed at once, e.g. by scene loading"""
+        self.roots.clear()
+        self.bvh.mark_dirty()
 
-        top_np = top_np.getPythonTag(TAG_GAME_OBJECT)
-        if top_np != self.active_scene.render and top_np is not None:
-            self.get_top_np(top_np)
+    @property
+    def active_scene(self):
+        return self.__active_scene
+
+    @active_scene.setter
+    def active_scene(self, scene):
+        self.__active_scene = scene
+        self.roots.set_root(scene.render if scene else None)
+        self.bvh.set_root(scene.render if scene else None)
+        self.__edited.clear()
 
     @property
     def selected_nps(self):
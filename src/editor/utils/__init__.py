@@ -2,9 +2,18 @@ import editor.utils.property as EdProperty
 import editor.utils.math as common_maths
 import editor.utils.fileUtils as FileUtils
 import editor.utils.importer as Importer
+import editor.utils.sceneFile as SceneFile
 from editor.utils.exceptionHandler import try_execute, try_execute_1
 from editor.utils.objectData import ObjectData
 from editor.utils.objRepo import ObjectRepository
-from editor.utils.directoryWatcher import DirWatcher
+from editor.utils.directoryWatcher import DirWatcher, ChangeSet
 from editor.utils.object import Object
 from editor.utils.singleTask import SingleTask
+from editor.utils.modelCache import ModelCache
+from editor.utils.bamCache import BamCache
+from editor.utils.assetBaker import AssetBaker
+from editor.utils.modelPreviewRenderer import ModelPreviewRenderer
+from editor.utils.projectIndex import ProjectIndex
+from editor.utils.searchIndex import SearchIndex
+from editor.utils.resourceRegistry import ResourceRegistry
+from editor.utils.nodeRegistry import NodeRegistry
@@ -0,0 +1,150 @@
+"""bakes project models to optimized bam files of a BamCache in parallel worker processes,
+can also be run from command line to warm bam caches of a project without starting the editor
+
+    python -m editor.utils.assetBaker <project path>
+"""
+
+import os
+import sys
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+import editor.constants as constants
+from panda3d.core import PandaSystem
+from editor.bakeWorker import bake_asset
+from editor.utils.bamCache import BamCache
+
+BAKE_EXTENSIONS = ["egg", "pz", "obj", "fbx"]  # resource browser extensions of models to bake
+MANIFEST_FILE = "bakeManifest.json"
+BAKED_CACHE_DIR = "baked"  # sub directory of editor cache directory baked models are written to
+
+
+class AssetBaker:
+    def __init__(self, bam_cache, baked_cache, flatten=True, max_workers=None):
+        """bakes models into baked_cache using a pool of max_workers processes (defaults to number of cpus),
+        models that are not in editor's bam_cache yet are written there unflattened as well, so the editor never
+        loads flattened hierarchies, models already baked are skipped, workers only import editor.bakeWorker"""
+        self.bam_cache = bam_cache
+        self.baked_cache = baked_cache
+        self.flatten = flatten
+        self.max_workers = max_workers
+
+        self.results = {}  # results[source] = {"status": baked, cached or failed, "bam": ..., ...}
+        self.num_total = 0
+        self.start_time = 0
+
+        self.__executor = None
+        self.__futures = {}  # futures[future] = (source, baked)
+
+    def start(self, sources):
+        """starts baking models at paths sources, call poll or wait to collect results"""
+        self.results.clear()
+        self.num_total = 0
+        self.start_time = time.perf_counter()
+
+        jobs = []
+        for source in dict.fromkeys(sources):
+            baked = self.baked_cache.get_bam_path(source)
+            if baked is None:
+                continue
+
+            self.num_total += 1
+            if os.path.isfile(baked):
+                self.results[source] = {"status": "cached", "bam": os.path.basename(baked)}
+            else:
+                bam = self.bam_cache.get_bam_path(source)
+                jobs.append((source, bam if not os.path.isfile(bam) else None, baked))
+
+        if len(jobs) > 0:
+            self.__executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            for source, bam, baked in jobs:
+                future = self.__executor.submit(bake_asset, os.path.abspath(source), bam, baked, self.flatten)
+                self.__futures[future] = (source, baked)
+
+    def poll(self):
+        """collects results of finished bake jobs without blocking, returns True once all jobs are finished"""
+        for future in [future for future in self.__futures.keys() if future.done()]:
+            self.__collect(future)
+
+        if len(self.__futures) == 0 and self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
+
+        return not self.is_running
+
+    def wait(self):
+        """blocks until all bake jobs are finished"""
+        for future in list(self.__futures.keys()):
+            future.result()
+        self.poll()
+
+    def cancel(self):
+        if self.__executor is not None:
+            for future in self.__futures.keys():
+                future.cancel()
+            self.__executor.shutdown(wait=False)
+            self.__executor = None
+            self.__futures.clear()
+
+    def __collect(self, future):
+        source, baked = self.__futures.pop(future)
+        try:
+            error, timings = future.result()
+        except Exception as e:
+            error, timings = str(e), {}
+
+        self.results[source] = {"status": "failed" if error else "baked",
+                                "bam": os.path.basename(baked),
+                                "timings": timings}
+        if error:
+            self.results[source]["error"] = error
+            print("[AssetBaker] Unable to bake {0}: {1}".format(source, error))
+
+    def write_manifest(self, path=None):
+        """writes bake results and per asset timings as json, by default into baked cache directory"""
+        path = path if path else os.path.join(self.baked_cache.cache_dir, MANIFEST_FILE)
+        manifest = {
+            "panda3d": PandaSystem.getVersionString(),
+            "flatten": self.flatten,
+            "total_time": time.perf_counter() - self.start_time,
+            "assets": self.results,
+        }
+        with open(path, "w") as file:
+            json.dump(manifest, file, indent=4)
+        return path
+
+    @property
+    def is_running(self):
+        return self.__executor is not None
+
+    @property
+    def num_done(self):
+        return len(self.results)
+
+
+def find_assets(project_path):
+    """returns paths of all bakeable models under project_path"""
+    assets = []
+    for root, dirs, files in os.walk(project_path):
+        dirs[:] = [d for d in dirs if d not in ("__pycache__", constants.EDITOR_CACHE_DIR)]
+        for file in files:
+            if file.split(".")[-1] in BAKE_EXTENSIONS:
+                assets.append(root + "/" + file)
+    return assets
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("usage: python -m editor.utils.assetBaker <project path>")
+        sys.exit(1)
+
+    project = sys.argv[1]
+    baker = AssetBaker(BamCache(os.path.join(project, constants.EDITOR_CACHE_DIR, "bam")),
+                       BamCache(os.path.join(project, constants.EDITOR_CACHE_DIR, BAKED_CACHE_DIR)))
+    baker.start(find_assets(project))
+    baker.wait()
+
+    failed = [source for source, result in baker.results.items() if result["status"] == "failed"]
+    print("[AssetBaker] Baked {0} assets, {1} failed, manifest written to {2}".format(
+        baker.num_total, len(failed), baker.write_manifest()))
+    sys.exit(1 if len(failed) > 0 else 0)
@@ -0,0 +1,156 @@
+import os
+import json
+import queue
+import hashlib
+import threading
+from panda3d.core import Filename, PandaSystem, get_model_path
+from editor.bakeWorker import write_bam
+
+SOURCE_EXTENSIONS = (".egg", ".pz", ".fbx", ".obj", ".gltf", ".glb", ".dae")  # formats that are converted to bam
+VERSION = 1  # increase to invalidate all previously cached bam files
+PROXY_EXTENSION = ".proxy"  # picking proxies are stored next to bam of their model with this extension
+
+
+def find_source(path):
+    """returns absolute os specific path of model file at path, relative paths are searched for on panda3d's
+    model path, returns None if file does not exist"""
+    filename = Filename.fromOsSpecific(path)
+    if not filename.isFullyQualified() and not os.path.isfile(path):
+        filename.resolveFilename(get_model_path().getValue())
+
+    path = filename.toOsSpecific()
+    if os.path.isfile(path):
+        return os.path.normcase(os.path.abspath(path))
+    return None
+
+
+class BamCache:
+    def __init__(self, cache_dir):
+        """content hashed cache of models converted to bam format, a cached bam is used as long as the contents
+        of its source file do not change, sources are only re-hashed when their size or modification time changes"""
+        self.cache_dir = cache_dir
+        self.__hashes = {}  # hashes[source file] = (size, mtime, content hash)
+        self.__requests = queue.Queue()  # (path, bam path, model) to writer thread
+        self.__thread = None
+
+        if not os.path.isdir(self.cache_dir):
+            os.makedirs(self.cache_dir)
+
+    def get(self, path):
+        """returns path of cached bam for model at path or None if model is not cached"""
+        bam = self.get_bam_path(path)
+        if bam and os.path.isfile(bam):
+            return bam
+        return None
+
+    def store(self, path, model):
+        """writes model loaded from path to cache, returns path of the written bam or None on failure"""
+        bam = self.get_bam_path(path)
+        if bam is None:
+            return None
+
+        if not write_bam(model, bam):
+            print("[BamCache] Unable to convert {0} to bam".format(path))
+            return None
+        return bam
+
+    def store_async(self, path, model):
+        """same as store, but model is written on a worker thread, so loading a model does not wait for its
+        conversion, model must not be modified afterwards, returns path bam will be written to or None"""
+        bam = self.get_bam_path(path)
+        if bam is None:
+            return None
+
+        self.__requests.put((path, bam, model))
+        if self.__thread is None:
+            self.__thread = threading.Thread(target=self.__work, name="BamWriter", daemon=True)
+            self.__thread.start()
+        return bam
+
+    def __work(self):
+        while True:
+            path, bam, model = self.__requests.get()
+            try:
+                success = write_bam(model, bam)
+            except Exception as e:
+                print("[BamCache] Unable to convert {0} to bam: {1}".format(path, e))
+                continue
+
+            if not success:
+                print("[BamCache] Unable to convert {0} to bam".format(path))
+
+    def get_proxy(self, path):
+        """returns picking proxy stored for model at path, see modelCache.create_picking_proxy,
+        or None if there is none"""
+        bam = self.get_bam_path(path)
+        if bam is None or not os.path.isfile(bam + PROXY_EXTENSION):
+            return None
+
+        try:
+            with open(bam + PROXY_EXTENSION, "r") as file:
+                num_nodes, boxes = json.load(file)
+        except (OSError, ValueError) as e:
+            print("[BamCache] Unable to read picking proxy of {0}: {1}".format(path, e))
+            return None
+
+        return num_nodes, tuple((tuple(lo), tuple(hi)) for lo, hi in boxes)
+
+    def store_proxy(self, path, proxy):
+        """stores picking proxy of model at path next to its bam, proxy is removed together with bam"""
+        bam = self.get_bam_path(path)
+        if bam is None:
+            return
+
+        # write to a temporary file first, so that a partially written proxy is never loaded
+        tmp = "{0}{1}.tmp".format(bam, PROXY_EXTENSION)
+        try:
+            with open(tmp, "w") as file:
+                json.dump(proxy, file)
+            os.replace(tmp, bam + PROXY_EXTENSION)
+        except OSError as e:
+            print("[BamCache] Unable to store picking proxy of {0}: {1}".format(path, e))
+
+    def get_bam_path(self, path):
+        """returns path of cache entry for model at path or None if model should not be cached"""
+        if not path.lower().endswith(SOURCE_EXTENSIONS):
+            return None
+
+        source = find_source(path)
+        if source is None:
+            return None
+
+        return os.path.join(self.cache_dir, self.get_hash(source) + ".bam")
+
+    def get_hash(self, source):
+        stat = os.stat(source)
+        if source in self.__hashes:
+            size, mtime, hash_ = self.__hashes[source]
+            if size == stat.st_size and mtime == stat.st_mtime_ns:
+                return hash_
+
+        hash_ = hashlib.sha1()
+        hash_.update("{0}:{1}:{2}".format(VERSION, PandaSystem.getVersionString(), os.path.dirname(source)).encode())
+        with open(source, "rb") as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                hash_.update(chunk)
+
+        hash_ = hash_.hexdigest()
+        self.__hashes[source] = (stat.st_size, stat.st_mtime_ns, hash_)
+        return hash_
+
+    def invalidate(self, files):
+        """removes cached bams of given source files, files should be absolute os specific paths"""
+        for source in files:
+            source = os.path.normcase(os.path.abspath(source))
+            if source in self.__hashes:
+                bam = os.path.join(self.cache_dir, self.__hashes[source][2] + ".bam")
+                for file in (bam, bam + PROXY_EXTENSION):
+                    if os.path.isfile(file):
+                        os.remove(file)
+                del self.__hashes[source]
+
+    def clear(self):
+        for file in os.listdir(self.cache_dir):
+            if file.endswith((".bam", PROXY_EXTENSION)):
+                os.remove(os.path.join(self.cache_dir, file))
+        self.__hashes.clear()
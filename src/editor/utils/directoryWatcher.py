@@ -1,52 +1,172 @@
+import os
+import time
+import queue
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 from direct.showbase.ShowBase import taskMgr
+import editor.constants as constants
 from editor.globals import editor
 
+IGNORED_DIRS = ("__pycache__", constants.EDITOR_CACHE_DIR)  # changes inside these directories are not reported
 
-class DirEventProcessor(FileSystemEventHandler):
+
+def normalize_path(path):
+    """returns path with forward slashes as separators, which is how editor stores resource paths"""
+    return os.path.normpath(path).replace(os.sep, "/")
+
+
+class ChangeSet:
     def __init__(self):
-        self.received_events = []
-        self.dir_event_task = None
-        self.__last_event = None
+        """set of changes to files and directories, with full normalized paths"""
+        self.added = set()
+        self.modified = set()
+        self.deleted = set()
+        self.moved = {}  # moved[src path] = dest path
+        self.dirs = set()  # paths in this change set that are known to be directories
+
+    def add(self, event_type, path, dest_path=None, is_dir=False):
+        """coalesces an event into this change set, so that each path ends up with at most one change"""
+        if is_dir:
+            self.dirs.add(path)
+            if dest_path:
+                self.dirs.add(dest_path)
+
+        if event_type == "created":
+            if path in self.deleted:
+                # deleted and created again
+                self.deleted.discard(path)
+                self.modified.add(path)
+            else:
+                self.added.add(path)
+
+        elif event_type == "modified":
+            if path not in self.added:
+                self.modified.add(path)
+
+        elif event_type == "deleted":
+            self.modified.discard(path)
+            if path in self.added:
+                # created and deleted again, nothing changed
+                self.added.discard(path)
+                return
+
+            # a moved path that is deleted at its destination is deleted at its source
+            for src, dest in list(self.moved.items()):
+                if dest == path:
+                    del self.moved[src]
+                    self.deleted.add(src)
+                    return
+
+            self.deleted.add(path)
+
+        elif event_type == "moved":
+            if path in self.added:
+                self.added.discard(path)
+                self.added.add(dest_path)
+                return
+
+            if path in self.modified:
+                self.modified.discard(path)
+                self.modified.add(dest_path)
+
+            # follow chained moves back to original source
+            src = path
+            for src_, dest in self.moved.items():
+                if dest == path:
+                    src = src_
+                    break
+
+            if src == dest_path:
+                del self.moved[src]  # moved back to where it was
+            else:
+                self.moved[src] = dest_path
+
+    def all_paths(self):
+        """returns all changed paths, including both sources and destinations of moves"""
+        paths = self.added | self.modified | self.deleted
+        paths.update(self.moved.keys())
+        paths.update(self.moved.values())
+        return paths
+
+    def file_names(self):
+        return [path.split("/")[-1] for path in self.all_paths()]
+
+    def is_empty(self):
+        return len(self.added) == 0 and len(self.modified) == 0 and len(self.deleted) == 0 and len(self.moved) == 0
+
+    def __len__(self):
+        return len(self.added) + len(self.modified) + len(self.deleted) + len(self.moved)
+
+    def __repr__(self):
+        return "ChangeSet(added={0}, modified={1}, deleted={2}, moved={3})".format(
+            len(self.added), len(self.modified), len(self.deleted), len(self.moved))
+
+
+class DirEventProcessor(FileSystemEventHandler):
+    def __init__(self, quiet_period=constants.DIR_EVENT_QUIET_PERIOD):
+        """collects directory events from watchdog's thread into a thread safe queue, events are coalesced
+        per path on main thread and delivered as a single ChangeSet once no new event arrives for
+        quiet_period seconds"""
+        self.quiet_period = quiet_period
+        self.__queue = queue.Queue()
+        self.__change_set = None
+        self.__last_event_time = 0
 
     def on_any_event(self, event):
-        if self.dir_event_task is None:
-            taskMgr.add(self.dir_evt_timer, "DirEventTimer", sort=0, priority=None)
-        self.received_events.append(event)
-
-    def dir_evt_timer(self, task):
-        if task.time > 1:
-            taskMgr.remove("DirEventTimer")
-            self.dir_event_task = None
-            self.create_dir_event()
-            return
+        # called from watchdog's observer thread
+        self.__queue.put((event.event_type, event.src_path, getattr(event, "dest_path", None), event.is_directory))
+
+    def start(self):
+        taskMgr.add(self.update, "DirEventTask", sort=0)
+
+    def stop(self):
+        taskMgr.remove("DirEventTask")
+
+    def update(self, task):
+        while True:
+            try:
+                event_type, path, dest_path, is_dir = self.__queue.get_nowait()
+            except queue.Empty:
+                break
+            self.process_event(event_type, path, dest_path, is_dir)
+
+        if self.__change_set is not None and time.monotonic() - self.__last_event_time > self.quiet_period:
+            change_set = self.__change_set
+            self.__change_set = None
+            if not change_set.is_empty():
+                self.create_dir_event(change_set)
+
         return task.cont
 
-    def create_dir_event(self):
-        interested_events = []
-        for evt in self.received_events:
-            path = evt.src_path
-            file_name = path.split("\\")[-1]
+    def process_event(self, event_type, path, dest_path=None, is_dir=False):
+        if event_type not in ("created", "modified", "deleted", "moved"):
+            return
 
-            # new directory sends "created" and "modified" events consecutively,
-            # this will cause editor to reload twice whenever a new dir is created,
-            # this check will ensure "created" and "modified" are not sent consecutively by
-            # keeping track of last event.
-            if evt.event_type == "modified" and self.__last_event == "created":
-                continue
-            self.__last_event = evt.event_type
-            #
-            # -------------------------------------------------------------------------------
+        # directories send "modified" whenever their contents change, contents report their own events
+        if is_dir and event_type == "modified":
+            return
 
-            if any([evt.event_type == "modified", evt.event_type == "created",
-                    evt.event_type == "moved", evt.event_type == "deleted"]):
-                interested_events.append(file_name)
+        path = normalize_path(path)
+        dest_path = normalize_path(dest_path) if dest_path else None
+
+        # files generated by editor or python itself are not of interest
+        if self.is_ignored(path) and (dest_path is None or self.is_ignored(dest_path)):
+            return
 
-        if len(interested_events) > 0:
-            editor.observer.trigger("EditorReload", interested_events)
+        if self.__change_set is None:
+            self.__change_set = ChangeSet()
 
-        self.received_events = []
+        self.__change_set.add(event_type, path, dest_path, is_dir)
+        self.__last_event_time = time.monotonic()
+
+    @staticmethod
+    def is_ignored(path):
+        return any(name in IGNORED_DIRS for name in path.split("/"))
+
+    @staticmethod
+    def create_dir_event(change_set):
+        editor.observer.trigger("OnFilesChanged", change_set)
+        editor.observer.trigger("EditorReload", change_set)
 
 
 class DirWatcher:
@@ -54,7 +174,7 @@ class DirWatcher:
         self.__observer = Observer()
         self.__observer.setDaemon(daemonic=True)
         self.event_handler = DirEventProcessor()
-        
+
         # an observer watch object is returned by self.observer.schedule method,
         # obs-watch_and_paths object maps a path, and it's corresponding observer-watch object
         # obs-watch_and_paths[path] = observer-watch object
@@ -64,6 +184,7 @@ class DirWatcher:
     def run(self):
         # print("Directory watcher initialized")
         self.__observer.start()
+        self.event_handler.start()
         # self.observer.join()
 
     def schedule(self, path, append=True):
@@ -72,7 +193,7 @@ class DirWatcher:
 
         observer_object = self.__observer.schedule(self.event_handler, path, recursive=True)
         self.observer_paths[path] = observer_object
-        
+
     def unschedule(self, path):
         observer_object = self.observer_paths[path]
         self.__observer.unschedule(observer_object)
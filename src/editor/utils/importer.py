@@ -1,23 +1,155 @@
+import os
 import sys
+import time
+import marshal
+import hashlib
 import importlib
+from editor.utils.moduleGraph import ModuleGraph
 
 
-def import_modules(modules_paths):
-    imported = []
+def get_names(path):
+    """returns (module name, class name) for a user module at path"""
+    file = path.split("/")[-1]
+    mod_name = file.split(".")[0]
+    cls_name = mod_name[0].upper() + mod_name[1:]
+    return mod_name, cls_name
 
-    for path in modules_paths:
-        file = path.split("/")[-1]
-        # print("LOADED \n FILE--> {0} \n PATH {1} \n".format(file, path))
 
-        mod_name = file.split(".")[0]
-        cls_name_ = mod_name[0].upper() + mod_name[1:]
+class ModuleRegistry:
+    def __init__(self):
+        """path keyed registry of imported user modules, a module is executed again only
+        when size or modification time of its file changes"""
+        self.__modules = {}  # modules[path] = (mtime, size, module)
+        self.graph = ModuleGraph()  # import dependencies between user modules
+        self.cache_dir = None  # directory for compiled code of user modules, no code is cached if None
+        self.timings = {}  # timings[path] = (seconds spent compiling or loading code, seconds executing, cached)
+
+    def import_module(self, path):
+        stat = os.stat(path)
+        mod_name, cls_name = get_names(path)
+
+        if path in self.__modules:
+            mtime, size, module = self.__modules[path]
+            if mtime == stat.st_mtime_ns and size == stat.st_size:
+                sys.modules[mod_name] = module
+                return module
 
         # load the module
         spec = importlib.util.spec_from_file_location(mod_name, path)
         module = importlib.util.module_from_spec(spec)
         sys.modules[spec.name] = module
-        spec.loader.exec_module(module)
+        try:
+            start = time.perf_counter()
+            code, cached = self.get_code(path)
+            compiled = time.perf_counter()
+            exec(code, module.__dict__)
+            self.timings[path] = (compiled - start, time.perf_counter() - compiled, cached)
+        except Exception:
+            self.invalidate(path)
+            raise
+
+        self.__modules[path] = (stat.st_mtime_ns, stat.st_size, module)
+        return module
+
+    def get_code(self, path):
+        """returns (code object, True if code was loaded from cache) for python file at path,
+        compiled code is cached in cache_dir keyed by hash of source and path"""
+        with open(path, "rb") as file:
+            source = file.read()
+
+        if self.cache_dir is None:
+            return compile(source, path, "exec", dont_inherit=True), False
+
+        hash_ = hashlib.sha1(importlib.util.MAGIC_NUMBER + path.encode() + source).hexdigest()
+        cached = os.path.join(self.cache_dir, hash_ + ".pyc")
+
+        if os.path.isfile(cached):
+            try:
+                with open(cached, "rb") as file:
+                    return marshal.load(file), True
+            except (EOFError, ValueError, TypeError):
+                pass  # corrupt cache file, compile again
+
+        code = compile(source, path, "exec", dont_inherit=True)
+
+        # write to a temporary file first, so that a partially written file is never loaded
+        if not os.path.isdir(self.cache_dir):
+            os.makedirs(self.cache_dir)
+        tmp = "{0}.{1}.tmp".format(cached, os.getpid())
+        with open(tmp, "wb") as file:
+            marshal.dump(code, file)
+        os.replace(tmp, cached)
+
+        return code, False
+
+    def is_stale(self, path):
+        """returns True if module at path was never imported or its file changed since it was imported"""
+        if path not in self.__modules:
+            return True
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return True
+        mtime, size, module = self.__modules[path]
+        return mtime != stat.st_mtime_ns or size != stat.st_size
+
+    def get_dependents(self, paths):
+        """returns paths of modules that import any of the modules at paths, directly or indirectly,
+        graph should be updated with all project modules first"""
+        return self.graph.get_dependents(paths)
+
+    def get_class(self, path):
+        """returns user class defined in already imported module at path or None"""
+        if path in self.__modules:
+            return getattr(self.__modules[path][2], get_names(path)[1], None)
+        return None
 
-        imported.append((path, module, cls_name_))
+    def invalidate(self, path=None):
+        """forces module at path, or all modules if path is None, to be executed again on next import"""
+        if path is None:
+            self.__modules.clear()
+        elif path in self.__modules:
+            del self.__modules[path]
+
+    def __contains__(self, path):
+        return path in self.__modules
+
+    def __iter__(self):
+        return iter(list(self.__modules.keys()))
+
+
+registry = ModuleRegistry()  # shared by everything that imports user modules
+
+
+def import_modules(modules_paths, print_timings=True):
+    imported = []
+    executed = []
+
+    # dependencies are imported before modules importing them
+    for path in registry.graph.sort(modules_paths):
+        # print("LOADED \n FILE--> {0} \n PATH {1} \n".format(file, path))
+        stale = registry.is_stale(path)
+        module = registry.import_module(path)
+        imported.append((path, module, get_names(path)[1]))
+        if stale:
+            executed.append(path)
+
+    if print_timings and len(executed) > 0:
+        print_import_timings(executed)
 
     return imported
+
+
+def print_import_timings(paths, num_slowest=5):
+    """prints total import time of modules at paths, along with timings of num_slowest modules"""
+    paths = sorted(paths, key=lambda path: sum(registry.timings[path][:2]), reverse=True)
+    total = sum(sum(registry.timings[path][:2]) for path in paths)
+    num_cached = len([path for path in paths if registry.timings[path][2]])
+
+    print("[Importer] Imported {0} modules ({1} from cache) in {2:.2f} ms".format(
+        len(paths), num_cached, total * 1000))
+
+    for path in paths[:num_slowest]:
+        compile_time, exec_time, cached = registry.timings[path]
+        print("    {0}: {1} {2:.2f} ms, exec {3:.2f} ms".format(
+            get_names(path)[0], "load" if cached else "compile", compile_time * 1000, exec_time * 1000))
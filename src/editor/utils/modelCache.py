@@ -0,0 +1,245 @@
+import os
+from collections import OrderedDict
+from panda3d.core import NodePath, PandaNode, Filename
+from editor.utils.bamCache import find_source
+
+MAX_PROXY_BOXES = 8  # models with more geom nodes get a single picking proxy box
+
+
+def estimate_size(np):
+    """returns approximate memory size in bytes of geometry and textures under np"""
+    size = 0
+    for geom_np in np.findAllMatches("**/+GeomNode"):
+        geom_node = geom_np.node()
+        for i in range(geom_node.getNumGeoms()):
+            geom = geom_node.getGeom(i)
+
+            vertex_data = geom.getVertexData()
+            for j in range(vertex_data.getNumArrays()):
+                size += vertex_data.getArray(j).getDataSizeBytes()
+
+            for j in range(geom.getNumPrimitives()):
+                size += geom.getPrimitive(j).getDataSizeBytes()
+
+    for texture in np.findAllTextures():
+        size += texture.estimateTextureMemory()
+
+    return size
+
+
+def create_picking_proxy(np):
+    """returns picking proxy of model np, (number of nodes under np, boxes) where boxes is a tuple of
+    (min point, max point) boxes in np's space, one box per geom node or a single box for models with many
+    geom nodes, None if model has no geometry,
+    number of nodes tells whether a copy of the model still has the model's hierarchy"""
+    geom_nps = np.findAllMatches("**/+GeomNode")
+    if geom_nps.getNumPaths() > MAX_PROXY_BOXES:
+        bounds = [np.getTightBounds(np)]
+    else:
+        bounds = [geom_np.getTightBounds(np) for geom_np in geom_nps]
+
+    boxes = tuple(((lo[0], lo[1], lo[2]), (hi[0], hi[1], hi[2])) for lo, hi in (b for b in bounds if b))
+    return (np.countNumDescendants(), boxes) if len(boxes) > 0 else None
+
+
+class ModelCache:
+    def __init__(self, loader, max_size, bam_cache=None):
+        """path keyed cache of loaded model prototypes, each model is read from disk only once and every
+        request for it gets a copy or an instance of the cached prototype,
+        least recently used prototypes are evicted once total size of cached models exceeds max_size bytes,
+        if a bam_cache is set models are loaded from their converted bam files instead of source files"""
+        self.__loader = loader
+        self.bam_cache = bam_cache
+        self.__prototypes = OrderedDict()  # prototypes[path] = (model, size in bytes)
+        self.__size = 0
+        self.__pending = {}  # pending[path] = [(callback, instance), ...] for models being loaded asynchronously
+        self.__proxies = {}  # proxies[path] = picking proxy, kept after prototype is evicted
+        self.max_size = max_size
+
+    def load(self, path, instance=False):
+        """returns a new copy of model at path,
+        if instance is True, returns a new empty node with cached prototype instanced under it instead,
+        instances share the prototype's node hierarchy and should only be used for models that are never
+        edited, e.g. editor handles for lights and cameras"""
+        prototype = self.get_prototype(path)
+        if prototype is None:
+            prototype = self.__load_file(path)
+            self.add(path, prototype)
+
+        return self.__create(prototype, instance)
+
+    def load_many(self, paths, instance=False):
+        """loads all models in paths, models not already cached are loaded from disk in a single batch,
+        returns a dict of path: model, models that failed to load are not included"""
+        paths = list(paths)
+        missing = list(dict.fromkeys(path for path in paths if path not in self.__prototypes))
+
+        # prototypes of this batch, a batch larger than max_size evicts its own prototypes while it is added
+        prototypes = {path: self.get_prototype(path) for path in paths if path in self.__prototypes}
+
+        if len(missing) > 0:
+            bams = [self.__get_bam(path) for path in missing]
+            models = self.__loader.loadModel([bam or path for path, bam in zip(missing, bams)],
+                                             noCache=True, okMissing=True)
+
+            # models whose cached bam failed to load are loaded again from their source files
+            failed = [path for path, bam, model in zip(missing, bams, models) if bam and not model]
+            if len(failed) > 0:
+                models = list(models) + self.__loader.loadModel(failed, noCache=True, okMissing=True)
+                missing = missing + failed
+                bams = bams + [None] * len(failed)
+
+            for path, bam, model in zip(missing, bams, models):
+                if model:
+                    self.__on_file_loaded(path, model, bam is not None)
+                    self.add(path, model)
+                    prototypes[path] = model
+
+        return {path: self.__create(prototype, instance) for path, prototype in prototypes.items()}
+
+    def load_async(self, path, callback, instance=False):
+        """loads model at path on panda3d's asynchronous loader thread and calls callback(model) on main thread
+        once it is loaded, model is None if loading failed, requests for a model that is already
+        being loaded wait on the same request, a cached model is returned immediately"""
+        prototype = self.get_prototype(path)
+        if prototype is not None:
+            callback(self.__create(prototype, instance))
+            return
+
+        if path in self.__pending:
+            self.__pending[path].append((callback, instance))
+            return
+
+        self.__pending[path] = [(callback, instance)]
+        self.__load_file_async(path, self.__get_bam(path))
+
+    def __load_file_async(self, path, bam):
+        self.__loader.loadModel(bam or path, noCache=True, okMissing=True,
+                                callback=lambda model: self.__on_async_loaded(path, model, bam is not None))
+
+    def __on_async_loaded(self, path, model, from_bam):
+        if from_bam and not model:
+            self.__load_file_async(path, None)
+            return
+
+        callbacks = self.__pending.pop(path, [])
+
+        if model:
+            self.__on_file_loaded(path, model, from_bam)
+            self.add(path, model)
+        else:
+            print("[ModelCache] Unable to load model {0}".format(path))
+
+        for callback, instance in callbacks:
+            callback(self.__create(model, instance) if model else None)
+
+    def __get_bam(self, path):
+        if self.bam_cache is None:
+            return None
+        bam = self.bam_cache.get(path)
+        return Filename.fromOsSpecific(bam) if bam else None
+
+    def __load_file(self, path):
+        bam = self.__get_bam(path)
+        if bam:
+            model = self.__loader.loadModel(bam, noCache=True, okMissing=True)
+            if model:
+                self.__on_file_loaded(path, model, True)
+                return model
+
+        model = self.__loader.loadModel(path, noCache=True)
+        self.__on_file_loaded(path, model, False)
+        return model
+
+    def __on_file_loaded(self, path, model, from_bam):
+        if from_bam:
+            # bam files are named after their content hash, use source file name instead
+            model.set_name(Filename.fromOsSpecific(path).getBasename())
+        elif self.bam_cache is not None:
+            # prototype is modified when it is instanced (instanceTo adds a parent), so writer thread
+            # gets a copy of it made here on main thread
+            self.bam_cache.store_async(path, NodePath(model.node().copySubgraph()))
+
+    def invalidate(self, files):
+        """removes cached prototypes and bams of models loaded from any of the given source files"""
+        files = {os.path.normcase(os.path.abspath(file)) for file in files}
+        if self.bam_cache is not None:
+            self.bam_cache.invalidate(files)
+
+        for path in list(self.__prototypes.keys()):
+            if find_source(path) in files:
+                self.remove(path)
+
+        for path in [path for path in self.__proxies.keys() if find_source(path) in files]:
+            del self.__proxies[path]
+
+    def is_pending(self, path):
+        return path in self.__pending
+
+    def add(self, path, model):
+        self.remove(path)
+
+        size = estimate_size(model)
+        self.__prototypes[path] = (model, size)
+        self.__size += size
+
+        self.__evict()
+
+    def get_prototype(self, path):
+        if path in self.__prototypes:
+            self.__prototypes.move_to_end(path)
+            return self.__prototypes[path][0]
+        return None
+
+    def remove(self, path):
+        if path in self.__prototypes:
+            model, size = self.__prototypes.pop(path)
+            self.__size -= size
+
+    def clear(self):
+        self.__prototypes.clear()
+        self.__proxies.clear()
+        self.__size = 0
+
+    def get_picking_proxy(self, path):
+        """returns picking proxy of model at path, see create_picking_proxy, proxy is read from bam cache or
+        created once from cached prototype and stored in bam cache, None is returned if model has no geometry
+        or is neither in bam cache nor loaded"""
+        if path not in self.__proxies:
+            proxy = self.bam_cache.get_proxy(path) if self.bam_cache is not None else None
+            if proxy is None:
+                prototype = self.__prototypes.get(path, (None,))[0]
+                if prototype is None:
+                    return None
+
+                proxy = create_picking_proxy(prototype)
+                if proxy is not None and self.bam_cache is not None:
+                    self.bam_cache.store_proxy(path, proxy)
+
+            self.__proxies[path] = proxy
+
+        return self.__proxies[path]
+
+    def __evict(self):
+        # the most recently added prototype is always kept even if it alone exceeds max_size
+        while self.__size > self.max_size and len(self.__prototypes) > 1:
+            path, (model, size) = self.__prototypes.popitem(last=False)
+            self.__size -= size
+
+    @staticmethod
+    def __create(prototype, instance):
+        if instance:
+            np = NodePath(PandaNode(prototype.get_name()))
+            prototype.instanceTo(np)
+            return np
+        return NodePath(prototype.node().copySubgraph())
+
+    @property
+    def size(self):
+        return self.__size
+
+    def __contains__(self, path):
+        return path in self.__prototypes
+
+    def __len__(self):
+        return len(self.__prototypes)
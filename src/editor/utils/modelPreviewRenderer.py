@@ -0,0 +1,170 @@
+import math
+import time
+from collections import OrderedDict
+from direct.showbase.ShowBase import taskMgr
+from panda3d.core import NodePath, Camera, PerspectiveLens, Texture, AmbientLight, DirectionalLight, Vec3, Vec4, \
+    ClockObject
+
+
+class PreviewSlot:
+    def __init__(self, index, root, cam_np):
+        """one model rendered to its own display region of preview buffer"""
+        self.index = index
+        self.root = root
+        self.cam_np = cam_np
+
+        self.path = None  # model being previewed, None if slot is free
+        self.model = None  # loaded model, not yet placed in slot
+        self.np = None  # placed model
+        self.frame = -1  # frame in which model was placed
+
+
+class ModelPreviewRenderer:
+    def __init__(self, win, model_cache, size=64, num_slots=4, budget=0.004):
+        """renders preview images of models in an offscreen buffer of win, models are loaded asynchronously
+        from model_cache and num_slots models are rendered per frame, each in its own display region,
+        at most budget seconds per frame are spent placing and capturing models"""
+        self.win = win
+        self.model_cache = model_cache
+        self.size = size
+        self.num_slots = num_slots
+        self.budget = budget
+
+        self.__requests = {}  # requests[path] = [callbacks, ...], for all requested models not yet rendered
+        self.__queue = OrderedDict()  # paths of requested models that are not assigned to a slot yet
+        self.__slots = []
+        self.__buffer = None
+        self.__texture = None
+
+    def request(self, path, callback):
+        """requests a preview of model at path, callback(path, width, height, rgb bytes) is called once it is
+        rendered, rgb bytes are None if model could not be loaded"""
+        if path in self.__requests:
+            self.__requests[path].append(callback)
+            return
+
+        self.__requests[path] = [callback]
+        self.__queue[path] = None
+
+        if self.__buffer is None:
+            self.__create_buffer()
+        if not taskMgr.hasTaskNamed("ModelPreviewTask"):
+            taskMgr.add(self.update, "ModelPreviewTask", sort=1)
+
+    def cancel_all(self):
+        """cancels all requests that are not being rendered yet"""
+        for path in self.__queue.keys():
+            del self.__requests[path]
+        self.__queue.clear()
+
+    def __create_buffer(self):
+        self.__texture = Texture("ModelPreviewTexture")
+        self.__buffer = self.win.makeTextureBuffer("ModelPreviewBuffer", self.size * self.num_slots, self.size,
+                                                   self.__texture, to_ram=True)
+        self.__buffer.setSort(-100)
+        self.__buffer.setActive(False)
+
+        for i in range(self.num_slots):
+            dr = self.__buffer.makeDisplayRegion(i / self.num_slots, (i + 1) / self.num_slots, 0, 1)
+            dr.setClearColorActive(True)
+            dr.setClearColor(Vec4(0.3, 0.3, 0.3, 1))
+            dr.setClearDepthActive(True)
+
+            root = NodePath("ModelPreviewRoot")
+
+            ambient = root.attachNewNode(AmbientLight("ambient"))
+            ambient.node().setColor(Vec4(0.4, 0.4, 0.4, 1))
+            sun = root.attachNewNode(DirectionalLight("sun"))
+            sun.node().setColor(Vec4(0.8, 0.8, 0.8, 1))
+            sun.setHpr(30, -50, 0)
+            root.setLight(ambient)
+            root.setLight(sun)
+
+            lens = PerspectiveLens()
+            lens.setFov(40)
+            lens.setAspectRatio(1)
+            cam_np = root.attachNewNode(Camera("ModelPreviewCam", lens))
+            dr.setCamera(cam_np)
+
+            self.__slots.append(PreviewSlot(i, root, cam_np))
+
+    def update(self, task):
+        start = time.perf_counter()
+        frame = ClockObject.getGlobalClock().getFrameCount()
+
+        # capture slots that were rendered since their model was placed
+        captured = [slot for slot in self.__slots if slot.np is not None and frame > slot.frame]
+        if len(captured) > 0 and self.__texture.hasRamImage():
+            data = self.__texture.getRamImageAs("RGB").getData()
+            for slot in captured:
+                self.__capture(slot, data)
+
+        for slot in self.__slots:
+            if time.perf_counter() - start > self.budget:
+                break
+
+            # place loaded models
+            if slot.model is not None:
+                self.__place(slot, frame)
+
+            # start loading next requested model into a free slot
+            elif slot.path is None and len(self.__queue) > 0:
+                path = self.__queue.popitem(last=False)[0]
+                slot.path = path
+                self.model_cache.load_async(path, lambda model, slot_=slot, path_=path: self.__on_loaded(
+                    slot_, path_, model), instance=True)
+
+        busy = any(slot.path is not None for slot in self.__slots)
+        self.__buffer.setActive(busy)
+        if not busy and len(self.__queue) == 0:
+            return task.done
+
+        return task.cont
+
+    def __on_loaded(self, slot, path, model):
+        if slot.path != path:
+            return
+
+        if model is None:
+            slot.path = None
+            for callback in self.__requests.pop(path, []):
+                callback(path, self.size, self.size, None)
+            return
+
+        slot.model = model
+
+    def __place(self, slot, frame):
+        np = slot.model
+        slot.model = None
+        np.reparentTo(slot.root)
+
+        # fit camera to model's bounding sphere
+        bounds = np.getBounds()
+        if bounds.isEmpty() or bounds.isInfinite():
+            center, radius = Vec3(0, 0, 0), 1
+        else:
+            center, radius = bounds.getCenter(), max(bounds.getRadius(), 0.001)
+
+        distance = radius / math.sin(math.radians(20)) * 1.05
+        slot.cam_np.setPos(center + Vec3(1, -1, 0.7).normalized() * distance)
+        slot.cam_np.lookAt(center)
+        slot.cam_np.node().getLens().setNearFar(distance * 0.01, distance + radius * 2)
+
+        slot.np = np
+        slot.frame = frame
+
+    def __capture(self, slot, data):
+        # texture rows start from bottom, copy slot's region top to bottom, texture may be padded
+        # to a power of two size, in which case buffer is rendered to its lower left corner
+        row_size = self.__texture.getXSize() * 3
+        x = slot.index * self.size * 3
+        rgb = b"".join(data[row * row_size + x: row * row_size + x + self.size * 3]
+                       for row in reversed(range(self.size)))
+
+        path = slot.path
+        slot.np.removeNode()
+        slot.np = None
+        slot.path = None
+
+        for callback in self.__requests.pop(path, []):
+            callback(path, self.size, self.size, rgb)
@@ -0,0 +1,121 @@
+import os
+import ast
+
+
+def scan_imports(path):
+    """returns names of all modules imported by python file at path, dotted module names are split
+    into their components since user modules are imported by their file names only"""
+    with open(path, "rb") as file:
+        tree = ast.parse(file.read(), filename=path)
+
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                names.update(alias.name.split("."))
+
+        elif isinstance(node, ast.ImportFrom):
+            if node.module:
+                names.update(node.module.split("."))
+            # from x import y, y may be a module as well
+            for alias in node.names:
+                names.add(alias.name)
+
+    return names
+
+
+class ModuleGraph:
+    def __init__(self):
+        """import dependency graph of user modules built by statically scanning their source,
+        a file is only scanned again when its modification time changes"""
+        self.__scanned = {}  # scanned[path] = (mtime, imported names)
+        self.__dependencies = {}  # dependencies[path] = set of paths of user modules imported by path
+        self.__dependents = {}  # dependents[path] = set of paths of user modules importing path
+
+    def update(self, paths):
+        """rebuilds graph for user modules at paths, paths = all python modules in project"""
+        paths = list(dict.fromkeys(paths))
+        by_name = {}  # by_name[module name] = [paths, ...]
+        for path in paths:
+            by_name.setdefault(os.path.basename(path).split(".")[0], []).append(path)
+
+        self.__dependencies = {}
+        self.__dependents = {path: set() for path in paths}
+
+        # forget removed modules
+        for path in [path for path in self.__scanned.keys() if path not in self.__dependents]:
+            del self.__scanned[path]
+
+        for path in paths:
+            names = self.__scan(path)
+            deps = set()
+            for name in names:
+                deps.update(by_name.get(name, []))
+            deps.discard(path)
+
+            self.__dependencies[path] = deps
+            for dep in deps:
+                self.__dependents[dep].add(path)
+
+    def __scan(self, path):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return set()
+
+        if path in self.__scanned and self.__scanned[path][0] == mtime:
+            return self.__scanned[path][1]
+
+        try:
+            names = scan_imports(path)
+        except (SyntaxError, ValueError):
+            # module will fail to import anyway, report it there
+            names = set()
+
+        self.__scanned[path] = (mtime, names)
+        return names
+
+    def get_dependencies(self, path):
+        return self.__dependencies.get(path, set())
+
+    def get_dependents(self, paths):
+        """returns paths of all modules that import any of the modules at paths, directly or indirectly"""
+        dependents = set()
+        stack = list(paths)
+        while len(stack) > 0:
+            for dependent in self.__dependents.get(stack.pop(), ()):
+                if dependent not in dependents:
+                    dependents.add(dependent)
+                    stack.append(dependent)
+
+        return dependents.difference(paths)
+
+    def sort(self, paths):
+        """returns paths in topological order, so that a module comes after all modules it imports,
+        modules in an import cycle keep their relative order"""
+        paths = list(dict.fromkeys(paths))
+        included = set(paths)
+
+        ordered = []
+        visited = set()
+
+        def visit(path):
+            # iterative depth first post order traversal
+            stack = [(path, iter(sorted(self.get_dependencies(path) & included)))]
+            visited.add(path)
+            while len(stack) > 0:
+                current, deps = stack[-1]
+                for dep in deps:
+                    if dep not in visited:
+                        visited.add(dep)
+                        stack.append((dep, iter(sorted(self.get_dependencies(dep) & included))))
+                        break
+                else:
+                    stack.pop()
+                    ordered.append(current)
+
+        for path in paths:
+            if path not in visited:
+                visit(path)
+
+        return ordered
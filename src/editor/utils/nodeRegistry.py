@@ -0,0 +1,87 @@
+from editor.constants import TAG_GAME_OBJECT
+
+
+class NodeRegistry:
+    def __init__(self):
+        """uid keyed index of all editor nodepaths of active scene with a secondary name index,
+        nodepaths are indexed together with all editor nodepaths under them"""
+        self.__by_uid = {}  # by_uid[uid] = BaseNodePath
+        self.__by_name = {}  # by_name[name] = {uid: BaseNodePath, ...}, ordered by time of indexing
+        self.__names = {}  # names[uid] = name nodepath is indexed under
+
+    @staticmethod
+    def get_tagged(np):
+        """returns editor nodepaths of np and of all nodes under it"""
+        tagged = []
+        stack = [np]
+        while stack:
+            np = stack.pop()
+            if np.hasPythonTag(TAG_GAME_OBJECT):
+                tagged.append(np.getPythonTag(TAG_GAME_OBJECT))
+            stack.extend(np.getChildren())
+        return tagged
+
+    def add(self, nps):
+        for np in nps:
+            for obj in self.get_tagged(np):
+                self.__discard(obj.uid)
+                self.__insert(obj)
+
+    def remove(self, nps):
+        for np in nps:
+            for obj in self.get_tagged(np):
+                self.__discard(obj.uid)
+
+    def rebuild(self, root):
+        """indexes all editor nodepaths under root from scratch"""
+        self.clear()
+        for child in root.getChildren():
+            self.add([child])
+
+    def rename(self, np):
+        """call after np is renamed"""
+        if np.uid in self.__by_uid:
+            self.__discard(np.uid)
+            self.__insert(np)
+
+    def __insert(self, obj):
+        name = obj.get_name()
+        self.__by_uid[obj.uid] = obj
+        self.__names[obj.uid] = name
+        if name not in self.__by_name:
+            self.__by_name[name] = {}
+        self.__by_name[name][obj.uid] = obj
+
+    def __discard(self, uid):
+        if uid not in self.__by_uid:
+            return
+
+        del self.__by_uid[uid]
+        name = self.__names.pop(uid)
+        del self.__by_name[name][uid]
+        if len(self.__by_name[name]) == 0:
+            del self.__by_name[name]
+
+    def get(self, uid):
+        return self.__by_uid.get(uid, None)
+
+    def get_by_name(self, name):
+        """returns a list of all nodepaths named name"""
+        return list(self.__by_name.get(name, {}).values())
+
+    def find(self, name):
+        """returns first indexed nodepath named name or None"""
+        for obj in self.__by_name.get(name, {}).values():
+            return obj
+        return None
+
+    def clear(self):
+        self.__by_uid.clear()
+        self.__by_name.clear()
+        self.__names.clear()
+
+    def __contains__(self, uid):
+        return uid in self.__by_uid
+
+    def __len__(self):
+        return len(self.__by_uid)
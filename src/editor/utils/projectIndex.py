@@ -0,0 +1,132 @@
+import os
+import marshal
+
+VERSION = 1  # increase to invalidate previously saved index files
+
+
+class ProjectIndex:
+    def __init__(self, index_file=None, ignored_dirs=()):
+        """persistent index of directory contents built with os.scandir, a directory is only scanned again
+        when its modification time changes, otherwise its contents are read from the index,
+        since modifying a file does not change modification time of its directory, size and mtime of
+        modified files must be updated with update_file, index is not saved if index_file is None"""
+        self.index_file = index_file
+        self.ignored_dirs = ignored_dirs
+
+        # dirs[dir path] = (mtime, [sub directory names], [(file name, size, mtime, extension), ...])
+        self.__dirs = {}
+        self.__visited = set()  # directories scanned or looked up since last call to begin
+
+        self.num_scanned = 0  # directories read from disk since last call to begin
+        self.num_cached = 0  # directories read from index since last call to begin
+
+        self.load()
+
+    def load(self):
+        if self.index_file is None or not os.path.isfile(self.index_file):
+            return
+
+        try:
+            with open(self.index_file, "rb") as file:
+                version, dirs = marshal.load(file)
+        except (EOFError, ValueError, TypeError):
+            print("[ProjectIndex] Unable to read index file {0}".format(self.index_file))
+            return
+
+        if version == VERSION:
+            self.__dirs = dirs
+
+    def save(self):
+        if self.index_file is None:
+            return
+
+        dir_name = os.path.dirname(self.index_file)
+        if dir_name and not os.path.isdir(dir_name):
+            os.makedirs(dir_name)
+
+        # write to a temporary file first, so that a partially written index is never loaded
+        tmp = "{0}.{1}.tmp".format(self.index_file, os.getpid())
+        with open(tmp, "wb") as file:
+            marshal.dump((VERSION, self.__dirs), file)
+        os.replace(tmp, self.index_file)
+
+    def begin(self):
+        """starts a full scan, directories not visited until end is called are dropped from index"""
+        self.__visited.clear()
+        self.num_scanned = 0
+        self.num_cached = 0
+
+    def end(self, save=True):
+        for path in [path for path in self.__dirs.keys() if path not in self.__visited]:
+            del self.__dirs[path]
+
+        if save:
+            self.save()
+
+    def scan_dir(self, path):
+        """returns ([sub directory names], [(file name, size, mtime, extension), ...]) for directory at path"""
+        self.__visited.add(path)
+
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            self.__dirs.pop(path, None)
+            return [], []
+
+        if path in self.__dirs and self.__dirs[path][0] == mtime:
+            self.num_cached += 1
+            return self.__dirs[path][1], self.__dirs[path][2]
+
+        dirs = []
+        files = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        if entry.name not in self.ignored_dirs:
+                            dirs.append(entry.name)
+                    elif entry.is_file():
+                        stat = entry.stat()
+                        files.append((entry.name, stat.st_size, stat.st_mtime_ns, entry.name.split(".")[-1]))
+                except OSError:
+                    # removed while scanning
+                    continue
+
+        self.__dirs[path] = (mtime, dirs, files)
+        self.num_scanned += 1
+        return dirs, files
+
+    def update_file(self, path):
+        """updates size and mtime of an already indexed file at path"""
+        dir_path, name = os.path.dirname(path), os.path.basename(path)
+        if dir_path not in self.__dirs:
+            return
+
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return
+
+        files = self.__dirs[dir_path][2]
+        for i in range(len(files)):
+            if files[i][0] == name:
+                files[i] = (name, stat.st_size, stat.st_mtime_ns, files[i][3])
+                break
+
+    def get_file(self, path):
+        """returns (size, mtime, extension) of an indexed file at path or None"""
+        dir_path, name = os.path.dirname(path), os.path.basename(path)
+        if dir_path in self.__dirs:
+            for file in self.__dirs[dir_path][2]:
+                if file[0] == name:
+                    return file[1:]
+        return None
+
+    def forget(self, path):
+        """removes directory at path and all of its sub directories from index"""
+        prefix = path + "/"
+        for dir_path in [key for key in self.__dirs.keys() if key == path or key.startswith(prefix)]:
+            del self.__dirs[dir_path]
+
+    def __contains__(self, path):
+        return path in self.__dirs
@@ -205,6 +205,21 @@ class FoldoutGroup(Property):
 
 
 class Utils:
+    @staticmethod
+    def get_property_values(obj):
+        """returns [(name, value), ...] of all value properties i.e. FuncProperty and ObjProperty of obj"""
+        return [(prop.name, prop.get_value()) for prop in obj.get_properties()
+                if isinstance(prop, (FuncProperty, ObjProperty))]
+
+    @staticmethod
+    def set_property_values(obj, values):
+        """sets value properties of obj from [(name, value), ...], see get_property_values,
+        names obj has no value property for are ignored"""
+        props = {prop.name: prop for prop in obj.get_properties()}
+        for name, val in values:
+            if name in props and isinstance(props[name], (FuncProperty, ObjProperty)):
+                props[name].set_value(val)
+
     @staticmethod
     def get_properties_for_lens(lens):
         if isinstance(lens, PerspectiveLens):
@@ -0,0 +1,137 @@
+import uuid
+from editor.utils.searchIndex import SearchIndex
+
+
+class Resource:
+    def __init__(self, path, extension):
+        """a file in one of resource browser's libraries"""
+        self.path = path
+        self.extension = extension
+        self.uid = uuid.uuid4().hex  # stays same when resource is moved or renamed
+        self.module = None  # user module loaded from this resource, if any
+
+    def __repr__(self):
+        return "Resource({0})".format(self.path)
+
+
+class ResourceRegistry:
+    def __init__(self):
+        """path keyed index of all resources and resource tree items, shared by resource tree, tiles panel
+        and level editor, paths are normalized with forward slashes"""
+        self.__items = {}  # items[library or directory path] = tree item
+        self.__resources = {}  # resources[file path] = Resource
+        self.__by_ext = {}  # by_ext[extension] = set of file paths
+        self.__by_uid = {}  # by_uid[uid] = Resource
+        self.search_index = SearchIndex()  # all resources by file name
+
+    # ----------------- tree items ----------------- #
+    def add_item(self, path, item):
+        self.__items[path] = item
+
+    def get_item(self, path):
+        return self.__items.get(path, None)
+
+    def has_item(self, path):
+        return path in self.__items
+
+    # ----------------- resources ----------------- #
+    def add(self, path):
+        """adds file at path if it does not already exist, returns its Resource"""
+        if path in self.__resources:
+            return self.__resources[path]
+
+        resource = Resource(path, path.split(".")[-1])
+        self.__insert(resource)
+        return resource
+
+    def remove(self, path):
+        if path in self.__resources:
+            self.__discard(self.__resources[path])
+
+    def move(self, src, dest):
+        """moves resource at src to dest, keeping its uid"""
+        if src in self.__resources:
+            resource = self.__resources[src]
+            self.__discard(resource)
+            resource.path = dest
+            resource.extension = dest.split(".")[-1]
+            self.__insert(resource)
+
+    def get(self, path):
+        return self.__resources.get(path, None)
+
+    def get_by_uid(self, uid):
+        return self.__by_uid.get(uid, None)
+
+    def get_paths(self, extension):
+        """returns a sorted list of paths of all resources with extension"""
+        return sorted(self.__by_ext.get(extension, ()))
+
+    def set_module(self, path, module):
+        if path in self.__resources:
+            self.__resources[path].module = module
+
+    def get_module(self, path):
+        if path in self.__resources:
+            return self.__resources[path].module
+        return None
+
+    def __insert(self, resource):
+        self.__resources[resource.path] = resource
+        self.__by_uid[resource.uid] = resource
+        if resource.extension not in self.__by_ext:
+            self.__by_ext[resource.extension] = set()
+        self.__by_ext[resource.extension].add(resource.path)
+        self.search_index.add(resource.path)
+
+    def __discard(self, resource):
+        del self.__resources[resource.path]
+        del self.__by_uid[resource.uid]
+        self.__by_ext[resource.extension].discard(resource.path)
+        self.search_index.remove(resource.path)
+
+    # ----------------- directories ----------------- #
+    def remove_tree(self, path):
+        """removes directory at path with all tree items and resources in it, returns removed tree items"""
+        prefix = path + "/"
+
+        removed = []
+        for dir_path in [key for key in self.__items.keys() if key == path or key.startswith(prefix)]:
+            removed.append(self.__items.pop(dir_path))
+
+        for resource in [res for res in self.__resources.values() if res.path.startswith(prefix)]:
+            self.__discard(resource)
+
+        return removed
+
+    def move_tree(self, src, dest):
+        """moves directory src with all tree items and resources in it to dest, resources keep their uids,
+        returns [(new path, tree item), ...]"""
+        prefix = src + "/"
+
+        moved = []
+        for dir_path in [key for key in self.__items.keys() if key == src or key.startswith(prefix)]:
+            item = self.__items.pop(dir_path)
+            new_path = dest + dir_path[len(src):]
+            self.__items[new_path] = item
+            moved.append((new_path, item))
+
+        for resource in [res for res in self.__resources.values() if res.path.startswith(prefix)]:
+            self.__discard(resource)
+            resource.path = dest + resource.path[len(src):]
+            self.__insert(resource)
+
+        return moved
+
+    def clear(self):
+        self.__items.clear()
+        self.__resources.clear()
+        self.__by_ext.clear()
+        self.__by_uid.clear()
+        self.search_index.clear()
+
+    def __contains__(self, path):
+        return path in self.__resources
+
+    def __len__(self):
+        return len(self.__resources)
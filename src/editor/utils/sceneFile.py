@@ -0,0 +1,262 @@
+"""implements a compact binary scene format, a scene file is laid out as
+
+    header:   magic, version, number of node records
+    strings:  a table of all unique strings (uids, ids, paths, names, property names etc.)
+    records:  one record per editor NodePath, in depth first order so that a parent record
+              is always written before its children
+
+all strings in records are stored as indices into string table, the string table and records
+are zlib compressed."""
+
+import struct
+import zlib
+from panda3d.core import LVecBase2f, LVecBase3f, LColor
+
+MAGIC = b"PSCN"
+VERSION = 1
+EXTENSION = "pscene"
+
+_HEADER = struct.Struct("<4sHI")
+_U8 = struct.Struct("<B")
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_I32 = struct.Struct("<i")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+_VEC2 = struct.Struct("<2f")
+_VEC3 = struct.Struct("<3f")
+_VEC4 = struct.Struct("<4f")
+
+CHUNK_SIZE = 64 * 1024  # bytes of compressed data read from a scene file at a time
+
+# value type tags
+_NONE = 0
+_BOOL = 1
+_INT = 2
+_FLOAT = 3
+_STR = 4
+_VEC2_TAG = 5
+_VEC3_TAG = 6
+_VEC4_TAG = 7
+
+
+class SceneFileError(Exception):
+    pass
+
+
+class NodeRecord:
+    def __init__(self, parent, uid, id_, path, name):
+        """class representing a single saved editor NodePath,
+        parent = index of parent record or -1 if parent is scene render"""
+        self.parent = parent
+        self.uid = uid
+        self.id = id_
+        self.path = path
+        self.name = name
+        self.properties = []  # [(name, value), ...]
+        self.components = []  # [(component_path, [(attr_name, value), ...]), ...]
+
+
+class _StringTable:
+    def __init__(self):
+        self.strings = []
+        self.indices = {}
+
+    def index(self, string):
+        idx = self.indices.get(string)
+        if idx is None:
+            idx = len(self.strings)
+            self.strings.append(string)
+            self.indices[string] = idx
+        return idx
+
+
+def _encode_value(table, val, out):
+    """appends encoded value to out, returns False if value type is not supported"""
+    # bool must be checked before int since bool is a subclass of int
+    if val is None:
+        out += _U8.pack(_NONE)
+    elif isinstance(val, bool):
+        out += _U8.pack(_BOOL) + _U8.pack(val)
+    elif isinstance(val, int):
+        out += _U8.pack(_INT) + _I64.pack(val)
+    elif isinstance(val, float):
+        out += _U8.pack(_FLOAT) + _F64.pack(val)
+    elif isinstance(val, str):
+        out += _U8.pack(_STR) + _U32.pack(table.index(val))
+    elif isinstance(val, LVecBase2f):
+        out += _U8.pack(_VEC2_TAG) + _VEC2.pack(val.x, val.y)
+    elif isinstance(val, LVecBase3f):
+        out += _U8.pack(_VEC3_TAG) + _VEC3.pack(val.x, val.y, val.z)
+    elif isinstance(val, LColor):
+        out += _U8.pack(_VEC4_TAG) + _VEC4.pack(val.x, val.y, val.z, val.w)
+    else:
+        return False
+    return True
+
+
+def _write_attrs(table, attrs, out):
+    encoded = []
+    for name, val in attrs:
+        buffer = bytearray()
+        if _encode_value(table, val, buffer):
+            encoded.append(_U32.pack(table.index(name)) + buffer)
+
+    out += _U16.pack(len(encoded))
+    for item in encoded:
+        out += item
+
+
+def write_records(file, records):
+    """writes records (a list of NodeRecord) to file object"""
+    table = _StringTable()
+    body = bytearray()
+
+    for rec in records:
+        body += _I32.pack(rec.parent)
+        body += _U32.pack(table.index(rec.uid))
+        body += _U32.pack(table.index(rec.id))
+        body += _U32.pack(table.index(rec.path))
+        body += _U32.pack(table.index(rec.name))
+
+        _write_attrs(table, rec.properties, body)
+
+        body += _U16.pack(len(rec.components))
+        for path, attrs in rec.components:
+            body += _U32.pack(table.index(path))
+            _write_attrs(table, attrs, body)
+
+    strings = bytearray()
+    strings += _U32.pack(len(table.strings))
+    for string in table.strings:
+        data = string.encode("utf-8")
+        strings += _U32.pack(len(data)) + data
+
+    file.write(_HEADER.pack(MAGIC, VERSION, len(records)))
+    file.write(zlib.compress(bytes(strings + body)))
+
+
+class _Stream:
+    def __init__(self, file, chunk_size):
+        """decompresses data from file object on demand, chunk_size bytes at a time"""
+        self.file = file
+        self.chunk_size = chunk_size
+        self.decompressor = zlib.decompressobj()
+        self.data = b""
+        self.offset = 0
+
+    def ensure(self, size):
+        while len(self.data) - self.offset < size:
+            chunk = self.file.read(self.chunk_size)
+            try:
+                if chunk:
+                    data = self.decompressor.decompress(chunk)
+                else:
+                    data = self.decompressor.flush()
+                    if not data:
+                        raise SceneFileError("unexpected end of scene file")
+            except zlib.error as e:
+                raise SceneFileError("corrupt scene file: {0}".format(e))
+
+            # discard already consumed data
+            self.data = self.data[self.offset:] + data
+            self.offset = 0
+
+    def unpack(self, fmt):
+        self.ensure(fmt.size)
+        val = fmt.unpack_from(self.data, self.offset)
+        self.offset += fmt.size
+        return val
+
+    def read(self, size):
+        self.ensure(size)
+        val = self.data[self.offset: self.offset + size]
+        self.offset += size
+        return val
+
+
+def _read_value(stream, strings):
+    tag = stream.unpack(_U8)[0]
+    if tag == _NONE:
+        return None
+    elif tag == _BOOL:
+        return bool(stream.unpack(_U8)[0])
+    elif tag == _INT:
+        return stream.unpack(_I64)[0]
+    elif tag == _FLOAT:
+        return stream.unpack(_F64)[0]
+    elif tag == _STR:
+        return strings[stream.unpack(_U32)[0]]
+    elif tag == _VEC2_TAG:
+        return LVecBase2f(*stream.unpack(_VEC2))
+    elif tag == _VEC3_TAG:
+        return LVecBase3f(*stream.unpack(_VEC3))
+    elif tag == _VEC4_TAG:
+        return LColor(*stream.unpack(_VEC4))
+    raise SceneFileError("unknown value type {0}".format(tag))
+
+
+def _read_attrs(stream, strings):
+    attrs = []
+    for _ in range(stream.unpack(_U16)[0]):
+        name = strings[stream.unpack(_U32)[0]]
+        attrs.append((name, _read_value(stream, strings)))
+    return attrs
+
+
+class SceneReader:
+    def __init__(self, file, chunk_size=CHUNK_SIZE):
+        """reads a scene file record by record, only as much of the file is read and
+        decompressed as is needed for the records read so far"""
+        header = file.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise SceneFileError("not a scene file")
+
+        magic, version, num_records = _HEADER.unpack(header)
+        if magic != MAGIC:
+            raise SceneFileError("not a scene file")
+        if version > VERSION:
+            raise SceneFileError("unsupported scene file version {0}".format(version))
+
+        self.num_records = num_records
+        self.num_read = 0
+
+        self.__stream = _Stream(file, chunk_size)
+        self.__strings = []
+
+        for _ in range(self.__stream.unpack(_U32)[0]):
+            size = self.__stream.unpack(_U32)[0]
+            self.__strings.append(self.__stream.read(size).decode("utf-8"))
+
+    def __iter__(self):
+        while self.num_read < self.num_records:
+            yield self.read_record()
+
+    def read_record(self):
+        """reads and returns next NodeRecord, or None if all records have been read"""
+        if self.num_read >= self.num_records:
+            return None
+
+        stream = self.__stream
+        strings = self.__strings
+
+        parent = stream.unpack(_I32)[0]
+        uid = strings[stream.unpack(_U32)[0]]
+        id_ = strings[stream.unpack(_U32)[0]]
+        path = strings[stream.unpack(_U32)[0]]
+        name = strings[stream.unpack(_U32)[0]]
+
+        rec = NodeRecord(parent, uid, id_, path, name)
+        rec.properties = _read_attrs(stream, strings)
+
+        for _ in range(stream.unpack(_U16)[0]):
+            comp_path = strings[stream.unpack(_U32)[0]]
+            rec.components.append((comp_path, _read_attrs(stream, strings)))
+
+        self.num_read += 1
+        return rec
+
+
+def read_records(file):
+    """reads and returns a list of all NodeRecords from file object"""
+    return list(SceneReader(file))
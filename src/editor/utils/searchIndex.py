@@ -0,0 +1,236 @@
+import heapq
+import bisect
+from operator import itemgetter
+
+MAX_INSORT = 512  # up to this many pending names are inserted one by one, more are appended and sorted at once
+
+
+def get_trigrams(text):
+    return {text[i: i + 3] for i in range(len(text) - 2)}
+
+
+def split_name(path):
+    """returns (lower case base name without extension, lower case extension) of file at path"""
+    name = path.split("/")[-1].lower()
+    if "." not in name:
+        return name, ""
+    stem, ext = name.rsplit(".", 1)
+    return stem, ext
+
+
+class SearchIndex:
+    def __init__(self):
+        """index for type ahead search of resources by file name, names are matched case insensitive against
+        base names without extension, so that queries are not flooded by matches of common extensions,
+        a query term with a dot e.g. "tree.eg" also matches a base name ending with part before the dot
+        followed by an extension starting with part after it,
+        query terms shorter than three characters only match start of names and are answered from sorted
+        lists of names, longer terms match anywhere in names and are answered from a trigram index,
+        trigram index is built on first search and is kept updated after that"""
+        self.__names = {}  # names[path] = (lower case base name, lower case extension)
+        self.__sorted = []  # [(base name, path), ...] always sorted
+        self.__by_ext = {}  # by_ext[extension] = [(base name, path), ...] always sorted
+        self.__ext_paths = {}  # ext_paths[extension] = set of paths
+        self.__dotted = set()  # paths whose base names contain a dot
+        self.__pending = set()  # paths added since last search, not yet in sorted lists
+        self.__trigrams = None  # trigrams[trigram] = set of paths with trigram in their base name
+
+    def add(self, path):
+        if path in self.__names:
+            return
+
+        stem, ext = split_name(path)
+        self.__names[path] = (stem, ext)
+        self.__pending.add(path)
+
+        if ext not in self.__ext_paths:
+            self.__ext_paths[ext] = set()
+        self.__ext_paths[ext].add(path)
+
+        if "." in stem:
+            self.__dotted.add(path)
+
+        if self.__trigrams is not None:
+            self.__add_trigrams(stem, path)
+
+    def remove(self, path):
+        if path not in self.__names:
+            return
+
+        stem, ext = self.__names.pop(path)
+        if path in self.__pending:
+            self.__pending.discard(path)
+        else:
+            self.__delete(self.__sorted, (stem, path))
+            self.__delete(self.__by_ext[ext], (stem, path))
+
+        self.__ext_paths[ext].discard(path)
+        self.__dotted.discard(path)
+
+        if self.__trigrams is not None:
+            for trigram in get_trigrams(stem):
+                paths = self.__trigrams[trigram]
+                paths.discard(path)
+                if len(paths) == 0:
+                    del self.__trigrams[trigram]
+
+    @staticmethod
+    def __delete(items, item):
+        i = bisect.bisect_left(items, item)
+        if i < len(items) and items[i] == item:
+            del items[i]
+
+    def build(self):
+        """builds trigram index if it is not built yet, call this before first search to avoid a delay"""
+        if self.__trigrams is None:
+            self.__trigrams = {}
+            for path, (stem, ext) in self.__names.items():
+                self.__add_trigrams(stem, path)
+
+    def __add_trigrams(self, stem, path):
+        for trigram in get_trigrams(stem):
+            if trigram not in self.__trigrams:
+                self.__trigrams[trigram] = set()
+            self.__trigrams[trigram].add(path)
+
+    def __merge(self):
+        """moves pending paths into sorted lists, a few paths e.g. after files are moved are inserted in place,
+        many paths e.g. after a scan are appended and lists are sorted once"""
+        if len(self.__pending) == 0:
+            return
+
+        if len(self.__pending) <= MAX_INSORT:
+            for path in self.__pending:
+                stem, ext = self.__names[path]
+                bisect.insort(self.__sorted, (stem, path))
+                bisect.insort(self.__by_ext.setdefault(ext, []), (stem, path))
+        else:
+            changed = set()
+            for path in self.__pending:
+                stem, ext = self.__names[path]
+                self.__sorted.append((stem, path))
+                self.__by_ext.setdefault(ext, []).append((stem, path))
+                changed.add(ext)
+
+            self.__sorted.sort()
+            for ext in changed:
+                self.__by_ext[ext].sort()
+
+        self.__pending.clear()
+
+    def clear(self):
+        self.__names.clear()
+        self.__sorted.clear()
+        self.__by_ext.clear()
+        self.__ext_paths.clear()
+        self.__dotted.clear()
+        self.__pending.clear()
+        self.__trigrams = None
+
+    def get_paths(self, extensions):
+        """returns paths of all indexed files with one of extensions, sorted by name"""
+        self.__merge()
+        lists = [self.__by_ext[ext] for ext in set(extensions) if ext in self.__by_ext]
+        if len(lists) == 1:
+            return [path for stem, path in lists[0]]
+
+        items = []
+        for items_ in lists:
+            items.extend(items_)
+        items.sort(key=itemgetter(0))  # lists are sorted already, so comparing names is enough
+        return [path for stem, path in items]
+
+    def __get_allowed(self, extensions):
+        """returns set of paths with one of extensions"""
+        sets = [self.__ext_paths[ext] for ext in extensions if ext in self.__ext_paths]
+        if len(sets) == 1:
+            return sets[0]
+        return set().union(*sets)
+
+    def search(self, query, extensions=None, limit=1000):
+        """returns paths of files whose names contain all white space separated terms of query, names that
+        start with query come first, followed by other matches ordered by length of name,
+        if extensions is not None only files with one of extensions are returned"""
+        terms = query.lower().split()
+        if len(terms) == 0:
+            return []
+
+        self.__merge()
+
+        # dotted terms are split into part matched against base name and part matched against extension
+        parts = [term.rsplit(".", 1) if "." in term else None for term in terms]
+
+        def is_match(path_):
+            stem_, ext_ = self.__names[path_]
+            if extensions is not None and ext_ not in extensions:
+                return False
+            for term_, part_ in zip(terms, parts):
+                if term_ in stem_:
+                    continue
+                if part_ is None or not (stem_.endswith(part_[0]) and ext_.startswith(part_[1])):
+                    return False
+            return True
+
+        if extensions is not None:
+            extensions = set(extensions)
+
+        # candidates must contain all trigrams of all base name parts of terms, they are narrowed down by
+        # extension with set operations before they are matched one by one
+        candidates = None
+        trigrams = set()
+        for term, part in zip(terms, parts):
+            trigrams.update(get_trigrams(term if part is None else part[0]))
+
+        posting = []
+        if len(trigrams) > 0:
+            self.build()
+            posting.extend(self.__trigrams.get(trigram, set()) for trigram in trigrams)
+
+        for part in parts:
+            if part is not None and part[1]:
+                posting.append(self.__dotted.union(self.__get_allowed(
+                    [ext for ext in self.__ext_paths.keys() if ext.startswith(part[1])])))
+
+        if len(posting) > 0:
+            if extensions is not None:
+                posting.append(self.__get_allowed(extensions))
+            posting.sort(key=len)
+            candidates = posting[0].intersection(*posting[1:]) if len(posting[0]) > 0 else set()
+
+        # names starting with first term, searched in sorted names of allowed extension if there is just one
+        items = self.__sorted
+        if extensions is not None and len(extensions) == 1:
+            items = self.__by_ext.get(next(iter(extensions)), [])
+
+        results = []
+        found = set()
+
+        prefixes = [(terms[0], False)]
+        if parts[0] is not None:
+            prefixes.append((parts[0][0], True))  # base name equal to part before dot
+
+        for prefix, exact in prefixes:
+            i = bisect.bisect_left(items, (prefix,))
+            while i < len(items) and len(results) < limit:
+                stem, path = items[i]
+                if (stem != prefix) if exact else not stem.startswith(prefix):
+                    break
+                if (candidates is None or path in candidates) and is_match(path):
+                    results.append(path)
+                    found.add(path)
+                i += 1
+
+        if len(results) >= limit or candidates is None:
+            return results
+
+        # other names containing all terms
+        matches = (path for path in candidates if path not in found and is_match(path))
+        results.extend(heapq.nsmallest(limit - len(results), matches,
+                                       key=lambda path: (len(self.__names[path][0]), self.__names[path][0], path)))
+        return results
+
+    def __contains__(self, path):
+        return path in self.__names
+
+    def __len__(self):
+        return len(self.__names)
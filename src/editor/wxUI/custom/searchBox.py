@@ -9,7 +9,10 @@ SEARCH_CANCEL_ICON = constants.ICONS_PATH + "//" + "cancel.png"
 
 
 class SearchBox(wx.Panel):
-    def __init__(self, parent, size=wx.Size(-1, 18), *args, **kwargs):
+    PLACEHOLDER = "Search..."
+
+    def __init__(self, parent, size=wx.Size(-1, 18), on_search=None, *args, **kwargs):
+        """on_search = the function to call with search text whenever it changes"""
         wx.Panel.__init__(self, parent, *args, **kwargs)
         self.SetMaxSize(size)
         self.SetBackgroundColour(wx.WHITE)
@@ -18,6 +21,7 @@ class SearchBox(wx.Panel):
         self.search_icon = None
         self.image_ctrl = None
         self.text_box = None
+        self.on_search = on_search
 
         self.sizer = wx.BoxSizer(wx.HORIZONTAL)
         self.SetSizer(self.sizer)
@@ -25,13 +29,16 @@ class SearchBox(wx.Panel):
         self.create()
 
         # bind events
+        self.text_box.Bind(wx.EVT_TEXT, self.on_text)
+        self.text_box.Bind(wx.EVT_SET_FOCUS, self.on_set_focus)
+        self.text_box.Bind(wx.EVT_KILL_FOCUS, self.on_kill_focus)
 
     def create(self):
         image = wx.Image(MAGNIFYING_GLASS_ICON, type=wx.BITMAP_TYPE_ANY)
         self.image_ctrl = wx.StaticBitmap(self, wx.ID_ANY, wx.Image.ConvertToBitmap(image))
         self.image_ctrl.SetBackgroundColour(wx.Colour(127, 127, 127, 255))
 
-        self.text_box = wx.TextCtrl(self, value="Search...")
+        self.text_box = wx.TextCtrl(self, value=self.PLACEHOLDER)
         self.text_box.SetWindowStyleFlag(wx.BORDER_NONE)
         self.text_box.SetBackgroundColour(wx.Colour(127, 127, 127, 255))
         self.text_box.SetForegroundColour(wx.Colour(160, 160, 160, 255))
@@ -45,3 +52,26 @@ class SearchBox(wx.Panel):
         self.sizer.Add(self.image_ctrl, 0, wx.EXPAND)
         self.sizer.Add(self.text_box, 1, wx.EXPAND)
         self.sizer.Layout()
+
+    def get_text(self):
+        text = self.text_box.GetValue()
+        return "" if text == self.PLACEHOLDER else text
+
+    def clear(self):
+        """clears search text without calling on_search"""
+        self.text_box.ChangeValue("" if self.text_box.HasFocus() else self.PLACEHOLDER)
+
+    def on_text(self, evt):
+        if self.on_search:
+            self.on_search(self.get_text())
+        evt.Skip()
+
+    def on_set_focus(self, evt):
+        if self.text_box.GetValue() == self.PLACEHOLDER:
+            self.text_box.ChangeValue("")
+        evt.Skip()
+
+    def on_kill_focus(self, evt):
+        if self.text_box.GetValue() == "":
+            self.text_box.ChangeValue(self.PLACEHOLDER)
+        evt.Skip()
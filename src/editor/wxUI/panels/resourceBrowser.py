@@ -8,10 +8,13 @@ import editor.edPreferences as edPreferences
 import editor.wxUI.globals as wxGlobals
 import editor.resources.globals as resourceGlobals
 
+from direct.showbase.ShowBase import taskMgr
 from editor.utils.exceptionHandler import try_execute
 from editor.utils import DirWatcher
+from editor.utils.directoryWatcher import IGNORED_DIRS, normalize_path
 from thirdparty.wxCustom.imageTilesPanel import ImageTilesPanel
 from editor.utils import FileUtils
+from editor.utils.projectIndex import ProjectIndex
 from editor.globals import editor
 
 # event ids for different event types
@@ -31,6 +34,8 @@ EVT_CREATE_TXT_FILE = wx.NewId()
 EVT_APPEND_LIBRARY = wx.NewId()
 EVT_IMPORT_ASSETS = wx.NewId()
 
+INDEX_SAVE_DELAY = 2  # seconds after last incremental update before project index is saved
+
 
 # ----------------- Methods for building context menus ----------------- #
 def create_generic_menu_items(parent_menu):
@@ -149,9 +154,8 @@ class ResourceTree(customtree.CustomTreeCtrl):
 
         # ---------------------------------------------------------------------------- #
         self.libraries = {}  # all current loaded libraries
-        self.resources = {}  # save all resources with same file extension e.g [py] = {all .py resources}...
-        self.name_to_item = {}  # maps a file's or directory's name to it's corresponding tree item
-        # e.g. name_to_item[file_name] = item
+        self.registry = editor.resources  # path keyed tree items and resources, shared with rest of the editor
+        self.index = ProjectIndex(ignored_dirs=IGNORED_DIRS)  # cached directory contents, see create_tree_from_dir
 
         self.event_map = {
             EVT_NEW_DIR: (self.on_file_op, "add_folder"),
@@ -255,16 +259,18 @@ class ResourceTree(customtree.CustomTreeCtrl):
             # clear libraries
             self.remove_all_libs()
 
-            self.resources.clear()
-            self.name_to_item.clear()
+            self.registry.clear()
             self.DeleteChildren(self.GetRootItem())
             self.UnselectAll()
 
+            path = normalize_path(path)
             self.root_path = path
+            self.index = ProjectIndex(os.path.join(path, constants.EDITOR_CACHE_DIR, "resourceIndex.bin"),
+                                      IGNORED_DIRS)
+            self.index.begin()
 
-            # create a key for each know file type
-            for ext in resourceGlobals.EXTENSIONS.keys():
-                self.resources[ext] = []
+            self.tiles_panel.thumbnails.cache_dir = os.path.join(path, constants.EDITOR_CACHE_DIR, "thumbnails")
+            self.tiles_panel.thumbnails.clear()
 
             # setup a default project library
             # tree_item = self.AppendItem(self.root_node, "Project", data=path, image=1)
@@ -272,55 +278,127 @@ class ResourceTree(customtree.CustomTreeCtrl):
 
             self.create_tree_from_dir(dir_path=path, parent=tree_item)
             self.Expand(tree_item)
+            self.index.end()
             # self.schedule_dir_watcher()
         else:
             print("[ResourceBrowser] Rebuilding resources")
             # TODO unschedule and re-schedule directory watcher
 
-            self.resources.clear()
-            self.name_to_item.clear()
+            self.registry.clear()
             self.DeleteChildren(self.GetRootItem())
             self.UnselectAll()
 
-            # create a key for each know file type
-            for ext in resourceGlobals.EXTENSIONS.keys():
-                self.resources[ext] = []
+            self.index.begin()
 
             # recreate all the libraries
             for key in self.libraries.keys():
                 path = self.libraries[key][0]
                 tree_item = self.AppendItem(self.root_node, key, data=path, image=1)
-                self.name_to_item[key] = tree_item
+                self.libraries[key] = (path, tree_item)
+                self.registry.add_item(path, tree_item)
                 self.create_tree_from_dir(path, tree_item)
 
+            self.index.end()
             root_node = self.libraries["Project"][1]
             self.Expand(root_node)
             self.Refresh()
 
     def create_tree_from_dir(self, dir_path=None, parent=None):
-        dir_files = os.listdir(dir_path)
-
-        for file in dir_files:
-            file_path = dir_path + "/" + file
-
-            if os.path.isdir(file_path) and file != "__pycache__":
-                item = self.AppendItem(parent, file, data=file_path, image=0)
-                # self.SetItemTextColour(item, wx.Colour(255, 255, 190, 255))
-                self.Expand(item)
-                self.name_to_item[file] = item
-
-                self.create_tree_from_dir(file_path, item)
-
-            elif os.path.isfile(file_path) and file != "__init__":
-                extension = file_path.split(".")[-1]
-
-                # make sure extension exists otherwise add a new key
-                if extension in self.resources.keys():
-                    pass
-                else:
-                    self.resources[extension] = []
+        # contents of directories that did not change since last scan are read from index
+        dirs, files = self.index.scan_dir(dir_path)
+
+        for name in dirs:
+            file_path = dir_path + "/" + name
+            item = self.append_dir_item(parent, file_path)
+            self.create_tree_from_dir(file_path, item)
+
+        for name, size, mtime, ext in files:
+            if name != "__init__":
+                self.registry.add(dir_path + "/" + name)
+
+    def append_dir_item(self, parent, path):
+        name = path.split("/")[-1]
+        item = self.AppendItem(parent, name, data=path, image=0)
+        # self.SetItemTextColour(item, wx.Colour(255, 255, 190, 255))
+        self.Expand(item)
+        self.registry.add_item(path, item)
+        return item
+
+    # --------------- incremental updates from directory watcher change sets --------------- #
+    def apply_change_set(self, change_set):
+        """updates tree items and resources from a directory watcher ChangeSet, instead of rebuilding
+        whole tree only changed files and directories are inserted, removed or renamed"""
+        for path in change_set.deleted:
+            self.remove_path(path)
+            self.index.forget(path)
+
+        for path in change_set.modified:
+            self.index.update_file(path)
+
+        for src, dest in change_set.moved.items():
+            self.move_path(src, dest)
+
+        # sorted, so that a new directory is always added before its contents
+        for path in sorted(change_set.added):
+            self.add_path(path)
+
+        self.save_index_later()
+        self.Refresh()
+
+    def save_index_later(self):
+        """saves project index once there were no incremental updates for INDEX_SAVE_DELAY seconds"""
+        taskMgr.remove("SaveResourceIndexTask")
+        taskMgr.doMethodLater(INDEX_SAVE_DELAY, self.__save_index_task, "SaveResourceIndexTask")
+
+    def __save_index_task(self, task):
+        self.save_index()
+        return task.done
+
+    def save_index(self):
+        """saves project index now, cancels a pending delayed save"""
+        taskMgr.remove("SaveResourceIndexTask")
+        try:
+            self.index.save()
+        except OSError as e:
+            print("[ResourceBrowser] Unable to save project index: {0}".format(e))
+
+    def add_path(self, path):
+        parent_item = self.registry.get_item(os.path.dirname(path))
+        # path is not inside any library or is inside an ignored directory
+        if parent_item is None:
+            return
+
+        if os.path.isdir(path):
+            if not self.registry.has_item(path) and path.split("/")[-1] not in IGNORED_DIRS:
+                item = self.append_dir_item(parent_item, path)
+                self.create_tree_from_dir(path, item)
+
+        elif os.path.isfile(path) and path.split("/")[-1] != "__init__":
+            self.registry.add(path)
+
+    def remove_path(self, path):
+        item = self.registry.get_item(path)
+        if item is None:
+            self.registry.remove(path)
+            return
+
+        # a directory, remove it with all of its contents
+        self.registry.remove_tree(path)
+        self.Delete(item)
+
+    def move_path(self, src, dest):
+        # a directory renamed in place keeps its tree item
+        if self.registry.has_item(src) and os.path.dirname(src) == os.path.dirname(dest) and os.path.isdir(dest):
+            self.SetItemText(self.registry.get_item(src), dest.split("/")[-1])
+            for new_path, item in self.registry.move_tree(src, dest):
+                self.SetItemData(item, new_path)
+        elif src in self.registry and self.registry.has_item(os.path.dirname(dest)) and os.path.isfile(dest):
+            self.registry.move(src, dest)
+        else:
+            self.remove_path(src)
+            self.add_path(dest)
 
-                self.resources[extension].append(file_path)
+        self.index.forget(src)
 
     def schedule_dir_watcher(self):
         for key in self.libraries.keys():
@@ -329,8 +407,10 @@ class ResourceTree(customtree.CustomTreeCtrl):
 
     def append_library(self, name, path, schedule=False):
         if name not in self.libraries.keys():
+            path = normalize_path(path)
             tree_item = self.AppendItem(self.root_node, name, data=path, image=1)
             self.libraries[name] = (path, tree_item)
+            self.registry.add_item(path, tree_item)
             # print("[ResourceTree] AppendedLib name: {0} path: {1}".format(name, path))
             if schedule:
                 self.dir_watcher.schedule(path)
@@ -341,7 +421,10 @@ class ResourceTree(customtree.CustomTreeCtrl):
     def remove_library(self, name, remove_key=True):
         path = self.libraries[name][0]
         tree_item = self.libraries[name][1]
-        self.Delete(tree_item)
+        if self.registry.has_item(path):
+            self.remove_path(path)
+        else:
+            self.Delete(tree_item)
         self.dir_watcher.unschedule(path)
         if remove_key:
             del self.libraries[name]
@@ -497,7 +580,7 @@ class ResourceTree(customtree.CustomTreeCtrl):
                         print("PermissionError")
                     finally:
                         if success:
-                            del self.name_to_item[item_text]  # remove from name_to_items
+                            self.registry.remove_tree(item_path)
                             self.Delete(item)
 
         dial = wx.MessageDialog(None, "Confirm remove folder ?", "Remove item",
@@ -568,20 +651,17 @@ class ResourceTree(customtree.CustomTreeCtrl):
         paths = [self.GetItemPyData(sel) for sel in selections]
         return paths
 
-    def get_item_by_name(self, item_name=""):
-        if self.name_to_item.__contains__(item_name):
-            return self.name_to_item[item_name]
-        return None
+    def get_item_by_path(self, path):
+        return self.registry.get_item(path)
 
     def save_state(self):
         """saves the current state of tree e.g. currently selected tree items"""
         selected_folders = []
 
         for item in self.GetSelections():
-            item_text = self.GetItemText(item)
             path = self.GetItemData(item)
             if os.path.exists(path):
-                selected_folders.append(item_text)
+                selected_folders.append(path)
 
         self.saved_state = ResourceBrowser.State(selected_folders, self.tiles_panel.get_selected_tiles(paths=True))
 
@@ -589,14 +669,14 @@ class ResourceTree(customtree.CustomTreeCtrl):
         """reloads saved state"""
 
         success = True
-        for item_text in self.saved_state.selected_folders:
-            try:
-                self.SelectItem(self.name_to_item[item_text])
-            except KeyError:
-                print("[ResourceTree] Key {0} was not found".format(item_text))
+        for path in self.saved_state.selected_folders:
+            item = self.registry.get_item(path)
+            if item is None:
+                print("[ResourceTree] Path {0} was not found".format(path))
                 success = False
                 self.UnselectAll()
                 break
+            self.SelectItem(item)
 
         if success:
             self.tiles_panel.select_tiles_from_paths(self.saved_state.selected_tiles)
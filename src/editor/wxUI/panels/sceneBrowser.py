@@ -194,8 +194,15 @@ class SceneBrowser(customtree.CustomTreeCtrl):
         self.select(np)
         self.Refresh()
 
-    def add_many(self):
-        pass
+    def add_many(self, nps):
+        """adds nps into tree without selecting them, the parent of each np must either
+        already be in tree or precede it in nps"""
+        for np in nps:
+            parent_item = self.np_id_to_tree_item_map.get(np.get_parent(), self.scene_graph_item)
+            tree_item = self.AppendItem(parent_item, np.get_name(), data=np)
+            self.np_id_to_tree_item_map[np] = tree_item
+
+        self.Refresh()
 
     def remove_item(self):
         editor.command_mgr.do(RemoveObjects(self.get_selected_nps()))
@@ -283,7 +290,7 @@ class SceneBrowser(customtree.CustomTreeCtrl):
                     self.SetItemText(tree_item, new_name)
 
                     # finally, create the rename command
-                    editor.command_mgr.do(RenameNPs(editor.p3d_app, np, old_name, new_name))
+                    editor.command_mgr.do(RenameNPs(np, old_name, new_name))
 
         self.Refresh()
 
@@ -0,0 +1,180 @@
+import os
+import queue
+import hashlib
+import threading
+import wx
+from collections import OrderedDict
+from direct.showbase.ShowBase import taskMgr
+
+IMAGE_EXTENSIONS = ("png", "jpg", "jpeg", "tga", "tiff", "tif", "bmp")  # thumbnails are decoded from source
+
+
+class ThumbnailCache:
+    def __init__(self, size=40, max_items=1024, cache_dir=None):
+        """thumbnails of resources, decoded and scaled on a worker thread, kept in memory in a LRU cache and
+        persisted as png files in cache_dir keyed by path and modification time of their source,
+        thumbnails of images are created from source, thumbnails of other resources (e.g. model previews)
+        have to be stored with put"""
+        self.size = size  # max width or height of a thumbnail
+        self.max_items = max_items
+        self.cache_dir = cache_dir  # thumbnails are not saved to disk if None
+
+        self.__bitmaps = OrderedDict()  # bitmaps[key] = wx.Bitmap, resources without thumbnail are not cached
+        self.__pending = {}  # pending[key] = [callbacks, ...]
+
+        self.__requests = queue.Queue()  # (key, path, thumbnail path) to worker thread
+        self.__results = queue.Queue()  # (key, path, wx.Image or None) from worker thread
+        self.__thread = None
+
+    @staticmethod
+    def get_key(path):
+        """returns (path, mtime, size) for file at path or None if file does not exist"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return path, stat.st_mtime_ns, stat.st_size
+
+    def get_thumbnail_path(self, key):
+        if self.cache_dir is None:
+            return None
+        hash_ = hashlib.sha1("{0}|{1}|{2}|{3}".format(*key, self.size).encode()).hexdigest()
+        return os.path.join(self.cache_dir, hash_ + ".png")
+
+    def get(self, path, callback=None):
+        """returns thumbnail bitmap of resource at path, if it's not loaded yet None is returned,
+        thumbnail is loaded in background and callback(path, bitmap) is called once it is ready"""
+        key = self.get_key(path)
+        if key is None:
+            return None
+
+        if key in self.__bitmaps:
+            self.__bitmaps.move_to_end(key)
+            return self.__bitmaps[key]
+
+        if key in self.__pending:
+            if callback and callback not in self.__pending[key]:
+                self.__pending[key].append(callback)
+            return None
+
+        self.__pending[key] = [callback] if callback else []
+        self.__requests.put((key, path, self.get_thumbnail_path(key)))
+        self.__start()
+        return None
+
+    def put(self, path, image):
+        """stores wx.Image image as thumbnail of resource at path, must be called on main thread"""
+        key = self.get_key(path)
+        if key is None:
+            return
+
+        image = self.scale(image)
+        thumbnail_path = self.get_thumbnail_path(key)
+        if thumbnail_path:
+            self.save(image, thumbnail_path)
+
+        self.__on_loaded(key, path, image)
+
+    def has_thumbnail(self, path):
+        """returns True if a thumbnail of resource at path exists in memory or on disk"""
+        key = self.get_key(path)
+        if key is None:
+            return False
+        if self.__bitmaps.get(key, None) is not None:
+            return True
+        thumbnail_path = self.get_thumbnail_path(key)
+        return thumbnail_path is not None and os.path.isfile(thumbnail_path)
+
+    def clear(self):
+        self.__bitmaps.clear()
+
+    # ---------------------- worker thread ---------------------- #
+    def __start(self):
+        if self.__thread is None:
+            self.__thread = threading.Thread(target=self.__work, name="ThumbnailWorker", daemon=True)
+            self.__thread.start()
+            taskMgr.add(self.update, "ThumbnailTask", sort=0)
+
+    def __work(self):
+        while True:
+            key, path, thumbnail_path = self.__requests.get()
+            image = None
+
+            try:
+                if thumbnail_path and os.path.isfile(thumbnail_path):
+                    image = wx.Image(thumbnail_path, type=wx.BITMAP_TYPE_PNG)
+
+                elif path.split(".")[-1].lower() in IMAGE_EXTENSIONS:
+                    # unsupported formats should not open error dialogs, same as wx.LogNull does
+                    enabled = wx.Log.EnableLogging(False)
+                    try:
+                        image = wx.Image(path, type=wx.BITMAP_TYPE_ANY)
+                    finally:
+                        wx.Log.EnableLogging(enabled)
+
+                    if image.IsOk():
+                        image = self.scale(image)
+                        if thumbnail_path:
+                            self.save(image, thumbnail_path)
+            except Exception as e:
+                print("[ThumbnailCache] Unable to create thumbnail for {0}: {1}".format(path, e))
+                image = None
+
+            if image is not None and not image.IsOk():
+                image = None
+
+            self.__results.put((key, path, image))
+
+    def scale(self, image):
+        width = image.GetWidth()
+        height = image.GetHeight()
+
+        if width > height:
+            new_width = self.size
+            new_height = self.size * (height / width)
+        else:
+            new_height = self.size
+            new_width = self.size * (width / height)
+
+        return image.Scale(max(int(new_width), 1), max(int(new_height), 1), wx.IMAGE_QUALITY_HIGH)
+
+    @staticmethod
+    def save(image, thumbnail_path):
+        # write to a temporary file first, so that a partially written thumbnail is never loaded
+        dir_name = os.path.dirname(thumbnail_path)
+        if not os.path.isdir(dir_name):
+            os.makedirs(dir_name, exist_ok=True)
+
+        tmp = "{0}.{1}.tmp".format(thumbnail_path, threading.get_ident())
+        if image.SaveFile(tmp, wx.BITMAP_TYPE_PNG):
+            os.replace(tmp, thumbnail_path)
+
+    # ---------------------- main thread ---------------------- #
+    def update(self, task):
+        while True:
+            try:
+                key, path, image = self.__results.get_nowait()
+            except queue.Empty:
+                break
+            if image is None and self.__bitmaps.get(key, None) is not None:
+                # thumbnail was stored with put while this request was pending
+                self.__pending.pop(key, None)
+                continue
+            self.__on_loaded(key, path, image)
+
+        return task.cont
+
+    def __on_loaded(self, key, path, image):
+        # bitmaps can only be created on main thread
+        bitmap = wx.Bitmap(image) if image is not None else None
+
+        # missing thumbnails are not cached, so that next get is a miss again and calls its callback
+        # (e.g. to render a model preview that was cancelled or failed before)
+        if bitmap is not None:
+            self.__bitmaps[key] = bitmap
+            self.__bitmaps.move_to_end(key)
+            while len(self.__bitmaps) > self.max_items:
+                self.__bitmaps.popitem(last=False)
+
+        for callback in self.__pending.pop(key, []):
+            callback(path, bitmap)
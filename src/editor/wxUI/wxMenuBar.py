@@ -11,6 +11,7 @@ Evt_Save_Scene = wx.NewId()
 Evt_Save_Scene_As = wx.NewId()
 Evt_Append_Library = wx.NewId()
 Evt_Build_Project = wx.NewId()
+Evt_Bake_Assets = wx.NewId()
 
 Evt_Add_ViewPort_Panel = wx.NewId()
 Evt_Add_Inspector_Panel = wx.NewId()
@@ -51,6 +52,7 @@ EVENT_MAP = {
     Evt_Save_Scene_As: ("SaveSessionAs", None),
     Evt_Append_Library: ("AppendLibrary", None),
     Evt_Build_Project: ("BuildProject", None),
+    Evt_Bake_Assets: ("BakeAssets", None),
 
     Evt_Add_Capsule: ("AddObject", constants.CAPSULE_PATH),
     Evt_Add_Cone: ("AddObject", constants.CONE_PATH),
@@ -172,6 +174,7 @@ class WxMenuBar(wx.MenuBar):
                       "",
                       (Evt_Append_Library, "&Append Library", None),
                       "",
+                      (Evt_Bake_Assets, "Bake Assets", None),
                       (Evt_Build_Project, "Build", None),
                       ]
         build_menu_bar(proj_menu, menu_items)
@@ -315,7 +318,7 @@ class WxMenuBar(wx.MenuBar):
             args = EVENT_MAP[evt.GetId()][1]
 
             if evt_name == "AddObject":
-                editor.command_mgr.do(commands.ObjectAdd(args))
+                editor.command_mgr.do(commands.ObjectAdd(args, asynchronous=True))
             elif evt_name == "AddLight":
                 editor.command_mgr.do(commands.AddLight(args))
             elif evt_name == "AddCamera":
@@ -8,11 +8,11 @@ import editor.wxUI.globals as wxGlobals
 import editor.commands as commands
 
 from editor.utils import FileUtils
-from wx.lib.scrolledpanel import ScrolledPanel
 from editor.wxUI.custom import ControlGroup, SelectionButton
 from editor.wxUI.custom import SearchBox
 from editor.globals import editor
-from editor.core import RuntimeModule, EditorPlugin, Component
+from editor.wxUI.thumbnailCache import ThumbnailCache, IMAGE_EXTENSIONS
+from editor.core import RuntimeModule, EditorPlugin
 
 # event ids for different event types
 EVT_RENAME_ITEM = wx.NewId()
@@ -52,7 +52,7 @@ def create_3d_model_menu_items(parent_menu):
     wxGlobals.build_menu(parent_menu, menu_items)
 
 
-class ImageTile(wx.Panel):
+class ImageTile:
     class TestDragDropData(object):
         def __init__(self):
             self.path = None
@@ -82,174 +82,64 @@ class ImageTile(wx.Panel):
                 # editor.wx_main.SetCursor(wx.Cursor(wx.CURSOR_NO_ENTRY))
                 return True
 
-    def __init__(self, parent, label, extension, style, color, size, position, tile_index=-1, data=None):
-        """class representing a single image tile, with a text field below image"""
-
-        wx.Panel.__init__(self, parent)
-
+    def __init__(self, parent, label, extension, image_path, tile_index=-1, data=None):
+        """class representing a single image tile, with a text field below image, tiles are not windows,
+        they are drawn by parent ImageTilesPanel"""
         self.parent = parent
         self.label = label
+        self.extension = extension
+        self.image_path = image_path
         self.tile_index = tile_index
-
-        self.SetWindowStyleFlag(style)
-        self.SetBackgroundColour(color)
-        self.SetSize(size)
-        self.SetPosition(position)
-
-        self.is_selected = False
-        self.image_path = None
-        self.image = None
-        self.image_control = None
         self.path = data
-        self.label = label
-        self.extension = extension
-
-        self.image_ctrl = wx.StaticBitmap(self)
 
-        font = wx.Font(7, wx.DEFAULT, wx.NORMAL, wx.FONTWEIGHT_BOLD)
-
-        self.text_ctrl = wx.StaticText(self,
-                                       label=self.label,
-                                       style=wx.ALIGN_CENTER_HORIZONTAL | wx.ALIGN_CENTRE_VERTICAL)
-        self.text_ctrl.SetFont(font)
-
-        self.sizer = wx.BoxSizer(wx.VERTICAL)
-        self.SetSizer(self.sizer)
-
-        self.sizer.Add(self.image_ctrl, 1, wx.EXPAND)
-        self.sizer.Add(self.text_ctrl, 0, wx.EXPAND)
-
-        self.Layout()
-
-        self.event_map = {
-            EVT_RENAME_ITEM: (self.rename_item, "rename_item"),
-            EVT_DUPLICATE_ITEM: (self.duplicate_item, "duplicate"),
-            EVT_REMOVE_ITEM: (self.delete_item, "remove_item"),
-
-            EVT_LOAD_MODEL: (self.load_model, None),
-            EVT_LOAD_ACTOR: (self.load_actor, None),
-        }
-
-        self.image_ctrl.Bind(wx.EVT_LEFT_UP, self.on_select)
-        self.image_ctrl.Bind(wx.EVT_RIGHT_DOWN, self.on_right_down)
-        self.Bind(wx.EVT_MENU, self.on_select_context)
-        self.image_ctrl.Bind(wx.EVT_MOTION, self.on_begin_drag)
+        self.is_selected = False
+        self.thumbnail = None  # preview bitmap from thumbnail cache, drawn instead of image if available
+        self.request_thumbnail = extension.lower() in IMAGE_EXTENSIONS or extension in constants.MODEL_EXTENSIONS
 
-    def on_begin_drag(self, evt):
-        if evt.Dragging():
-            # create data that is being dragged
-            dragged_data = ImageTile.TestDragDropData()
-            dragged_data.set_source([self.path])
+    def begin_drag(self):
+        # create data that is being dragged
+        dragged_data = ImageTile.TestDragDropData()
+        dragged_data.set_source([self.path])
 
-            # pickle dragged data
-            picked_data = pickle.dumps(dragged_data, 1)
+        # pickle dragged data
+        picked_data = pickle.dumps(dragged_data, 1)
 
-            # create a custom data obj and set its data to dragged data
-            custom_data_obj = wx.CustomDataObject(wx.DataFormat('ImageTileData'))
-            custom_data_obj.SetData(picked_data)
+        # create a custom data obj and set its data to dragged data
+        custom_data_obj = wx.CustomDataObject(wx.DataFormat('ImageTileData'))
+        custom_data_obj.SetData(picked_data)
 
-            # create a source for drag and drop
-            drop_source = ImageTile.TestDropSource()
-            drop_source.SetData(custom_data_obj)
+        # create a source for drag and drop
+        drop_source = ImageTile.TestDropSource()
+        drop_source.SetData(custom_data_obj)
 
-            # Initiate the Drag Operation
-            drag_result = drop_source.DoDragDrop()
-            if drag_result == wx.DragNone:
-                print("Drag failed")
-            elif drag_result == wx.DragError:
-                print("Drag error")
+        # Initiate the Drag Operation
+        drag_result = drop_source.DoDragDrop()
+        if drag_result == wx.DragNone:
+            print("Drag failed")
+        elif drag_result == wx.DragError:
+            print("Drag error")
 
-            editor.wx_main.freeze()
-            editor.inspector.layout_auto()
-            editor.wx_main.thaw()
+        editor.wx_main.freeze()
+        editor.inspector.layout_auto()
+        editor.wx_main.thaw()
 
-            editor.wx_main.SetCursor(wx.Cursor(wx.CURSOR_ARROW))
-            evt.Skip()
+        editor.wx_main.SetCursor(wx.Cursor(wx.CURSOR_ARROW))
 
     def set_active(self, value):
         self.is_selected = value
 
-    def set_image(self, path):
-        self.image_path = path
-
-        if self.image_path is None:
-            return
-
-        self.image = wx.Image(self.image_path, type=wx.BITMAP_TYPE_ANY)
-        self.update()
-
-    def update(self):
-        if self.image is None:
-            return
-        else:
-            self.image.Clear()
-
-        self.image = wx.Image(self.image_path, type=wx.BITMAP_TYPE_ANY)
-        width = self.image.GetWidth()
-        height = self.image.GetHeight()
-
-        if width > height:
-            self.max_image_size = 40
-        else:
-            self.max_image_size = 40
-
-        if width > height:
-            new_width = self.max_image_size
-            new_height = self.max_image_size * (height / width)
-        else:
-            new_height = self.max_image_size
-            new_width = self.max_image_size * (width / height)
-
-        if new_height < 1:
-            new_height = 1
-        if new_width < 1:
-            new_width = 1
-
-        self.image = self.image.Scale(new_width, new_height)
-        self.image_ctrl.SetBitmap(wx.Bitmap(self.image))
-
-    def on_select(self, evt=None):
+    def on_select(self):
         self.parent.deselect_all()
         self.parent.select_tiles([self], False)
-        # self.parent.options.set_item_info_text(self.data)
 
         self.is_selected = True
-        self.text_ctrl.SetBackgroundColour(edPreferences.Colors.Image_Tile_Selected)
-        self.Refresh()
+        self.parent.refresh_tile(self)
 
         editor.observer.trigger("OnResourceTileSelected", self.path)
 
-        if evt:
-            evt.Skip()
-
     def on_deselect(self):
         self.is_selected = False
-        self.text_ctrl.SetBackgroundColour(edPreferences.Colors.Image_Tile_BG)
-        self.Refresh()
-
-    def on_right_down(self, evt):
-        if not self.is_selected:
-            evt.Skip()
-            return
-        else:
-            popup_menu = wx.Menu()
-
-            if self.extension in constants.MODEL_EXTENSIONS:
-                create_3d_model_menu_items(popup_menu)
-                popup_menu.AppendSeparator()
-            create_generic_menu_items(popup_menu)
-
-            self.PopupMenu(popup_menu, self.image_ctrl.GetPosition())
-            popup_menu.Destroy()
-
-            evt.Skip()
-
-    def on_select_context(self, evt):
-        if evt.GetId() in self.event_map.keys():
-            foo = self.event_map[evt.GetId()][0]
-            foo()
-
-        evt.Skip()
+        self.parent.refresh_tile(self)
 
     def rename_item(self):
         def rename(new_label):
@@ -274,14 +164,14 @@ class ImageTile(wx.Panel):
 
     def load_model(self):
         path = self.path
-        editor.command_mgr.do(commands.LoadModel(editor.p3d_app, path=path, is_actor=False))
+        editor.command_mgr.do(commands.LoadModel(path=path, asynchronous=True))
 
     def load_actor(self):
         path = self.path
-        editor.command_mgr.do(commands.LoadModel(editor.p3d_app, path=path, is_actor=True))
+        editor.command_mgr.do(commands.LoadModel(path=path, asynchronous=True, is_actor=True))
 
 
-class ImageTilesPanel(ScrolledPanel):
+class ImageTilesPanel(wx.ScrolledWindow):
     class State:
         def __init__(self, selected_tiles: list):
             """Class representing state of ImageTilesPanel"""
@@ -290,35 +180,43 @@ class ImageTilesPanel(ScrolledPanel):
     class Options(wx.Window):
         """Class containing various settings and options for image_tiles_panel"""
 
-        def __init__(self, parent, *args, **kwargs):
+        def __init__(self, parent, on_search=None, on_filter=None, *args, **kwargs):
+            """on_search(text) is called when search text changes, on_filter(btn_index) when a filter button
+            is pressed, pressing selected filter button again deselects it and calls on_filter(None)"""
             wx.Window.__init__(self, parent, *args, **kwargs)
             self.SetBackgroundColour(edPreferences.Colors.Panel_Dark)
             self.parent = parent
+            self.on_filter = on_filter
+            self.selected_filter = None  # index of selected filter button
 
             self.v_sizer = wx.BoxSizer(wx.VERTICAL)
             self.sizer = wx.BoxSizer(wx.HORIZONTAL)
             self.SetSizer(self.v_sizer)
 
-            self.search_control = SearchBox(self)
+            self.search_control = SearchBox(self, on_search=on_search)
 
             # create filter selection buttons
             self.filter_buttons_grid = ControlGroup(self)
 
-            inspector_panel_btn = SelectionButton(self.filter_buttons_grid, 0, "Models", image_path=Model_icon)
+            inspector_panel_btn = SelectionButton(self.filter_buttons_grid, 0, "Models", image_path=Model_icon,
+                                                  select_func=self.on_filter_btn_pressed)
             world_settings_btn = SelectionButton(self.filter_buttons_grid, 1, "Textures",
                                                  text_pos=(21, 2),
                                                  image_path=Texture_icon,
                                                  image_pos=(3, 2),
-                                                 image_scale=13)
-            ed_settings_btn = SelectionButton(self.filter_buttons_grid, 2, "Sounds", image_path=Sound_icon)
-            plugins_panel_btn = SelectionButton(self.filter_buttons_grid, 3, "Scripts", image_path=Script_icon)
+                                                 image_scale=13,
+                                                 select_func=self.on_filter_btn_pressed)
+            ed_settings_btn = SelectionButton(self.filter_buttons_grid, 2, "Sounds", image_path=Sound_icon,
+                                              select_func=self.on_filter_btn_pressed)
+            plugins_panel_btn = SelectionButton(self.filter_buttons_grid, 3, "Scripts", image_path=Script_icon,
+                                                select_func=self.on_filter_btn_pressed)
 
             self.filter_buttons_grid.add_button(inspector_panel_btn, flags=wx.EXPAND | wx.RIGHT, border=1)
             self.filter_buttons_grid.add_button(world_settings_btn, flags=wx.EXPAND | wx.RIGHT, border=1)
             self.filter_buttons_grid.add_button(ed_settings_btn, flags=wx.EXPAND | wx.RIGHT, border=1)
             self.filter_buttons_grid.add_button(plugins_panel_btn, flags=wx.EXPAND)
 
-            self.filter_buttons_grid.select_button(0)
+            # no filter is selected by default, tiles show contents of selected folders
 
             # static text panel to display selected item path info
             self.panel = wx.Panel(self)
@@ -340,32 +238,66 @@ class ImageTilesPanel(ScrolledPanel):
             self.v_sizer.Add(self.panel, 1, wx.EXPAND | wx.TOP, border=1)
 
         def on_filter_btn_pressed(self, btn_index):
-            pass
+            if btn_index == self.selected_filter:
+                self.filter_buttons_grid.deselect_all()
+                btn_index = None
+            self.selected_filter = btn_index
+
+            if self.on_filter:
+                self.on_filter(btn_index)
+
+        def clear(self):
+            """clears search text and deselects filter buttons"""
+            self.search_control.clear()
+            self.filter_buttons_grid.deselect_all()
+            self.selected_filter = None
 
         def set_item_info_text(self, txt: str):
             self.item_info_ctrl.SetLabel(txt)
 
-    TILES_PER_ROW = 5
-    Tile_offset_x = 12
-    Tile_offset_y = 42
+    # extensions of resources shown by each filter button
+    FILTERS = {
+        0: constants.MODEL_EXTENSIONS,
+        1: IMAGE_EXTENSIONS,
+        2: ("mp3", "wav", "ogg"),
+        3: ("py", "txt"),
+    }
+    MAX_SEARCH_RESULTS = 1000
+
     TILE_SIZE = 64
+    IMAGE_SIZE = 40  # max width or height of a tile's image
+    LABEL_HEIGHT = 14
 
     def __init__(self, parent, resource_tree=None):
-        ScrolledPanel.__init__(self, parent)
+        """owner drawn, virtualized grid of tiles, no window is created per tile and only tiles in
+        visible rows are drawn"""
+        wx.ScrolledWindow.__init__(self, parent, style=wx.VSCROLL)
+        self.SetBackgroundStyle(wx.BG_STYLE_PAINT)
         self.SetBackgroundColour(edPreferences.Colors.Panel_Dark)
+        self.SetScrollRate(0, self.TILE_SIZE // 4)
 
-        self.options = self.Options(parent)
+        self.options = self.Options(parent, on_search=self.on_search, on_filter=self.on_filter)
         self.options.SetMaxSize((-1, 36))
+        # trigram index is built before first search, rather than on first key stroke
+        self.options.search_control.text_box.Bind(wx.EVT_SET_FOCUS, self.on_search_focus)
 
         self.resource_tree = resource_tree
         self.parent = parent
         self.__tiles = []
+        self.__path_to_tile = {}  # path_to_tile[file path] = tile
         self.__selected_tiles = []
         self.__saved_state = None
 
-        self.sizer = wx.BoxSizer(wx.VERTICAL)
-        self.gridSizer = None
-        self.SetSizer(self.sizer)
+        self.__tiles_per_row = 1
+        self.__bitmaps = {}  # bitmaps[image path] = scaled bitmap, shared by all tiles with same image
+        self.thumbnails = ThumbnailCache(size=self.IMAGE_SIZE)  # previews of images and models
+        self.__pressed_tile = None  # tile under mouse when left button was pressed, to start dragging
+        self.__context_tile = None  # tile for which context menu is open
+
+        self.__selections = []  # folders selected in resource tree, shown when there is no search or filter
+        self.__filter = None  # index of selected filter button
+
+        self.font = wx.Font(7, wx.DEFAULT, wx.NORMAL, wx.FONTWEIGHT_BOLD)
 
         self.icon_and_extension = {
             "generic": UnknownFile_icon,
@@ -397,29 +329,224 @@ class ImageTilesPanel(ScrolledPanel):
             ".mp4": VideoFile_icon,
         }
 
+        self.event_map = {
+            EVT_RENAME_ITEM: "rename_item",
+            EVT_DUPLICATE_ITEM: "duplicate_item",
+            EVT_REMOVE_ITEM: "delete_item",
+
+            EVT_LOAD_MODEL: "load_model",
+            EVT_LOAD_ACTOR: "load_actor",
+        }
+
         self.Bind(wx.EVT_SIZE, self.on_evt_resize)
+        self.Bind(wx.EVT_PAINT, self.on_paint)
+        self.Bind(wx.EVT_LEFT_DOWN, self.on_left_down)
+        self.Bind(wx.EVT_LEFT_UP, self.on_left_up)
+        self.Bind(wx.EVT_MOTION, self.on_motion)
+        self.Bind(wx.EVT_RIGHT_DOWN, self.on_right_down)
+        self.Bind(wx.EVT_MENU, self.on_select_context)
 
     def on_evt_resize(self, evt):
-        if self.gridSizer:
-            self.gridSizer.Clear()
         self.update_tiles()
         evt.Skip()
 
+    # ---------------------- drawing ---------------------- #
+    def on_paint(self, evt):
+        dc = wx.AutoBufferedPaintDC(self)
+        self.DoPrepareDC(dc)
+        dc.SetBackground(wx.Brush(self.GetBackgroundColour()))
+        dc.Clear()
+
+        if len(self.__tiles) == 0:
+            return
+
+        dc.SetFont(self.font)
+        dc.SetTextForeground(self.GetForegroundColour())
+
+        # only rows inside visible area are drawn
+        top = self.CalcUnscrolledPosition(0, 0)[1]
+        first_row = top // self.TILE_SIZE
+        last_row = (top + self.GetClientSize().y) // self.TILE_SIZE
+
+        first = first_row * self.__tiles_per_row
+        last = min((last_row + 1) * self.__tiles_per_row, len(self.__tiles))
+        for i in range(first, last):
+            self.draw_tile(dc, self.__tiles[i])
+
+    def draw_tile(self, dc, tile):
+        x, y = self.get_tile_position(tile)
+
+        # thumbnails are only requested for visible tiles, icon is drawn until thumbnail is loaded
+        if tile.request_thumbnail:
+            tile.request_thumbnail = False
+            tile.thumbnail = self.thumbnails.get(tile.path, self.on_thumbnail_loaded)
+
+        bitmap = tile.thumbnail if tile.thumbnail is not None else self.get_bitmap(tile.image_path)
+        if bitmap is not None:
+            image_x = x + (self.TILE_SIZE - bitmap.GetWidth()) // 2
+            image_y = y + (self.TILE_SIZE - self.LABEL_HEIGHT - bitmap.GetHeight()) // 2
+            dc.DrawBitmap(bitmap, image_x, image_y, True)
+
+        label_rect = wx.Rect(x, y + self.TILE_SIZE - self.LABEL_HEIGHT, self.TILE_SIZE - 1, self.LABEL_HEIGHT)
+        if tile.is_selected:
+            dc.SetPen(wx.TRANSPARENT_PEN)
+            dc.SetBrush(wx.Brush(edPreferences.Colors.Image_Tile_Selected))
+            dc.DrawRectangle(label_rect)
+
+        label = wx.Control.Ellipsize(tile.label, dc, wx.ELLIPSIZE_END, self.TILE_SIZE - 4)
+        dc.DrawLabel(label, label_rect, wx.ALIGN_CENTER)
+
+    def on_thumbnail_loaded(self, path, bitmap):
+        tile = self.get_tile_from_path(path)
+        if tile is None:
+            return
+
+        if bitmap is not None:
+            tile.thumbnail = bitmap
+            self.refresh_tile(tile)
+
+        elif tile.extension in constants.MODEL_EXTENSIONS:
+            # model has no preview yet, render one in background
+            editor.level_editor.preview_renderer.request(path, self.on_preview_rendered)
+
+    def on_preview_rendered(self, path, width, height, rgb):
+        if rgb is None:
+            return
+
+        self.thumbnails.put(path, wx.Image(width, height, rgb))
+
+        tile = self.get_tile_from_path(path)
+        if tile is not None:
+            tile.thumbnail = self.thumbnails.get(path)
+            self.refresh_tile(tile)
+
+    def get_bitmap(self, image_path):
+        """returns image at image_path scaled to fit a tile, images are loaded and scaled only once"""
+        if image_path is None:
+            return None
+
+        if image_path not in self.__bitmaps:
+            image = wx.Image(image_path, type=wx.BITMAP_TYPE_ANY)
+            if not image.IsOk():
+                self.__bitmaps[image_path] = None
+                return None
+
+            width = image.GetWidth()
+            height = image.GetHeight()
+
+            if width > height:
+                new_width = self.IMAGE_SIZE
+                new_height = self.IMAGE_SIZE * (height / width)
+            else:
+                new_height = self.IMAGE_SIZE
+                new_width = self.IMAGE_SIZE * (width / height)
+
+            image = image.Scale(max(int(new_width), 1), max(int(new_height), 1), wx.IMAGE_QUALITY_HIGH)
+            self.__bitmaps[image_path] = wx.Bitmap(image)
+
+        return self.__bitmaps[image_path]
+
+    def get_tile_position(self, tile):
+        """returns unscrolled position of top left corner of tile"""
+        row, col = divmod(tile.tile_index, self.__tiles_per_row)
+        return col * self.TILE_SIZE, row * self.TILE_SIZE
+
+    def refresh_tile(self, tile):
+        x, y = self.CalcScrolledPosition(*self.get_tile_position(tile))
+        self.RefreshRect(wx.Rect(x, y, self.TILE_SIZE, self.TILE_SIZE), eraseBackground=False)
+
+    def hit_test(self, position):
+        """returns tile at window position or None"""
+        x, y = self.CalcUnscrolledPosition(position.x, position.y)
+        col = x // self.TILE_SIZE
+        if x < 0 or y < 0 or col >= self.__tiles_per_row:
+            return None
+
+        index = (y // self.TILE_SIZE) * self.__tiles_per_row + col
+        if index < len(self.__tiles):
+            return self.__tiles[index]
+        return None
+
+    # ---------------------- mouse events ---------------------- #
+    def on_left_down(self, evt):
+        self.SetFocus()
+        self.__pressed_tile = self.hit_test(evt.GetPosition())
+        evt.Skip()
+
+    def on_left_up(self, evt):
+        tile = self.hit_test(evt.GetPosition())
+        if tile is not None and tile is self.__pressed_tile:
+            tile.on_select()
+        self.__pressed_tile = None
+        evt.Skip()
+
+    def on_motion(self, evt):
+        if evt.Dragging() and evt.LeftIsDown() and self.__pressed_tile is not None:
+            tile = self.__pressed_tile
+            self.__pressed_tile = None
+            tile.begin_drag()
+        evt.Skip()
+
+    def on_right_down(self, evt):
+        tile = self.hit_test(evt.GetPosition())
+        if tile is None or not tile.is_selected:
+            evt.Skip()
+            return
+
+        self.__context_tile = tile
+        popup_menu = wx.Menu()
+
+        if tile.extension in constants.MODEL_EXTENSIONS:
+            create_3d_model_menu_items(popup_menu)
+            popup_menu.AppendSeparator()
+        create_generic_menu_items(popup_menu)
+
+        self.PopupMenu(popup_menu, evt.GetPosition())
+        popup_menu.Destroy()
+
+        evt.Skip()
+
+    def on_select_context(self, evt):
+        if evt.GetId() in self.event_map.keys() and self.__context_tile is not None:
+            foo = getattr(self.__context_tile, self.event_map[evt.GetId()])
+            foo()
+
+        evt.Skip()
+
+    # ---------------------- tiles ---------------------- #
     def create_tile(self, image, label, extension, data):
         tile = ImageTile(parent=self,
                          label=label,
                          extension=extension,
-                         style=wx.BORDER_NONE,
-                         color=edPreferences.Colors.Panel_Dark,
-                         size=(10, 10),
-                         position=(0, 0),
+                         image_path=image,
+                         tile_index=len(self.__tiles),
                          data=data)
 
         self.__tiles.append(tile)
-        tile.set_image(image)
-        tile.Hide()
+        self.__path_to_tile[data] = tile
+        return tile
+
+    def get_tile_image(self, extension, file_path):
+        if extension not in self.icon_and_extension:
+            return self.icon_and_extension["generic"]
+
+        image = self.icon_and_extension[extension]
+        if editor.level_editor.is_module(file_path):
+            module = editor.level_editor.get_module(file_path)
+            if isinstance(module, RuntimeModule):
+                image = UserModule_icon
+            elif isinstance(module, EditorPlugin):
+                image = EditorPlugin_icon
+        return image
 
     def set_from_selections(self, selections):
+        """shows contents of folders selected in resource tree, clears search and filter"""
+        self.__selections = list(selections)
+        self.__filter = None
+        self.options.clear()
+        self.show_folders(self.__selections)
+
+    def show_folders(self, selections):
         self.remove_all_tiles()
 
         selections_organized = {}
@@ -431,34 +558,20 @@ class ImageTilesPanel(ScrolledPanel):
             if not os.path.isdir(path):
                 print("[TilesPanel] Path {0} not found".format(path))
                 continue
-            dir_items = os.listdir(path)
-            for item in dir_items:
 
-                if os.path.isdir(path + "/" + item):
-                    continue
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        continue
+
+                    split = entry.name.split(".")
+                    extension = split[-1]
+                    file_name = split[0]
+                    file_path = path + "/" + entry.name
 
-                split = item.split(".")
-                extension = split[-1]
-                file_name = split[0]
-                file_path = path + "/" + item
-
-                if extension in self.icon_and_extension:
-
-                    if editor.level_editor.is_module(file_path):
-                        module = editor.level_editor.get_module(file_path)
-                        if isinstance(module, RuntimeModule):
-                            image = UserModule_icon
-                        elif isinstance(module, Component):
-                            pass
-                        elif isinstance(module, EditorPlugin):
-                            image = EditorPlugin_icon
-                    else:
-                        image = self.icon_and_extension[extension]
-
-                    selections_organized[extension].append((image, file_name, extension, file_path))
-                else:
-                    image = self.icon_and_extension["generic"]
-                    selections_organized["generic"].append((image, file_name, extension, file_path))
+                    image = self.get_tile_image(extension, file_path)
+                    key = extension if extension in self.icon_and_extension else "generic"
+                    selections_organized[key].append((image, file_name, extension, file_path))
 
         for item in selections_organized.keys():
             value = selections_organized[item]
@@ -467,13 +580,51 @@ class ImageTilesPanel(ScrolledPanel):
 
         self.update_tiles()
 
+    def show_paths(self, paths):
+        """shows tiles for files at paths, in given order"""
+        self.remove_all_tiles()
+
+        for path in paths:
+            split = path.split("/")[-1].split(".")
+            self.create_tile(self.get_tile_image(split[-1], path), split[0], split[-1], path)
+
+        self.update_tiles()
+
+    # ---------------------- search ---------------------- #
+    def on_search_focus(self, evt):
+        editor.resources.search_index.build()
+        evt.Skip()
+
+    def on_search(self, text):
+        self.update_search()
+
+    def on_filter(self, btn_index):
+        """btn_index is None when filter is deselected, selected folders are shown again unless there is a
+        search text"""
+        self.__filter = btn_index
+        self.update_search()
+
+    def update_search(self):
+        """shows resources matching search text and selected filter from resource registry's search index,
+        or contents of selected folders if there is neither"""
+        query = self.options.search_control.get_text()
+        extensions = self.FILTERS[self.__filter] if self.__filter is not None else None
+        search_index = editor.resources.search_index
+
+        if query.strip() != "":
+            self.show_paths(search_index.search(query, extensions, self.MAX_SEARCH_RESULTS))
+        elif extensions is not None:
+            self.show_paths(search_index.get_paths(extensions))
+        else:
+            self.show_folders(self.__selections)
+
     def select_tiles(self, tiles, select=True):
         if len(tiles) > 0:
 
             self.deselect_all()
 
             for i in range(len(tiles)):
-                if tiles[i] in self.__tiles:
+                if self.__path_to_tile.get(tiles[i].path, None) is tiles[i]:
                     if select:
                         tiles[i].on_select()
                     self.__selected_tiles.append(tiles[i])
@@ -489,62 +640,45 @@ class ImageTilesPanel(ScrolledPanel):
                 if not os.path.exists(paths[i]):
                     continue
                 tile = self.get_tile_from_path(paths[i])
-                if tile and tile in self.__tiles:
+                if tile:
                     if select:
                         tile.on_select()
                     self.__selected_tiles.append(tile)
-
-                self.options.set_item_info_text(tile.path)
+                    self.options.set_item_info_text(tile.path)
 
     def deselect_all(self):
-        for tile in self.__tiles:
+        for tile in self.__selected_tiles:
             tile.on_deselect()
         self.options.set_item_info_text("No item selected.")
         self.__selected_tiles.clear()
 
     def update_tiles(self):
-        if self.GetSize().x <= 1:
-            return
-
-        num_tiles = len(self.__tiles)
-        if num_tiles == 0:
-            return
-
-        tiles_per_row = math.floor(self.GetSize().x / self.TILE_SIZE)  # num tiles per row
-        if tiles_per_row == 0:
+        """updates layout of tiles, this only sets size of scrollable area, tiles are drawn on paint"""
+        width = self.GetClientSize().x
+        if width <= 1:
             return
-        num_rows = math.ceil(num_tiles / tiles_per_row)
 
-        self.gridSizer = wx.GridSizer(num_rows, tiles_per_row, 1, 0)
-        self.sizer.Add(self.gridSizer, 1, wx.EXPAND)
+        self.__tiles_per_row = max(width // self.TILE_SIZE, 1)  # num tiles per row
+        num_rows = math.ceil(len(self.__tiles) / self.__tiles_per_row)
 
-        tile_index = 0
-        for i in range(num_rows):
-            for j in range(tiles_per_row):
-
-                try:
-                    tile = self.__tiles[tile_index]
-                except IndexError:
-                    break
-
-                tile.SetMinSize((self.TILE_SIZE, self.TILE_SIZE))
-                tile.update()
-                tile_index += 1
-
-                self.gridSizer.Add(tile, 0)
-                tile.Show()
-
-        self.gridSizer.Layout()
-        self.sizer.Layout()
-        self.SetupScrolling(scroll_x=True)
+        self.SetVirtualSize((self.__tiles_per_row * self.TILE_SIZE, num_rows * self.TILE_SIZE))
+        self.Refresh(eraseBackground=False)
 
     def remove_all_tiles(self):
-        for tile in self.__tiles:
-            tile.Destroy()
+        if editor.level_editor and editor.level_editor.has_preview_renderer:
+            # previews of tiles that are no longer shown are not needed, tiles without thumbnail
+            # have to request it again, otherwise a cancelled preview is never rendered
+            editor.level_editor.preview_renderer.cancel_all()
+            for tile in self.__tiles:
+                if tile.thumbnail is None:
+                    tile.request_thumbnail = tile.extension in constants.MODEL_EXTENSIONS
+
         self.__tiles = []
+        self.__path_to_tile.clear()
         self.__selected_tiles.clear()
-        if self.gridSizer:
-            self.gridSizer.Clear()
+        self.__pressed_tile = None
+        self.__context_tile = None
+        self.Scroll(0, 0)
         self.update_tiles()
 
     def get_selected_tiles(self, paths=False):
@@ -564,11 +698,8 @@ class ImageTilesPanel(ScrolledPanel):
             if paths:
                 tiles.append(self.__tiles[i].path)
             else:
-                tiles.append(self.__tiles[i].path)
+                tiles.append(self.__tiles[i])
         return tiles
 
     def get_tile_from_path(self, path):
-        for i in range(len(self.__tiles)):
-            if self.__tiles[i].path == path:
-                return self.__tiles[i]
-        return None
+        return self.__path_to_tile.get(path, None)